@@ -0,0 +1,98 @@
+"""
+Benchmark: /solve response serialisation cost.
+
+Compares the previous response path (SolveResponse(**output) re-validation,
+then FastAPI's response_model dump, then orjson) with the fast path used by
+api_server.build_solve_response (orjson straight from the built dict).
+
+Run:
+    python benchmarks/bench_response_serialization.py
+    python benchmarks/bench_response_serialization.py --sizes 10000 100000 --repeat 5
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import orjson
+
+from src.models import SolveResponse
+from src.api_server import build_solve_response
+
+
+def synthetic_output(n: int) -> dict:
+    """Output dict shaped like build_output() with n assignment records."""
+    assignments = []
+    for i in range(n):
+        day = f"2025-12-{i % 28 + 1:02d}"
+        emp = f"EMP{i % 5000:05d}"
+        assignments.append({
+            "assignmentId": f"DMD{i % 50}-{day}-D-{emp}",
+            "demandId": f"DMD{i % 50}",
+            "requirementId": str(1000 + i % 7),
+            "date": day,
+            "shiftId": "D",
+            "slotId": f"DMD{i % 50}-{1000 + i % 7}-D-P{i % 40}-{day}",
+            "shiftCode": "D",
+            "startDateTime": f"{day}T08:00:00",
+            "endDateTime": f"{day}T20:00:00",
+            "employeeId": emp,
+            "status": "ASSIGNED",
+            "constraintResults": {"hard": [], "soft": []},
+            "hours": {"gross": 12.0, "lunch": 1.0, "normal": 8.0, "ot": 3.0, "paid": 12.0},
+        })
+    return {
+        "schemaVersion": "0.4",
+        "planningReference": "BENCH",
+        "publicHolidays": [],
+        "solverRun": {
+            "runId": "SRN-bench", "solverVersion": "optfold-py-0.4.2",
+            "startedAt": "2025-12-01T00:00:00", "ended": "2025-12-01T00:00:10",
+            "durationSeconds": 10.0, "status": "OPTIMAL",
+        },
+        "score": {"hard": 0, "soft": 0, "overall": 0},
+        "scoreBreakdown": {"hard": {}, "soft": {}},
+        "assignments": assignments,
+        "unmetDemand": [],
+        "meta": {"requestId": "bench", "generatedAt": "2025-12-01T00:00:10", "warnings": []},
+    }
+
+
+def validated_path(output: dict) -> bytes:
+    """Previous behaviour: construct SolveResponse, dump it again, serialise."""
+    model = SolveResponse(**output)
+    return orjson.dumps(model.model_dump(mode="json"))
+
+
+def fast_path(output: dict) -> bytes:
+    return build_solve_response(output).body
+
+
+def best_of(fn, output, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(output)
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'assignments':>12} {'validated ms':>13} {'fast ms':>9} {'speedup':>8} {'MB':>7}")
+    for n in args.sizes:
+        output = synthetic_output(n)
+        slow, _ = best_of(validated_path, output, args.repeat)
+        fast, size = best_of(fast_path, output, args.repeat)
+        print(f"{n:>12,} {slow * 1000:>13.1f} {fast * 1000:>9.1f} {slow / fast:>7.1f}x {size / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Benchmark: per-phase wall time, peak RSS, model size and solution quality.
+
+Runs solve() + build_output over a corpus of recorded inputs (input/) and
+seeded synthetic scenarios (src/generate_scenario.py), one fresh process per
+case so RSS and import state never leak between cases, and compares the
+result with a committed baseline (benchmarks/baseline.json).
+
+Phases reported:
+    build_slots        slot table build (inside build_model)
+    build_model        decision variables + base model
+    apply_constraints  constraint modules C1..C17, S*
+    cpsat_solve        CP-SAT search (bounded by the case's time limit)
+    extract            extract_assignments
+    calculate_scores   calculate_scores
+    build_output       run_solver.build_output_schema
+
+A phase regresses when its wall time (or peak RSS) exceeds the baseline by
+more than --tolerance *and* by more than an absolute floor, so millisecond
+phases do not flap. Model size regresses on any growth beyond --tolerance;
+quality regresses when the hard score or unassigned-slot count goes up,
+unless it is still at the proven minimum (slots beyond the solver's
+coverage upper bound). CP-SAT runs on a pinned worker and seed with a
+deterministic time limit (SOLVER_PINS), so the quality of a case does not
+depend on thread timing or machine load.
+
+Baselines are machine-specific: regenerate with --update-baseline on the
+machine that runs the gate.
+
+Run:
+    python benchmarks/run_benchmarks.py                     # quick tier, compare
+    python benchmarks/run_benchmarks.py --tier full         # adds the larger scenarios
+    python benchmarks/run_benchmarks.py --cases gen_small --out /tmp/bench.json
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import pathlib
+import platform
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+PHASES = (
+    "build_slots", "build_model", "apply_constraints", "cpsat_solve",
+    "extract", "calculate_scores", "build_output",
+)
+
+# name -> case. "recorded" cases read an input file; "generated" cases call
+# generate_scenario(**params). The quick tier is what the gate runs; the full
+# tier adds sizes that take minutes on a single core.
+CASES = {
+    "v07_recorded": {"tier": "quick", "input": "input/input_v0.7.json", "timeLimit": 2},
+    "v07_scheme_p": {"tier": "quick", "input": "input/input_v0.7_SchemePtest.json", "timeLimit": 4},
+    "gen_small": {
+        "tier": "quick", "timeLimit": 2,
+        "generate": {"num_employees": 60, "num_demands": 3, "horizon_days": 14, "seed": 1},
+    },
+    "gen_medium": {
+        "tier": "full", "timeLimit": 10,
+        "generate": {"num_employees": 100, "num_demands": 4, "horizon_days": 21, "seed": 2},
+    },
+    "gen_large": {
+        "tier": "full", "timeLimit": 20,
+        "generate": {"num_employees": 150, "num_demands": 5, "horizon_days": 28, "seed": 3},
+    },
+    # Every requirement is staffed from its own whitelisted team. Without
+    # whitelists each slot is open to every employee of its rank, and the
+    # model (~700k variables) outgrows a 6 GB benchmark machine
+    "gen_xlarge": {
+        "tier": "full", "timeLimit": 30,
+        "generate": {"num_employees": 500, "num_demands": 10, "horizon_days": 14,
+                     "whitelist_rate": 1.0, "seed": 4},
+    },
+}
+
+TIERS = {"quick": ("quick",), "full": ("quick", "full")}
+
+# CP-SAT settings applied to every case: a single seeded worker stopped by
+# deterministic time (work done, not wall time) searches the same way on
+# every run. The case's timeLimit is the deterministic limit; the wall-clock
+# limit is WALL_LIMIT_FACTOR times that, only as a safety net (deterministic
+# time runs several times slower than wall time on a loaded single core).
+SOLVER_PINS = {"numWorkers": 1, "randomSeed": 0}
+WALL_LIMIT_FACTOR = 10
+BENCHMARK_HASH_SEED = "0"
+
+
+# ---------------------------------------------------------------------------
+# Measurement (runs inside the per-case worker process)
+# ---------------------------------------------------------------------------
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Background thread recording (perf_counter, rss_bytes) every `interval` seconds."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = current_rss_bytes()
+            if rss is None:
+                return
+            self.samples.append((time.perf_counter(), rss))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def peak_mb(self, start, end):
+        """Peak RSS (MB) over [start, end]; the nearest sample if none falls inside."""
+        inside = [rss for t, rss in self.samples if start <= t <= end]
+        if not inside:
+            before = [rss for t, rss in self.samples if t <= end]
+            inside = before[-1:] or [rss for _, rss in self.samples[:1]]
+        return round(max(inside) / 1e6, 1) if inside else None
+
+
+class PhaseClock:
+    """Duck-typed ctx['profiler']: records the perf_counter interval of each phase."""
+
+    def __init__(self):
+        self.intervals = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.intervals[name] = (start, time.perf_counter())
+
+
+def _load_case_input(case):
+    if "generate" in case:
+        from src.generate_scenario import generate_scenario
+        return generate_scenario(**case["generate"])
+    with open(ROOT / case["input"]) as fh:
+        return json.load(fh)
+
+
+def run_case(name, case):
+    """Solve one case and return its phase/model/quality record."""
+    os.chdir(ROOT)
+    from context.engine import metrics
+    from context.engine.data_loader import load_input
+    from context.engine.solver_engine import solve
+    from src.run_solver import build_output_schema
+
+    data = _load_case_input(case)
+    with tempfile.TemporaryDirectory(prefix="ngrs-bench-") as tmp:
+        input_path = pathlib.Path(tmp) / f"{name}.json"
+        input_path.write_text(json.dumps(data))
+        ctx = load_input(str(input_path))
+    ctx.update(SOLVER_PINS, deterministicTimeLimit=case["timeLimit"])
+    ctx["timeLimit"] = case["timeLimit"] * WALL_LIMIT_FACTOR
+    clock = ctx["profiler"] = PhaseClock()
+
+    sampler = RssSampler().start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            status, solver_result, assignments, violations = solve(ctx)
+            with clock.phase("output_build"):
+                build_output_schema(str(input_path), ctx, status, solver_result, assignments, violations)
+    finally:
+        sampler.stop()
+
+    timings = ctx["phase_timings"]
+    build_start, build_end = clock.intervals["build_model"]
+    slots_end = build_start + timings.get("slot_build", 0.0)
+    intervals = {
+        "build_slots": (build_start, slots_end),
+        "build_model": (slots_end, build_end),
+        "apply_constraints": clock.intervals.get("constraints"),
+        "cpsat_solve": clock.intervals.get("cpsat_solve"),
+        "extract": clock.intervals.get("extract"),
+        "calculate_scores": clock.intervals.get("score"),
+        "build_output": clock.intervals.get("output_build"),
+    }
+    phases = {}
+    for phase in PHASES:
+        interval = intervals[phase]
+        if interval is None:  # e.g. extract is skipped when CP-SAT finds no solution
+            continue
+        start, end = interval
+        phases[phase] = {
+            "wallMs": round((end - start) * 1000, 1),
+            "peakRssMB": sampler.peak_mb(start, end),
+        }
+
+    unassigned = sum(1 for a in assignments if a.get("status") == "UNASSIGNED")
+    # Proven minimum of unassigned slots: the matching bound, else the capacity shortfall
+    coverage = solver_result.get("coverage")
+    if coverage:
+        min_unassigned = coverage["totalSlots"] - coverage["upperBound"]
+    else:
+        min_unassigned = (solver_result.get("capacity") or {}).get("shortfall", 0)
+    gap = metrics.LAST_OBJECTIVE_GAP.value() if status in (2, 4) else None
+    return {
+        "phases": phases,
+        "model": {
+            "slots": len(ctx.get("slots", [])),
+            "employees": len(ctx.get("employees", [])),
+            "vars": solver_result["num_vars"],
+            "constraints": solver_result["num_constraints"],
+        },
+        "quality": {
+            "status": solver_result["status"],
+            "hard": solver_result["scores"]["hard"],
+            "soft": solver_result["scores"]["soft"],
+            "assigned": len(assignments) - unassigned,
+            "unassigned": unassigned,
+            "minUnassigned": min_unassigned,
+            "objectiveGap": round(gap, 6) if gap is not None else None,
+        },
+        "timeLimitSec": case["timeLimit"],
+    }
+
+
+def run_isolated(name, case):
+    """Run one case in a fresh spawned process (clean RSS, no warm caches)."""
+    # Set and dict iteration in the constraint modules follows string hashes;
+    # a fixed hash seed makes the worker build the same model on every run
+    os.environ["PYTHONHASHSEED"] = BENCHMARK_HASH_SEED
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, name, case).result()
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def _exceeds(current, base, tolerance, floor):
+    if current is None or base is None:
+        return False
+    return current > base * (1 + tolerance) and current - base > floor
+
+
+def compare(baseline, results, tolerance=0.5, time_floor_ms=50.0, rss_floor_mb=20.0):
+    """
+    Compare benchmark results with a baseline; return a list of regression messages.
+
+    Only cases and phases present in both are compared, so a baseline recorded
+    with --tier full still gates a quick run.
+    """
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    for name, result in sorted(results.items()):
+        base = base_cases.get(name)
+        if base is None:
+            continue
+        for phase, stats in result["phases"].items():
+            base_stats = base["phases"].get(phase)
+            if base_stats is None:
+                continue
+            if _exceeds(stats["wallMs"], base_stats["wallMs"], tolerance, time_floor_ms):
+                regressions.append(
+                    f"{name}: {phase} wall time {stats['wallMs']:.1f} ms > baseline {base_stats['wallMs']:.1f} ms"
+                )
+            if _exceeds(stats.get("peakRssMB"), base_stats.get("peakRssMB"), tolerance, rss_floor_mb):
+                regressions.append(
+                    f"{name}: {phase} peak RSS {stats['peakRssMB']:.1f} MB > baseline {base_stats['peakRssMB']:.1f} MB"
+                )
+        for key in ("vars", "constraints"):
+            if _exceeds(result["model"][key], base["model"][key], tolerance, 0):
+                regressions.append(
+                    f"{name}: model {key} {result['model'][key]} > baseline {base['model'][key]}"
+                )
+        # At the proven minimum no roster can do better, so it never regresses
+        floor = result["quality"].get("minUnassigned", 0)
+        for key in ("hard", "unassigned"):
+            if result["quality"][key] > max(base["quality"][key], floor):
+                regressions.append(
+                    f"{name}: {key} {result['quality'][key]} > baseline {base['quality'][key]}"
+                )
+    return regressions
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "recordedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def print_table(results):
+    print(f"\n{'case':<14} {'phase':<18} {'wall ms':>10} {'peak RSS MB':>12}")
+    for name, result in results.items():
+        for phase, stats in result["phases"].items():
+            rss = stats["peakRssMB"] if stats["peakRssMB"] is not None else float("nan")
+            print(f"{name:<14} {phase:<18} {stats['wallMs']:>10.1f} {rss:>12.1f}")
+        model, quality = result["model"], result["quality"]
+        print(f"{name:<14} model {model['vars']} vars / {model['constraints']} constraints, "
+              f"{quality['status']} hard={quality['hard']} unassigned={quality['unassigned']} "
+              f"gap={quality['objectiveGap']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tier", choices=sorted(TIERS), default="quick")
+    ap.add_argument("--cases", nargs="+", choices=sorted(CASES), help="Run only these cases (overrides --tier)")
+    ap.add_argument("--baseline", type=pathlib.Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (0.5 = +50%%)")
+    ap.add_argument("--time-floor-ms", type=float, default=50.0)
+    ap.add_argument("--rss-floor-mb", type=float, default=20.0)
+    ap.add_argument("--out", type=pathlib.Path, help="Also write results JSON here")
+    args = ap.parse_args()
+
+    names = args.cases or [n for n, c in CASES.items() if c["tier"] in TIERS[args.tier]]
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        results[name] = run_isolated(name, CASES[name])
+        print(f"  {name}: {time.perf_counter() - start:.1f}s", flush=True)
+    print_table(results)
+
+    report = {"environment": environment(), "cases": results}
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n✓ baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(baseline, results, args.tolerance, args.time_floor_ms, args.rss_floor_mb)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) vs {args.baseline.name}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\n✓ no regressions vs {args.baseline.name} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
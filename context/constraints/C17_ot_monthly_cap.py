@@ -32,13 +32,8 @@ def add_constraints(model, ctx):
         print(f"[C17] Warning: Slots, employees, or decision variables not available")
         return
     
-    # Calculate OT hours for each slot (same logic as C2)
-    slot_ot_hours = {}
-    for slot in slots:
-        gross = (slot.end - slot.start).total_seconds() / 3600.0
-        # OT = hours beyond 9h daily threshold
-        ot_hours = max(0, gross - 9.0)
-        slot_ot_hours[slot.slot_id] = ot_hours
+    # OT hours (tenths, beyond the 9h daily threshold) for each slot (same shape table as C2)
+    slot_ot_tenths = {slot.slot_id: slot.shape.ot for slot in slots}
     
     # Group slots by (employee, calendar month)
     emp_month_slots = defaultdict(list)
@@ -60,12 +55,10 @@ def add_constraints(model, ctx):
         for slot in month_slots:
             if (slot.slot_id, emp_id) in x:
                 var = x[(slot.slot_id, emp_id)]
-                ot_hours = slot_ot_hours.get(slot.slot_id, 0)
+                ot_tenths = slot_ot_tenths.get(slot.slot_id, 0)
                 
-                if ot_hours > 0:
-                    # Scale to integer tenths (multiply by 10)
-                    int_hours = int(round(ot_hours * 10))
-                    terms.append(var * int_hours)
+                if ot_tenths > 0:
+                    terms.append(var * ot_tenths)
         
         if terms:
             # Constraint: sum(var * scaled_ot) <= 72 * 10 = 720
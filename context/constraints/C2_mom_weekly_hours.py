@@ -17,8 +17,6 @@ Input Schema (v0.43):
 - demandItems: [{ demandId, shiftStartDate, shifts: [{ shiftDetails, rotationSequence }] }]
 - planningHorizon: { startDate, endDate }
 """
-from datetime import datetime, timedelta
-from context.engine.time_utils import split_shift_hours
 from collections import defaultdict
 
 
@@ -37,11 +35,10 @@ def add_constraints(model, ctx):
     
     Args:
         model: CP-SAT model
-        ctx: Context dict with 'employees', 'demandItems', 'slots', 'x'
+        ctx: Context dict with 'employees', 'slots', 'x'
     """
     
     employees = ctx.get('employees', [])
-    demand_items = ctx.get('demandItems', [])
     slots = ctx.get('slots', [])
     x = ctx.get('x', {})
     
@@ -49,37 +46,6 @@ def add_constraints(model, ctx):
         print(f"[C2] Warning: Slots or decision variables not available")
         return
     
-    # Extract shift information by demand and shift code
-    shift_info = {}
-    for demand in demand_items:
-        demand_id = demand.get('demandId')
-        
-        for shift_group in demand.get('shifts', []):
-            shift_details_list = shift_group.get('shiftDetails', [])
-            
-            for sd in shift_details_list:
-                shift_code = sd.get('shiftCode', '?')
-                start_str = sd.get('start')
-                end_str = sd.get('end')
-                
-                try:
-                    start_time = datetime.strptime(start_str, '%H:%M').time() if start_str else None
-                    end_time = datetime.strptime(end_str, '%H:%M').time() if end_str else None
-                    
-                    if start_time and end_time:
-                        dummy_date = datetime(2025, 1, 1)
-                        start_dt = datetime.combine(dummy_date.date(), start_time)
-                        end_dt = datetime.combine(dummy_date.date(), end_time)
-                        
-                        if end_dt < start_dt:
-                            end_dt = end_dt + timedelta(days=1)
-                        
-                        hours_breakdown = split_shift_hours(start_dt, end_dt)
-                        key = f"{demand_id}-{shift_code}"
-                        shift_info[key] = hours_breakdown
-                except Exception:
-                    pass
-    
     # Build employee-week and employee-month groupings of slots
     emp_week_slots = defaultdict(lambda: defaultdict(list))  # emp_id -> week_key -> [slots]
     emp_month_slots = defaultdict(lambda: defaultdict(list))  # emp_id -> month_key -> [slots]
@@ -104,19 +70,15 @@ def add_constraints(model, ctx):
             # For each slot in this week, get normal hours and create weighted sum
             weighted_assignments = []
             for slot in week_slots:
-                # Find shift info for this slot
-                slot_key = f"{slot.demandId}-{slot.shiftCode}"
-                hours_data = shift_info.get(slot_key)
+                # Normal hours in tenths, looked up from the interned shift shape
+                normal_tenths = slot.shape.normal
                 
-                if hours_data and (slot.slot_id, emp_id) in x:
-                    normal_hours = hours_data.get('normal', 0)
+                if (slot.slot_id, emp_id) in x:
                     var = x[(slot.slot_id, emp_id)]
                     
                     # Only include if there are actual normal hours
-                    if normal_hours > 0:
-                        # Scale to integer (multiply by 10 for tenths of hours)
-                        int_hours = int(round(normal_hours * 10))
-                        weighted_assignments.append((var, int_hours))
+                    if normal_tenths > 0:
+                        weighted_assignments.append((var, normal_tenths))
             
             if weighted_assignments:
                 # Create constraint: sum(var_i * normal_hours_i) <= 44 * 10 = 440 (in tenths)
@@ -131,19 +93,15 @@ def add_constraints(model, ctx):
             # For each slot in this month, get OT hours and create weighted sum
             weighted_assignments = []
             for slot in month_slots:
-                # Find shift info for this slot
-                slot_key = f"{slot.demandId}-{slot.shiftCode}"
-                hours_data = shift_info.get(slot_key)
+                # OT hours in tenths, looked up from the interned shift shape
+                ot_tenths = slot.shape.ot
                 
-                if hours_data and (slot.slot_id, emp_id) in x:
-                    ot_hours = hours_data.get('ot', 0)
+                if (slot.slot_id, emp_id) in x:
                     var = x[(slot.slot_id, emp_id)]
                     
                     # Only include if there are actual OT hours
-                    if ot_hours > 0:
-                        # Scale to integer (multiply by 10 for tenths of hours)
-                        int_hours = int(round(ot_hours * 10))
-                        weighted_assignments.append((var, int_hours))
+                    if ot_tenths > 0:
+                        weighted_assignments.append((var, ot_tenths))
             
             if weighted_assignments:
                 # Create constraint: sum(var_i * ot_hours_i) <= 72 * 10 = 720 (in tenths)
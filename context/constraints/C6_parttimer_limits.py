@@ -106,12 +106,10 @@ def add_constraints(model, ctx):
         for slot in week_slots:
             if (slot.slot_id, emp_id) in x:
                 var = x[(slot.slot_id, emp_id)]
-                gross_hours = (slot.end - slot.start).total_seconds() / 3600.0
+                gross_tenths = slot.shape.gross  # Integer tenths from the shift shape table
                 
-                if gross_hours > 0:
-                    # Scale to integer tenths (×10)
-                    int_hours = int(round(gross_hours * 10))
-                    hour_terms.append(var * int_hours)
+                if gross_tenths > 0:
+                    hour_terms.append(var * gross_tenths)
         
         if not hour_terms:
             continue
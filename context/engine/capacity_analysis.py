@@ -0,0 +1,280 @@
+"""Capacity Analysis - pre-solve bounds on fillable slots.
+
+When demand exceeds the qualified headcount, CP-SAT still spends the whole
+timeLimit proving that the remaining slots cannot be filled. This runs before
+any variable is created, in O(slots + employees x requirements x days):
+
+- Eligibility per employee, requirement and day mirrors the variable filters
+  in build_model and the C7 / C11 hard rules, restricted to the rotation's
+  work days when offsets are fixed. Employees with identical availability
+  are counted together.
+- Per requirement, day and shift code, slots beyond the number of eligible
+  employees can never be filled (each employee takes at most one slot per
+  day). They are guaranteed unfillable; build_model creates no variables for
+  them and they are reported unassigned.
+- Per day, a max flow from employee groups to the day's requirements bounds
+  the slots that can be filled at all (upperBound). With capacityFastFail
+  set in the input, solve() returns without running CP-SAT when the bound is
+  below the slot count.
+"""
+
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .slot_builder import build_slot_table, ordinal_date
+
+# Largest shortfall groups / days listed in the report
+REPORT_LIMIT = 50
+
+
+def employee_day_mask(emp: Dict, spec, days: np.ndarray) -> np.ndarray:
+    """Days on which an employee may take a slot of ``spec``, rotation aside.
+
+    Mirrors the variable filters in build_model (gender, scheme, whitelist,
+    blacklist ranges) and the C7 / C11 hard rules (qualification held and
+    unexpired, rank match).
+    """
+    emp_id = emp.get('employeeId')
+    blocked = np.zeros(len(days), dtype=bool)
+    gender = emp.get('gender', 'Unknown')
+    if spec.genderRequirement in ('M', 'F') and gender != spec.genderRequirement:
+        return blocked
+    if spec.schemeRequirement != 'Global' and spec.schemeRequirement != emp.get('scheme', ''):
+        return blocked
+    whitelist = spec.whitelist
+    if any(whitelist.get(k) for k in ('employeeIds', 'teamIds')):
+        if not (emp_id in (whitelist.get('employeeIds') or [])
+                or emp.get('teamId') in (whitelist.get('teamIds') or [])):
+            return blocked
+    if emp.get('rankId', 'UNKNOWN') != spec.rankId:
+        return blocked
+
+    mask = np.ones(len(days), dtype=bool)
+    for entry in (spec.blacklist or {}).get('employeeIds', []):
+        if entry.get('employeeId') != emp_id:
+            continue
+        try:
+            start = datetime.fromisoformat(entry.get('blacklistStartDate', '')).date().toordinal()
+            end = datetime.fromisoformat(entry.get('blacklistEndDate', '')).date().toordinal()
+        except ValueError:
+            continue  # unparseable range: build_model allows the assignment too
+        mask &= (days < start) | (days > end)
+
+    if spec.requiredQualifications:
+        expiries = {}
+        for qual in list(emp.get('licenses', [])) + list(emp.get('qualifications', [])):
+            if qual.get('code') and qual.get('expiryDate'):
+                expiries[qual['code']] = qual['expiryDate']
+        for code in spec.requiredQualifications:
+            try:
+                expiry = datetime.strptime(expiries[code], '%Y-%m-%d').date().toordinal()
+            except (KeyError, ValueError, TypeError):
+                return blocked
+            mask &= days <= expiry
+    return mask
+
+
+def max_flow(supply: List[int], demand: List[int], reach: List[List[int]]) -> int:
+    """Max flow of a bipartite supply/demand graph (greedy start, then augmenting paths)."""
+    flow = defaultdict(int)  # (group, requirement) -> units
+    supply_left = list(supply)
+    demand_left = list(demand)
+    served_by = defaultdict(list)  # requirement -> groups with flow into it
+    total = 0
+    # Greedy start, least flexible groups first; augmenting paths repair the rest
+    for g in sorted(range(len(supply)), key=lambda g: len(reach[g])):
+        for r in reach[g]:
+            amount = min(supply_left[g], demand_left[r])
+            if amount:
+                flow[(g, r)] += amount
+                served_by[r].append(g)
+                supply_left[g] -= amount
+                demand_left[r] -= amount
+                total += amount
+    if not any(supply_left) or not any(demand_left):
+        return total
+    while True:
+        # BFS from groups with spare supply to a requirement with spare demand
+        parent = {}
+        queue = deque()
+        for g, spare in enumerate(supply_left):
+            if spare:
+                parent[('g', g)] = None
+                queue.append(('g', g))
+        end = None
+        while queue and end is None:
+            node = queue.popleft()
+            if node[0] == 'g':
+                for r in reach[node[1]]:
+                    if ('r', r) not in parent:
+                        parent[('r', r)] = node
+                        if demand_left[r]:
+                            end = ('r', r)
+                            break
+                        queue.append(('r', r))
+            else:
+                for g in served_by[node[1]]:
+                    if flow[(g, node[1])] and ('g', g) not in parent:
+                        parent[('g', g)] = node
+                        queue.append(('g', g))
+        if end is None:
+            return total
+        # Bottleneck along the path
+        path = []
+        node = end
+        while parent[node] is not None:
+            path.append((parent[node], node))
+            node = parent[node]
+        amount = min(supply_left[node[1]], demand_left[end[1]])
+        for tail, head in path:
+            if tail[0] == 'r':  # backward edge: undo flow
+                amount = min(amount, flow[(head[1], tail[1])])
+        for tail, head in path:
+            if tail[0] == 'g':
+                if not flow[(tail[1], head[1])]:
+                    served_by[head[1]].append(tail[1])
+                flow[(tail[1], head[1])] += amount
+            else:
+                flow[(head[1], tail[1])] -= amount
+        supply_left[node[1]] -= amount
+        demand_left[end[1]] -= amount
+        total += amount
+
+
+def _work_days(spec, days: np.ndarray, offset: int) -> Optional[np.ndarray]:
+    """Rotation work days of ``spec`` for an employee on ``offset`` (None: no rotation)."""
+    rotation_seq = spec.rotationSequence
+    if not rotation_seq or not spec.coverageAnchor:
+        return None
+    off_days = np.array([shift == 'O' for shift in rotation_seq])
+    since_anchor = days - spec.coverageAnchor.toordinal()
+    # Same cycle-day arithmetic as slot_builder.rotation_off_day
+    return ~off_days[(since_anchor - offset) % len(rotation_seq)]
+
+
+def analyze_capacity(ctx: Dict, table=None, rotation: Optional[bool] = None) -> Dict:
+    """
+    Compare required slots with eligible on-pattern employees before solving.
+
+    Args:
+        ctx: Input context (demandItems, employees, planningHorizon, ...)
+        table: Slot table of ctx (built when omitted)
+        rotation: Count only rotation work days for each employee's offset
+            (default: fixedRotationOffset)
+
+    Returns:
+        Dict with totalSlots, upperBound (slots any roster can fill),
+        shortfall (totalSlots - upperBound), unfillable (guaranteed unfillable
+        slots), groups / days (largest shortfalls), durationMs and
+        fixedSlotIds (slot IDs build_model leaves unassigned)
+    """
+    analysis_start = time.perf_counter()
+    table = build_slot_table(ctx) if table is None else table
+    rotation = ctx.get('fixedRotationOffset', True) if rotation is None else rotation
+    employees = ctx.get('employees', [])
+    specs = table.specs
+    days = np.unique(table.day)
+    day_pos = np.searchsorted(days, table.day)
+    demand = np.zeros((len(specs), len(days)), dtype=np.int64)
+    np.add.at(demand, (table.requirement_idx, day_pos), 1)
+
+    # Employees with identical availability (requirement x day) are counted together
+    work_cache = {}
+    by_signature = {}
+    supply: List[int] = []
+    available: List[np.ndarray] = []
+    for emp in employees:
+        offset = emp.get('rotationOffset', 0)
+        rows = []
+        for r, spec in enumerate(specs):
+            mask = employee_day_mask(emp, spec, days)
+            if rotation and mask.any():
+                if (r, offset) not in work_cache:
+                    work_cache[(r, offset)] = _work_days(spec, days, offset)
+                if work_cache[(r, offset)] is not None:
+                    mask = mask & work_cache[(r, offset)]
+            rows.append(mask)
+        avail = np.array(rows, dtype=bool).reshape(len(specs), len(days))
+        key = avail.tobytes()
+        if key not in by_signature:
+            by_signature[key] = len(supply)
+            supply.append(0)
+            available.append(avail)
+        supply[by_signature[key]] += 1
+    available = np.array(available, dtype=bool).reshape(len(supply), len(specs), len(days))
+    eligible = np.tensordot(np.array(supply, dtype=np.int64), available, axes=1) \
+        if supply else np.zeros_like(demand)
+
+    # Guaranteed unfillable: per requirement, day and shift code, slots beyond
+    # the eligible headcount (highest positions first)
+    per_shift = defaultdict(list)  # (requirement, day, shift) -> [(position, row)]
+    short = np.flatnonzero(demand[table.requirement_idx, day_pos] > eligible[table.requirement_idx, day_pos])
+    for row in short.tolist():
+        key = (int(table.requirement_idx[row]), int(day_pos[row]), int(table.shift_idx[row]))
+        per_shift[key].append((int(table.position[row]), row))
+    fixed_rows = []
+    for (r, d, _), members in per_shift.items():
+        excess = len(members) - int(eligible[r, d])
+        if excess > 0:
+            fixed_rows.extend(row for _, row in sorted(members)[-excess:])
+    fixed_slot_ids = [slot.slot_id for slot in table.iter_slots(np.array(sorted(fixed_rows), dtype=np.int64))]
+
+    # Matching bound: per day, employee groups reaching the same requirements are merged
+    day_bounds = []
+    for d in range(len(days)):
+        reaches = defaultdict(int)
+        for c, count in enumerate(supply):
+            reach = tuple(np.flatnonzero(available[c, :, d]).tolist())
+            if reach:
+                reaches[reach] += count
+        day_bounds.append(max_flow(list(reaches.values()), demand[:, d].tolist(),
+                                   [list(reach) for reach in reaches]))
+
+    groups = []
+    for r, d in zip(*np.nonzero(demand > eligible)):
+        spec = specs[r]
+        groups.append({
+            "date": ordinal_date(int(days[d])).isoformat(),
+            "demandId": spec.demandId,
+            "requirementId": spec.requirementId,
+            "rankId": spec.rankId,
+            "scheme": spec.schemeRequirement,
+            "gender": spec.genderRequirement,
+            "qualifications": list(spec.requiredQualifications),
+            "required": int(demand[r, d]),
+            "eligible": int(eligible[r, d]),
+            "unfillable": int(demand[r, d] - eligible[r, d]),
+        })
+    groups.sort(key=lambda g: (-g["unfillable"], g["date"], g["demandId"], g["requirementId"]))
+    short_days = [
+        {"date": ordinal_date(int(days[d])).isoformat(), "required": int(demand[:, d].sum()), "fillable": bound}
+        for d, bound in enumerate(day_bounds) if bound < demand[:, d].sum()
+    ]
+    short_days.sort(key=lambda day: (day["fillable"] - day["required"], day["date"]))
+
+    total_slots = len(table)
+    upper_bound = int(sum(day_bounds))
+    report = {
+        "totalSlots": total_slots,
+        "upperBound": upper_bound,
+        "shortfall": total_slots - upper_bound,
+        "unfillable": int(np.maximum(demand - eligible, 0).sum()),
+        "employeeGroups": len(supply),
+        "groups": groups[:REPORT_LIMIT],
+        "days": short_days[:REPORT_LIMIT],
+        "durationMs": round((time.perf_counter() - analysis_start) * 1000, 1),
+        "fixedSlotIds": fixed_slot_ids,
+    }
+    print(f"[capacity] {total_slots} slots, at most {upper_bound} fillable "
+          f"({report['unfillable']} guaranteed unfillable, {len(fixed_slot_ids)} fixed unassigned) "
+          f"in {report['durationMs']}ms")
+    return report
+
+
+def capacity_summary(report: Dict) -> Dict:
+    """The report without the slot ID list (for solver results and output)."""
+    return {k: v for k, v in report.items() if k != "fixedSlotIds"}
@@ -0,0 +1,189 @@
+"""Compiled Model - build the CP-SAT model once, re-solve under different bounds.
+
+solve() rebuilds slots, variables and every constraint module on each call,
+which dominates sweeps over near-identical inputs (offset search, sensitivity
+scripts). CompiledModel builds once with the fixed-offset off days left out of
+the model, then expresses each scenario as variable bounds:
+
+- rotation offsets: x fixed to 0 on the employee's off days
+- enabled demands: every x of a disabled demand's slots fixed to 0 and the
+  slot marked unassigned (dropped from the reported assignments)
+- unavailability: x fixed to 0 for an employee on the given dates
+
+Between solves only the bounds that differ from the previous scenario are
+rewritten in the model proto. The previous solution is offered as a hint.
+"""
+
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+from . import metrics
+from .profiling import phase_context
+from .solver_engine import apply_constraints, build_model, rotation_off_day, solve_model
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else datetime.fromisoformat(str(value)).date()
+
+
+class CompiledModel:
+    """
+    A built model that can be re-solved with different offsets, demands and availability.
+
+    Usage:
+        compiled = CompiledModel(ctx)
+        for offsets in candidates:
+            status, result, assignments, violations = compiled.solve(offsets=offsets)
+
+    Attributes:
+        ctx: Private context the model was built from (slots, x, unassigned, ...)
+        model: The CP-SAT model
+        build_seconds: Time spent building slots, variables and constraints
+        solves: Number of solve() calls so far
+    """
+
+    def __init__(self, ctx: Dict):
+        self.ctx = dict(ctx)
+        self.ctx['deferRotationBounds'] = True
+        self.ctx['phase_timings'] = {}
+        self.ctx['model_stats'] = []
+        profile_phase = phase_context(self.ctx)
+        build_start = time.perf_counter()
+        with profile_phase("build_model"):
+            self.model = build_model(self.ctx)
+        with profile_phase("constraints"):
+            apply_constraints(self.model, self.ctx)
+        self.build_seconds = time.perf_counter() - build_start
+        self._build_timings = dict(self.ctx['phase_timings'])
+        self._build_stats = list(self.ctx['model_stats'])
+
+        self.fixed_offsets = self.ctx.get('fixedRotationOffset', True)
+        self._proto = self.model.Proto()
+        self._x_by_emp_slot = defaultdict(list)  # emp_id -> [(slot, var index)]
+        for slot in self.ctx['slots']:
+            for emp_id, var in self.ctx['x_by_slot'].get(slot.slot_id, ()):
+                self._x_by_emp_slot[emp_id].append((slot, var.Index()))
+        self._slots_by_demand = defaultdict(list)
+        for slot in self.ctx['slots']:
+            self._slots_by_demand[slot.demandId].append(slot)
+        self._employees = list(self.ctx.get('employees', []))
+        self._default_offsets = {
+            emp.get('employeeId'): emp.get('rotationOffset', 0) for emp in self._employees
+        }
+        self._bounds: Dict[int, int] = {}  # var index -> fixed value currently applied
+        self._hint: Dict[int, tuple] = {}  # var index -> (var, value) of the last solution
+        self.solves = 0
+
+    def scenario_bounds(
+        self,
+        offsets: Optional[Dict[str, int]] = None,
+        enabled_demands: Optional[Iterable[str]] = None,
+        unavailable: Optional[Dict[str, Iterable]] = None,
+    ) -> Dict[int, int]:
+        """Variable index -> fixed value for one scenario (unlisted variables stay free)."""
+        bounds = {}
+        if self.fixed_offsets:
+            merged = dict(self._default_offsets, **(offsets or {}))
+            for emp_id, pairs in self._x_by_emp_slot.items():
+                offset = merged.get(emp_id, 0)
+                for slot, index in pairs:
+                    if rotation_off_day(slot, offset):
+                        bounds[index] = 0
+        for emp_id, dates in (unavailable or {}).items():
+            days = {_as_date(d) for d in dates}
+            for slot, index in self._x_by_emp_slot.get(emp_id, ()):
+                if slot.date in days:
+                    bounds[index] = 0
+        if enabled_demands is not None:
+            enabled = set(enabled_demands)
+            unassigned = self.ctx['unassigned']
+            x_by_slot = self.ctx['x_by_slot']
+            for demand_id, slots in self._slots_by_demand.items():
+                if demand_id in enabled:
+                    continue
+                for slot in slots:
+                    bounds[unassigned[slot.slot_id].Index()] = 1
+                    for _, var in x_by_slot.get(slot.slot_id, ()):
+                        bounds[var.Index()] = 0
+        return bounds
+
+    def _apply_bounds(self, bounds: Dict[int, int]) -> int:
+        """Rewrite only the domains that differ from the applied scenario; returns the count."""
+        variables = self._proto.variables
+        changed = 0
+        for index in self._bounds.keys() - bounds.keys():
+            variables[index].domain[0] = 0  # every bounded variable is a BoolVar
+            variables[index].domain[1] = 1
+            changed += 1
+        for index, value in bounds.items():
+            if self._bounds.get(index) != value:
+                variables[index].domain[0] = value
+                variables[index].domain[1] = value
+                changed += 1
+        self._bounds = bounds
+        return changed
+
+    def solve(
+        self,
+        offsets: Optional[Dict[str, int]] = None,
+        enabled_demands: Optional[Iterable[str]] = None,
+        unavailable: Optional[Dict[str, Iterable]] = None,
+        time_limit: Optional[float] = None,
+        warm_start: bool = True,
+    ):
+        """
+        Solve one scenario on the compiled model.
+
+        Args:
+            offsets: employeeId -> rotationOffset overrides (others keep the input offset);
+                ignored when the input optimizes offsets (fixedRotationOffset false)
+            enabled_demands: demandIds to roster (default: all); other demands' slots
+                are left out of the returned assignments
+            unavailable: employeeId -> dates (date or ISO string) the employee cannot work
+            time_limit: CP-SAT time limit (default: ctx timeLimit)
+            warm_start: Hint the previous solution
+
+        Returns:
+            Same tuple as solve_model(): (status_code, solver_result, assignments, violations)
+        """
+        start_time = time.time()
+        ctx = self.ctx
+        ctx['phase_timings'] = dict(self._build_timings) if not self.solves else {}
+        ctx['model_stats'] = list(self._build_stats) if not self.solves else []
+        if time_limit is not None:
+            ctx['timeLimit'] = time_limit
+        ctx['employees'] = [
+            dict(emp, rotationOffset=offsets[emp.get('employeeId')])
+            if offsets and emp.get('employeeId') in offsets else emp
+            for emp in self._employees
+        ]
+
+        bounds_start = time.perf_counter()
+        changed = self._apply_bounds(self.scenario_bounds(offsets, enabled_demands, unavailable))
+        self.model.ClearHints()
+        if warm_start:
+            for index, (var, value) in self._hint.items():
+                if self._bounds.get(index, value) == value:
+                    self.model.AddHint(var, value)
+        metrics.observe_phase("bounds", time.perf_counter() - bounds_start, ctx['phase_timings'])
+        print(f"[compiled_model] Solve #{self.solves + 1}: {len(self._bounds)} fixed variables "
+              f"({changed} bounds changed)")
+
+        keep_slot = None
+        if enabled_demands is not None:
+            enabled = set(enabled_demands)
+            keep_slot = lambda assignment: assignment.get('demandId') in enabled
+        status, solver_result, assignments, violations = solve_model(
+            ctx, self.model, start_time, keep_slot=keep_slot)
+        self.solves += 1
+
+        self._hint = {}
+        if assignments:
+            assigned = {(a['slotId'], a['employeeId']) for a in assignments if a.get('employeeId')}
+            for (slot_id, emp_id), var in ctx['x'].items():
+                self._hint[var.Index()] = (var, int((slot_id, emp_id) in assigned))
+        solver_result['build_seconds'] = round(self.build_seconds, 3)
+        solver_result['bounds_changed'] = changed
+        return status, solver_result, assignments, violations
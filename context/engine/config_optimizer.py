@@ -5,18 +5,50 @@ This module optimizes roster configuration by finding the best:
 1. Work patterns for each requirement
 2. Minimum employee count needed
 3. Rotation offsets for employees
+
+Two modes: 'heuristic' (closed-form employee count, staggered offsets,
+vectorised coverage scoring) and 'exact' (a small CP-SAT model per
+requirement that returns provably minimal staffing).
 """
 
+import io
+import os
+import time
+import atexit
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import List, Dict, Tuple
 from itertools import product
+
+import numpy as np
+from ortools.sat.python import cp_model
+
 from .coverage_simulator import (
     simulate_coverage,
+    evaluate_candidates,
+    horizon_coverage,
+    pattern_bitmask,
+    work_matrix,
+    offset_counts,
     calculate_min_employees,
     verify_pattern_feasibility,
     generate_staggered_offsets,
     evaluate_coverage_quality
 )
+from .pattern_enumerator import (
+    enumerate_patterns,
+    max_consecutive_work_days,
+    peak_weekly_work_days,
+    weekly_hour_limit
+)
+
+DEFAULT_CYCLE_LENGTH = 6
+CONFIG_MODES = ('heuristic', 'exact')
+EXACT_TIME_LIMIT_SEC = 10.0
 
 
 def generate_pattern_candidates(
@@ -26,7 +58,11 @@ def generate_pattern_candidates(
     max_work_days: int = 5
 ) -> List[List[str]]:
     """
-    Generate candidate work patterns.
+    Generate candidate work patterns (fixed shapes).
+    
+    The optimiser itself uses pattern_enumerator.enumerate_patterns, which
+    covers every off-day placement; this returns only the single-block,
+    two-block and two-shift-split shapes.
     
     Args:
         shift_types: Available shift types (e.g., ['D', 'N'])
@@ -83,6 +119,33 @@ def generate_pattern_candidates(
     return unique_patterns
 
 
+def candidate_offset_counts(employee_count: int, cycle_length: int) -> np.ndarray:
+    """
+    Offset-count vectors evaluated for each pattern, shape (V, cycle_length).
+
+    Row 0 is generate_staggered_offsets (i % L); row 1 spreads the employees
+    evenly over the cycle (i * L // n), which differs when n is not a multiple
+    of L. Duplicate rows are dropped.
+    """
+    staggered = generate_staggered_offsets(employee_count, cycle_length)
+    spread = [i * cycle_length // employee_count for i in range(employee_count)] if employee_count else []
+    rows = [offset_counts(staggered, cycle_length)]
+    spread_counts = offset_counts(spread, cycle_length)
+    if not np.array_equal(spread_counts, rows[0]):
+        rows.append(spread_counts)
+    return np.stack(rows)
+
+
+def offsets_from_counts(counts: np.ndarray) -> List[int]:
+    """Expand an offset-count vector back to one offset per employee (sorted)."""
+    return [int(offset) for offset in np.repeat(np.arange(len(counts)), counts)]
+
+
+def _cycle_lengths(requirement: Dict, constraints: Dict) -> List[int]:
+    lengths = requirement.get('cycleLengths') or constraints.get('cycleLengths') or [DEFAULT_CYCLE_LENGTH]
+    return sorted({int(length) for length in lengths})
+
+
 def optimize_requirement_config(
     requirement: Dict,
     constraints: Dict,
@@ -92,6 +155,10 @@ def optimize_requirement_config(
     """
     Find optimal configuration for a single requirement.
     
+    Candidates are generated for every cycle length in requirement or
+    constraints 'cycleLengths' (default [6]); all patterns x offset vectors
+    of one cycle length are scored in a single vectorised evaluation.
+    
     Args:
         requirement: Requirement specification
         constraints: Constraint parameters
@@ -104,91 +171,327 @@ def optimize_requirement_config(
     shift_types = requirement['shiftTypes']
     headcount = requirement['headcountPerDay']
     
-    # Generate candidate patterns
-    candidates = generate_pattern_candidates(
-        shift_types=shift_types,
-        cycle_length=6,  # Standard 6-day cycle
-        min_work_days=3,
-        max_work_days=5
-    )
-    
-    print(f"  Generated {len(candidates)} candidate patterns for {requirement['id']}")
-    
-    # Evaluate each candidate
-    best_config = None
-    best_score = float('inf')
-    
     shift_normal_hours = 11.0  # 12 gross - 1 lunch
     max_weekly_hours = constraints.get('maxWeeklyNormalHours', 44)
     
-    for pattern in candidates:
-        # Check feasibility
-        is_feasible, issues = verify_pattern_feasibility(pattern, constraints)
-        if not is_feasible:
+    best_config = None
+    best_score = float('inf')
+    total_candidates = 0
+    
+    for cycle_length in _cycle_lengths(requirement, constraints):
+        # Feasible patterns, half the cycle to cycle - 1 work days (3-5 for 6 days)
+        patterns = enumerate_patterns(shift_types, [cycle_length], constraints,
+                                      shift_normal_hours=shift_normal_hours)
+        total_candidates += len(patterns)
+        if not patterns:
             continue
         
-        # Calculate minimum employees needed
-        min_employees = calculate_min_employees(
-            pattern,
-            headcount,
-            days_in_horizon,
-            max_weekly_hours,
-            shift_normal_hours
-        )
+        # Minimum employees per pattern, and the offset vectors to try for each
+        employee_counts = [
+            calculate_min_employees(p, headcount, days_in_horizon, max_weekly_hours, shift_normal_hours)
+            for p in patterns
+        ]
+        offset_sets = [candidate_offset_counts(n, cycle_length) for n in employee_counts]
+        width = max(len(rows) for rows in offset_sets)
+        counts = np.stack([np.concatenate([rows, np.repeat(rows[-1:], width - len(rows), axis=0)])
+                           for rows in offset_sets])  # (P, V, L), short rows padded with a duplicate
         
-        # Generate staggered offsets
-        offsets = generate_staggered_offsets(min_employees, len(pattern))
-        
-        # Simulate coverage
-        coverage = simulate_coverage(
-            pattern,
-            min_employees,
-            offsets,
-            headcount,
-            days_in_horizon,
-            anchor_date
-        )
-        
-        # Evaluate quality
-        quality = evaluate_coverage_quality(
-            coverage['coverageMap'],
-            headcount
-        )
+        stats = evaluate_candidates(patterns, counts, headcount, days_in_horizon)
         
         # Score: prioritize fewer employees + high coverage + balance
         # Lower score is better
-        coverage_penalty = (100 - coverage['coverageRate']) * 100  # Heavy penalty for low coverage
-        employee_penalty = min_employees * 10  # Prefer fewer employees
-        balance_penalty = quality['variance']  # Prefer balanced coverage
+        coverage_penalty = (100 - stats['coverageRate']) * 100  # Heavy penalty for low coverage
+        employee_penalty = np.asarray(employee_counts)[:, None] * 10  # Prefer fewer employees
+        balance_penalty = np.round(stats['variance'], 2)  # Prefer balanced coverage
+        scores = coverage_penalty + employee_penalty + balance_penalty
         
-        score = coverage_penalty + employee_penalty + balance_penalty
-        
-        if score < best_score:
-            best_score = score
+        p, v = np.unravel_index(np.argmin(scores), scores.shape)
+        if scores[p, v] < best_score:
+            best_score = float(scores[p, v])
+            pattern, min_employees = patterns[p], employee_counts[p]
+            offsets = (generate_staggered_offsets(min_employees, cycle_length) if v == 0
+                       else offsets_from_counts(counts[p, v]))
+            coverage = simulate_coverage(pattern, min_employees, offsets, headcount,
+                                         days_in_horizon, anchor_date)
             best_config = {
                 'pattern': pattern,
                 'employeeCount': min_employees,
                 'offsets': offsets,
                 'coverage': coverage,
-                'quality': quality,
-                'score': round(score, 2)
+                'quality': evaluate_coverage_quality(coverage['coverageMap'], headcount),
+                'score': round(best_score, 2)
             }
     
+    print(f"  Generated {total_candidates} candidate patterns for {requirement['id']}")
+    
     return best_config
 
 
+def exact_pattern_issues(pattern: List[str], constraints: Dict, shift_normal_hours: float) -> List[str]:
+    """
+    Weekly-hour and consecutive-day checks for the exact optimiser.
+
+    Unlike verify_pattern_feasibility these look at the repeating pattern, so a
+    run of work days across the cycle boundary and the busiest 7-day window
+    count.
+    """
+    issues = []
+    max_consecutive = constraints.get('maxConsecutiveWorkDays', 12)
+    consecutive = max_consecutive_work_days(pattern)
+    if consecutive > max_consecutive:
+        issues.append(f"{consecutive} consecutive work days (max: {max_consecutive})")
+    peak_days = peak_weekly_work_days(pattern)
+    min_off = constraints.get('minOffDaysPerWeek', 1)
+    if 7 - peak_days < min_off:
+        issues.append(f"only {7 - peak_days} off days in the busiest week (min: {min_off})")
+    limit = weekly_hour_limit(constraints)
+    if peak_days * shift_normal_hours > limit:
+        issues.append(f"{peak_days * shift_normal_hours:.0f}h in the busiest week (max: {limit:.1f}h)")
+    return issues
+
+
+def _solve_pattern_exact(pattern: List[str], headcount: int, days: int,
+                         max_employees: int = None, time_limit: float = EXACT_TIME_LIMIT_SEC):
+    """
+    Minimum staff (then over-coverage) for one pattern: x[k] employees start on
+    offset k and every day in range(days) has at least headcount on duty.
+
+    Returns (status, solution): the CP-SAT status, and (counts, employees,
+    over_coverage) when it is OPTIMAL or FEASIBLE, else None. INFEASIBLE means
+    no staffing within max_employees exists; UNKNOWN that the time limit ran
+    out before any was found.
+    """
+    cycle_length = len(pattern)
+    model = cp_model.CpModel()
+    x = [model.NewIntVar(0, headcount, f"x_{k}") for k in range(cycle_length)]
+    coverage_terms = []
+    for day in range(days):
+        on_duty = sum(x[k] for k in range(cycle_length) if pattern[(day - k) % cycle_length] != 'O')
+        model.Add(on_duty >= headcount)
+        coverage_terms.append(on_duty)
+    employees = sum(x)
+    if max_employees is not None:
+        model.Add(employees <= max_employees)
+    over_coverage = sum(coverage_terms) - days * headcount
+    model.Minimize(employees * (days * headcount * cycle_length + 1) + over_coverage)
+    
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = 1  # tiny model; keeps results deterministic
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return status, None
+    counts = np.array([solver.Value(var) for var in x])
+    return status, (counts, int(counts.sum()), int(solver.Value(over_coverage)))
+
+
+def optimize_requirement_exact(
+    requirement: Dict,
+    constraints: Dict,
+    days_in_horizon: int,
+    anchor_date: datetime,
+    time_limit: float = EXACT_TIME_LIMIT_SEC
+) -> Dict:
+    """
+    Provably minimal staffing for a single requirement with CP-SAT.
+    
+    For each enumerated feasible pattern (see pattern_enumerator /
+    exact_pattern_issues) a small model counts the employees starting on
+    each offset; every horizon day must have at least headcountPerDay on
+    duty. The objective minimises the employee count, then over-coverage.
+    Patterns are searched best-bound first and pruned once their lower bound
+    exceeds the best staffing found; ties keep the earlier pattern.
+    
+    Args:
+        requirement: Requirement specification
+        constraints: Constraint parameters
+        days_in_horizon: Planning horizon length
+        anchor_date: Coverage anchor date
+        time_limit: CP-SAT time budget in seconds for all patterns
+    
+    Returns:
+        Configuration in the same shape as optimize_requirement_config, plus
+        'mode' and 'status' (OPTIMAL, or FEASIBLE if the budget ran out);
+        None if nothing is feasible
+    """
+    headcount = requirement['headcountPerDay']
+    shift_normal_hours = 11.0  # 12 gross - 1 lunch
+    
+    # The enumerator applies the exact_pattern_issues rules while it searches
+    patterns = enumerate_patterns(requirement['shiftTypes'], _cycle_lengths(requirement, constraints),
+                                  constraints, shift_normal_hours=shift_normal_hours)
+    print(f"  {len(patterns)} feasible candidate patterns for {requirement['id']} (exact)")
+    if not patterns or headcount <= 0:
+        return None
+    
+    # Branch and bound over patterns: n * work_days >= headcount * L bounds the
+    # staff of each pattern from below, so patterns are solved in bound order
+    # and the search stops once the bound exceeds the best count found.
+    # Every employee works at least min_work days of the horizon whatever the
+    # offset, which bounds over-coverage from below the same way.
+    days = max(days_in_horizon, max(len(p) for p in patterns))
+    bounds, over_bounds = [], []
+    for p in patterns:
+        work = horizon_coverage(work_matrix([pattern_bitmask(p)], len(p))[0], days + len(p))
+        min_work = min(int(work[k:k + days].sum()) for k in range(len(p)))
+        bounds.append(-(-headcount * len(p) // int(work[:len(p)].sum())))
+        over_bounds.append(max(0, bounds[-1] * min_work - days * headcount))
+    order = sorted(range(len(patterns)), key=lambda i: (bounds[i], over_bounds[i]))
+    deadline = time.perf_counter() + time_limit
+    best = None  # (employees, over_coverage, pattern index, counts)
+    proven = True
+    for i in order:
+        if best is not None and (bounds[i], over_bounds[i]) >= best[:2]:
+            break  # order is sorted by this bound: nothing later can do better
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            proven = False
+            break
+        status, result = _solve_pattern_exact(patterns[i], headcount, days,
+                                              best[0] if best else None, remaining)
+        # Only INFEASIBLE prunes a pattern; any other status leaves it unproven
+        proven = proven and status in (cp_model.OPTIMAL, cp_model.INFEASIBLE)
+        if result is None:
+            continue
+        counts, employees, over_coverage = result
+        if best is None or (employees, over_coverage) < best[:2]:
+            best = (employees, over_coverage, i, counts)
+    if best is None:
+        return None
+    
+    pattern = patterns[best[2]]
+    offsets = offsets_from_counts(best[3])
+    coverage = simulate_coverage(pattern, len(offsets), offsets, headcount, days_in_horizon, anchor_date)
+    quality = evaluate_coverage_quality(coverage['coverageMap'], headcount)
+    score = (100 - coverage['coverageRate']) * 100 + len(offsets) * 10 + quality['variance']
+    return {
+        'pattern': pattern,
+        'employeeCount': len(offsets),
+        'offsets': offsets,
+        'coverage': coverage,
+        'quality': quality,
+        'score': round(score, 2),
+        'mode': 'exact',
+        'status': 'OPTIMAL' if proven else 'FEASIBLE'
+    }
+
+
+def _optimize_task(task: Tuple) -> Tuple[Dict, str]:
+    """
+    Optimise one (possibly pooled) requirement; process-pool entry point.
+
+    The per-requirement trace is captured and returned so the parent can print
+    it in input order whatever order the workers finish in.
+    """
+    requirement, constraints, days_in_horizon, anchor_date, mode = task
+    optimize = optimize_requirement_exact if mode == 'exact' else optimize_requirement_config
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        config = optimize(requirement, constraints, days_in_horizon, anchor_date)
+    return config, log.getvalue()
+
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()  # /configure and /pipeline call in from threadpool threads
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    """Shared process pool per worker count (spawned: safe under a threaded server)."""
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executors[workers]
+
+
+def shutdown_executors() -> None:
+    """Shut down the shared process pools (registered with atexit)."""
+    with _executors_lock:
+        pools = list(_executors.values())
+        _executors.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
+
+
+def run_optimize_tasks(tasks: List[Tuple], workers: int = 1) -> List[Tuple[Dict, str]]:
+    """Run _optimize_task over tasks, in a process pool when workers > 1; results keep task order."""
+    if workers <= 1 or len(tasks) <= 1:
+        return [_optimize_task(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    pool = _executor(workers)
+    try:
+        return list(pool.map(_optimize_task, tasks, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A dead pool is not reused by the next call (unless another thread already replaced it)
+        with _executors_lock:
+            if _executors.get(workers) is pool:
+                del _executors[workers]
+        raise
+
+
+def pool_key(requirement: Dict) -> Tuple:
+    """Requirements with the same key can be staffed from one shared employee pool."""
+    return (
+        requirement.get('productType', ''),
+        requirement.get('rank', ''),
+        requirement.get('scheme', ''),
+        tuple(requirement['shiftTypes']),
+    )
+
+
+def pooled_id(requirement_ids: List[str]) -> str:
+    """Identifier of a shared pool in the summary and recommendations."""
+    return 'POOL:' + '+'.join(requirement_ids)
+
+
+def _pooled_requirement(members: List[Dict]) -> Dict:
+    """One requirement covering the summed headcount of a shared pool."""
+    pooled = dict(members[0])
+    pooled['id'] = '+'.join(req['id'] for req in members)
+    pooled['headcountPerDay'] = sum(req['headcountPerDay'] for req in members)
+    lengths = sorted({length for req in members for length in req.get('cycleLengths', [])})
+    if lengths:
+        pooled['cycleLengths'] = lengths
+    return pooled
+
+
+def _default_workers() -> int:
+    return int(os.getenv('CONFIG_WORKERS', '1'))
+
+
 def optimize_all_requirements(
     requirements: List[Dict],
     constraints: Dict,
-    planning_horizon: Dict
+    planning_horizon: Dict,
+    mode: str = 'heuristic',
+    workers: int = None,
+    joint: bool = False
 ) -> Dict:
     """
     Optimize configuration for all requirements.
     
+    Requirements are independent, so they fan out to a process pool when
+    workers > 1; results are merged in input order, so the output does not
+    depend on the worker count.
+    
+    In joint mode, requirements sharing a pool_key (product, rank, scheme,
+    shift types) are also optimised as one pooled requirement with the summed
+    headcount. When the pool needs fewer employees than the requirements
+    staffed separately, the first requirement of the pool carries the pooled
+    configuration and the others point to it ('sharedPool').
+    
     Args:
         requirements: List of requirement specifications
         constraints: Constraint parameters
         planning_horizon: Planning horizon with start/end dates
+        mode: 'heuristic' (closed-form count + staggered offsets) or
+            'exact' (CP-SAT, provably minimal staffing)
+        workers: Worker processes (default: CONFIG_WORKERS env, 1 = in-process)
+        joint: Share employees between requirements of the same pool
     
     Returns:
         Optimal configuration for all requirements
@@ -196,29 +499,35 @@ def optimize_all_requirements(
     start_date = datetime.fromisoformat(planning_horizon['startDate'])
     end_date = datetime.fromisoformat(planning_horizon['endDate'])
     days_in_horizon = (end_date - start_date).days + 1
+    if mode not in CONFIG_MODES:
+        raise ValueError(f"Unknown optimization mode: {mode!r} (expected one of {CONFIG_MODES})")
+    workers = _default_workers() if workers is None else workers
     
     print(f"\n{'='*80}")
     print(f"OPTIMIZING CONFIGURATION FOR {len(requirements)} REQUIREMENTS")
     print(f"{'='*80}\n")
-    print(f"Planning horizon: {start_date.date()} to {end_date.date()} ({days_in_horizon} days)\n")
+    print(f"Planning horizon: {start_date.date()} to {end_date.date()} ({days_in_horizon} days), "
+          f"mode: {mode}, workers: {workers}{', joint pools' if joint else ''}\n")
     
-    optimized_configs = {}
-    total_employees = 0
+    pools = {}
+    if joint:
+        for req in requirements:
+            pools.setdefault(pool_key(req), []).append(req)
+        pools = {key: members for key, members in pools.items() if len(members) > 1}
+    
+    tasks = [(req, constraints, days_in_horizon, start_date, mode) for req in requirements]
+    tasks += [(_pooled_requirement(members), constraints, days_in_horizon, start_date, mode)
+              for members in pools.values()]
+    results = run_optimize_tasks(tasks, workers)
     
-    for req in requirements:
+    optimized_configs = {}
+    for req, (config, log) in zip(requirements, results):
         print(f"Optimizing: {req['id']} ({req['name']})")
         print(f"  Shift types: {req['shiftTypes']}, Headcount: {req['headcountPerDay']}")
-        
-        config = optimize_requirement_config(
-            req,
-            constraints,
-            days_in_horizon,
-            start_date
-        )
+        print(log, end='')
         
         if config:
             optimized_configs[req['id']] = config
-            total_employees += config['employeeCount']
             
             print(f"  ✓ Optimal pattern: {config['pattern']}")
             print(f"  ✓ Employees needed: {config['employeeCount']}")
@@ -229,6 +538,26 @@ def optimize_all_requirements(
             print(f"  ✗ No feasible configuration found!")
             print()
     
+    shared_pools = []
+    for members, (pooled, _) in zip(pools.values(), results[len(requirements):]):
+        ids = [req['id'] for req in members]
+        separate = [optimized_configs.get(req_id) for req_id in ids]
+        separate_total = sum(c['employeeCount'] for c in separate) if all(separate) else None
+        if pooled is None or (separate_total is not None and pooled['employeeCount'] >= separate_total):
+            continue
+        print(f"Shared pool {' + '.join(ids)}: {pooled['employeeCount']} employees "
+              f"(separately: {separate_total if separate_total is not None else 'infeasible'})")
+        pool_info = {'poolId': pooled_id(ids), 'requirementIds': ids, 'lead': ids[0],
+                     'employeeCount': pooled['employeeCount'], 'separateEmployeeCount': separate_total}
+        shared_pools.append(pool_info)
+        optimized_configs[ids[0]] = dict(pooled, sharedPool=pool_info)
+        for req_id in ids[1:]:
+            optimized_configs[req_id] = dict(pooled, employeeCount=0, offsets=[], sharedPool=pool_info)
+    if shared_pools:
+        print()
+    
+    total_employees = sum(config['employeeCount'] for config in optimized_configs.values())
+    
     print(f"{'='*80}")
     print(f"OPTIMIZATION COMPLETE")
     print(f"{'='*80}")
@@ -236,17 +565,21 @@ def optimize_all_requirements(
     print(f"Total employees needed: {total_employees}")
     print(f"{'='*80}\n")
     
+    summary = {
+        'totalRequirements': len(requirements),
+        'totalEmployees': total_employees,
+        'mode': mode,
+        'planningHorizon': {
+            'startDate': start_date.isoformat(),
+            'endDate': end_date.isoformat(),
+            'days': days_in_horizon
+        }
+    }
+    if joint:
+        summary['sharedPools'] = shared_pools
     return {
         'requirements': optimized_configs,
-        'summary': {
-            'totalRequirements': len(requirements),
-            'totalEmployees': total_employees,
-            'planningHorizon': {
-                'startDate': start_date.isoformat(),
-                'endDate': end_date.isoformat(),
-                'days': days_in_horizon
-            }
-        }
+        'summary': summary
     }
 
 
@@ -284,7 +617,8 @@ def format_output_config(optimized_result: Dict, requirements: List[Dict]) -> Di
                 'workPattern': config['pattern'],
                 'employeesRequired': config['employeeCount'],
                 'rotationOffsets': config['offsets'],
-                'cycleLength': len(config['pattern'])
+                'cycleLength': len(config['pattern']),
+                'mode': config.get('mode', 'heuristic')
             },
             'coverage': {
                 'expectedCoverageRate': round(config['coverage']['coverageRate'], 2),
@@ -300,6 +634,8 @@ def format_output_config(optimized_result: Dict, requirements: List[Dict]) -> Di
             },
             'notes': _generate_notes(config, req)
         }
+        if 'sharedPool' in config:
+            recommendation['configuration']['sharedPool'] = config['sharedPool']
         
         formatted['recommendations'].append(recommendation)
     
@@ -329,7 +665,16 @@ def _generate_notes(config: Dict, requirement: Dict) -> List[str]:
         notes.append("Good workload balance")
     
     offsets = config['offsets']
-    if len(set(offsets)) == len(offsets):
+    if offsets and len(set(offsets)) == len(offsets):
         notes.append("✓ All employees have unique rotation offsets for maximum diversity")
     
+    pool = config.get('sharedPool')
+    if pool:
+        others = [req_id for req_id in pool['requirementIds'] if req_id != requirement.get('id')]
+        if pool['lead'] == requirement.get('id'):
+            notes.append(f"Shared pool with {', '.join(others)}: {pool['employeeCount']} employees "
+                         f"cover all (separately {pool['separateEmployeeCount']})")
+        else:
+            notes.append(f"Staffed from the shared pool listed under {pool['lead']}")
+    
     return notes
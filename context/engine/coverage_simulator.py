@@ -3,12 +3,128 @@
 
 This module provides functions to simulate whether a given configuration
 (pattern, employee count, offsets) will achieve desired coverage.
+
+Coverage is computed with NumPy: a pattern is a work bitmask, the employees'
+offsets collapse to a count per offset, and the coverage of one cycle is the
+circulant product of the two. evaluate_candidates() scores many patterns x
+offset vectors in a single array operation.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Tuple
 from math import ceil
 
+import numpy as np
+
+
+def pattern_bitmask(pattern: List[str]) -> int:
+    """
+    Encode a work pattern as a bitmask: bit d is set when cycle day d is a work day.
+
+    Example: ["D","D","O","D","D","O"] -> 0b011011 (27)
+    """
+    mask = 0
+    for day, shift in enumerate(pattern):
+        if shift != 'O':
+            mask |= 1 << day
+    return mask
+
+
+def work_matrix(bitmasks, cycle_length: int) -> np.ndarray:
+    """
+    Expand work bitmasks into a 0/1 matrix of shape (len(bitmasks), cycle_length).
+    """
+    masks = np.asarray(bitmasks, dtype=np.int64).reshape(-1, 1)
+    return ((masks >> np.arange(cycle_length, dtype=np.int64)) & 1).astype(np.int32)
+
+
+def offset_counts(offsets: List[int], cycle_length: int, employee_count: int = None) -> np.ndarray:
+    """
+    Number of employees starting the cycle on each offset (length cycle_length).
+
+    Employees beyond len(offsets) get the default offset emp_idx % cycle_length,
+    as in simulate_coverage. Coverage only depends on this multiset, not on
+    which employee holds which offset.
+    """
+    if employee_count is None:
+        employee_count = len(offsets)
+    resolved = np.arange(employee_count) % cycle_length
+    given = min(len(offsets), employee_count)
+    if given:
+        resolved[:given] = np.asarray(offsets[:given]) % cycle_length
+    return np.bincount(resolved, minlength=cycle_length)
+
+
+def circulant_coverage(work: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Employees on duty per cycle day: coverage[d] = sum_k counts[k] * work[(d - k) % L].
+
+    work has shape (..., L) and counts (..., V, L); leading axes broadcast, so
+    P patterns (P, L) against offset vectors (V, L) or (P, V, L) are evaluated
+    as one array. Returns shape (..., V, L).
+    """
+    cycle_length = work.shape[-1]
+    day = np.arange(cycle_length)
+    circulant = work[..., (day[:, None] - day[None, :]) % cycle_length]  # (..., L, L)
+    return np.einsum('...dk,...vk->...vd', circulant, np.asarray(counts))
+
+
+def horizon_coverage(cycle_coverage: np.ndarray, days_in_horizon: int) -> np.ndarray:
+    """Unroll cycle coverage (..., L) over the planning horizon (..., days_in_horizon)."""
+    cycle_length = cycle_coverage.shape[-1]
+    return cycle_coverage[..., np.arange(days_in_horizon) % cycle_length]
+
+
+def coverage_statistics(coverage: np.ndarray, headcount_per_day: int) -> Dict[str, np.ndarray]:
+    """
+    Coverage and quality figures over the last (day) axis of a coverage array.
+
+    Same definitions as simulate_coverage + evaluate_coverage_quality, as arrays
+    (coverageRate in percent, population variance, unrounded).
+    """
+    total_days = coverage.shape[-1]
+    fully = (coverage >= headcount_per_day).sum(axis=-1)
+    if total_days == 0:
+        zeros = np.zeros(coverage.shape[:-1])
+        return {'daysFullyCovered': fully, 'daysUndercovered': fully, 'daysOvercovered': fully,
+                'coverageRate': zeros, 'mean': zeros, 'variance': zeros,
+                'exactMatchDays': fully, 'totalExcessCoverage': fully}
+    return {
+        'daysFullyCovered': fully,
+        'daysUndercovered': total_days - fully,
+        'daysOvercovered': (coverage > headcount_per_day).sum(axis=-1),
+        'coverageRate': fully / total_days * 100,
+        'mean': coverage.mean(axis=-1),
+        'variance': coverage.var(axis=-1),
+        'exactMatchDays': (coverage == headcount_per_day).sum(axis=-1),
+        'totalExcessCoverage': np.maximum(coverage - headcount_per_day, 0).sum(axis=-1),
+    }
+
+
+def evaluate_candidates(
+    patterns: List[List[str]],
+    counts: np.ndarray,
+    headcount_per_day: int,
+    days_in_horizon: int
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorised coverage statistics for candidate patterns x offset vectors.
+
+    Args:
+        patterns: P work patterns, all with the same cycle length L
+        counts: Offset-count vectors, shape (P, V, L) or (V, L) shared by all
+            patterns (see offset_counts)
+        headcount_per_day: Required headcount per day
+        days_in_horizon: Planning horizon length
+
+    Returns:
+        coverage_statistics() arrays of shape (P, V)
+    """
+    cycle_length = len(patterns[0])
+    work = work_matrix([pattern_bitmask(p) for p in patterns], cycle_length)
+    cycle = circulant_coverage(work, counts)
+    return coverage_statistics(horizon_coverage(cycle, days_in_horizon), headcount_per_day)
+
 
 def simulate_coverage(
     pattern: List[str],
@@ -33,46 +149,20 @@ def simulate_coverage(
         Dict with coverage statistics
     """
     cycle_length = len(pattern)
-    coverage_map = {}  # date -> available employees
-    
-    # Simulate each day
-    for day_offset in range(days_in_horizon):
-        current_date = anchor_date + timedelta(days=day_offset)
-        available_employees = []
-        
-        # Check each employee
-        for emp_idx in range(employee_count):
-            if emp_idx < len(offsets):
-                rotation_offset = offsets[emp_idx]
-            else:
-                rotation_offset = emp_idx % cycle_length
-            
-            # Calculate cycle day for this employee
-            emp_cycle_day = (day_offset - rotation_offset) % cycle_length
-            expected_shift = pattern[emp_cycle_day]
-            
-            # If not 'O' (off), employee is available
-            if expected_shift != 'O':
-                available_employees.append(emp_idx)
-        
-        coverage_map[day_offset] = len(available_employees)
-    
-    # Calculate statistics
-    total_days = len(coverage_map)
-    days_fully_covered = sum(1 for count in coverage_map.values() if count >= headcount_per_day)
-    days_undercovered = sum(1 for count in coverage_map.values() if count < headcount_per_day)
-    days_overcovered = sum(1 for count in coverage_map.values() if count > headcount_per_day)
-    
-    avg_coverage = sum(coverage_map.values()) / total_days if total_days > 0 else 0
+    work = work_matrix([pattern_bitmask(pattern)], cycle_length)[0]
+    counts = offset_counts(offsets, cycle_length, employee_count)
+    coverage = horizon_coverage(circulant_coverage(work, counts[None])[0], days_in_horizon)
+    coverage_map = dict(enumerate(coverage.tolist()))  # day offset -> available employees
+    stats = coverage_statistics(coverage, headcount_per_day)
     
     return {
-        'totalDays': total_days,
+        'totalDays': days_in_horizon,
         'requiredPerDay': headcount_per_day,
-        'daysFullyCovered': days_fully_covered,
-        'daysUndercovered': days_undercovered,
-        'daysOvercovered': days_overcovered,
-        'coverageRate': (days_fully_covered / total_days * 100) if total_days > 0 else 0,
-        'averageAvailable': round(avg_coverage, 2),
+        'daysFullyCovered': int(stats['daysFullyCovered']),
+        'daysUndercovered': int(stats['daysUndercovered']),
+        'daysOvercovered': int(stats['daysOvercovered']),
+        'coverageRate': float(stats['coverageRate']),
+        'averageAvailable': round(float(stats['mean']), 2),
         'coverageMap': coverage_map
     }
 
@@ -0,0 +1,257 @@
+"""In-process solver metrics with Prometheus text exposition.
+
+No external service or client library: counters, gauges and histograms live
+in a module-level registry and are rendered by `render()` for the API's
+/metrics endpoint. solve() records per-phase timings, model size, CP-SAT
+status and objective gap; the API records queue depth and in-flight solves.
+
+Usage:
+    from context.engine import metrics
+    with metrics.timed("cpsat_solve"):
+        status = solver.Solve(model)
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+GAP_BUCKETS = (0, 0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+def _label_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"expected labels {labelnames}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (last observation, in-flight counts)."""
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with _sum and _count, as Prometheus expects."""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=SECONDS_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        state = self._values.get(_label_key(self.labelnames, labels))
+        return state[2] if state else 0
+
+    def _samples(self):
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.register(Histogram(
+    "ngrs_solve_phase_seconds",
+    "Wall time of each solve() phase (slot_build, variables, base_model, constraints, "
+    "cpsat_solve, extract, score, output_build).",
+    ["phase"],
+))
+CONSTRAINT_MODULE_SECONDS = REGISTRY.register(Histogram(
+    "ngrs_constraint_module_seconds",
+    "Wall time of each constraint module's add_constraints().",
+    ["module"],
+))
+SOLVE_SECONDS = REGISTRY.register(Histogram(
+    "ngrs_solve_seconds", "Total wall time of solve()."
+))
+SOLVES_TOTAL = REGISTRY.register(Counter(
+    "ngrs_solves_total", "Completed solves by final solver status.", ["status"]
+))
+CPSAT_STATUS_TOTAL = REGISTRY.register(Counter(
+    "ngrs_cpsat_status_total", "Raw CP-SAT status of completed solves.", ["status"]
+))
+MODEL_VARIABLES = REGISTRY.register(Histogram(
+    "ngrs_model_variables", "CP-SAT model variable count per solve.", buckets=SIZE_BUCKETS
+))
+MODEL_CONSTRAINTS = REGISTRY.register(Histogram(
+    "ngrs_model_constraints", "CP-SAT model constraint count per solve.", buckets=SIZE_BUCKETS
+))
+OBJECTIVE_GAP = REGISTRY.register(Histogram(
+    "ngrs_objective_gap", "Relative gap |objective - bound| / max(1, |objective|) per solve.",
+    buckets=GAP_BUCKETS,
+))
+LAST_OBJECTIVE_GAP = REGISTRY.register(Gauge(
+    "ngrs_last_objective_gap", "Relative objective gap of the most recent solve."
+))
+SOLVE_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "ngrs_solve_queue_depth", "Solve requests waiting for a solver slot."
+))
+SOLVES_IN_FLIGHT = REGISTRY.register(Gauge(
+    "ngrs_solves_in_flight", "Solves currently running."
+))
+SOLVE_QUEUE_DEPTH.set(0)
+SOLVES_IN_FLIGHT.set(0)
+
+
+def observe_phase(phase, seconds, sink=None):
+    """Record one phase duration; also accumulate into sink[phase] if sink is a dict."""
+    PHASE_SECONDS.observe(seconds, phase=phase)
+    if sink is not None:
+        sink[phase] = sink.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase, sink=None):
+    """Observe the wall time of a block under ngrs_solve_phase_seconds{phase=...}.
+
+    If sink is a dict, the elapsed seconds are also accumulated into sink[phase].
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_phase(phase, time.perf_counter() - start, sink)
+
+
+def objective_gap(solver):
+    """Relative gap between the incumbent objective and the best bound."""
+    objective = solver.ObjectiveValue()
+    bound = solver.BestObjectiveBound()
+    return abs(objective - bound) / max(1.0, abs(objective))
+
+
+def record_model_size(num_vars, num_constraints):
+    MODEL_VARIABLES.observe(num_vars)
+    MODEL_CONSTRAINTS.observe(num_constraints)
+
+
+def render():
+    """Prometheus text exposition (format 0.0.4) of all registered metrics."""
+    return REGISTRY.render()
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Offset Search - rotation offsets ranked by a coverage surrogate.
+
+Replaces the brute force in optimize_offsets.py, which deep-copied the context
+and ran a full solve() for every offset combination. Here the slot table and
+employee eligibility are built once:
+
+- Employees with identical eligibility (requirement x day) form a class. Its
+  members are interchangeable, so a candidate is just the number of members
+  on each offset of the rotation cycle.
+- A candidate is scored by the slots that can be filled day by day: a max
+  flow from (class, offset) groups, limited to the rotation's work days, to
+  the day's requirements. Other hard rules (hours, rest) are ignored, so the
+  score is an upper bound on coverage.
+- Hill climbing (move one member to another offset) from the input offsets
+  and from a staggered start produces the candidates; only the top few are
+  verified with CP-SAT, re-solving one CompiledModel under different bounds.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .capacity_analysis import employee_day_mask, max_flow
+from .compiled_model import CompiledModel
+from .slot_builder import build_slot_table
+
+DEFAULT_VERIFY_TOP = 2
+DEFAULT_MAX_MOVES = 200
+
+
+class OffsetProblem:
+    """Slot demand, rotation calendars and eligibility classes of one input.
+
+    Attributes:
+        days: Ordinal dates that have slots, ascending (D)
+        demand: Slot count per requirement and day, shape (R, D)
+        work: Rotation work day per requirement, day and offset, shape (R, D, L)
+        classes: Employee IDs per eligibility class (C lists)
+        eligible: Eligibility per class, requirement and day, shape (C, R, D)
+        cycles: Offset range per class (1 when no eligible requirement rotates)
+        current: Input offsets per employee ID
+    """
+
+    def __init__(self, ctx: Dict):
+        table = build_slot_table(ctx)
+        employees = ctx.get('employees', [])
+        self.specs = table.specs
+        self.days = np.unique(table.day)
+        day_pos = np.searchsorted(self.days, table.day)
+        self.demand = np.zeros((len(self.specs), len(self.days)), dtype=np.int64)
+        np.add.at(self.demand, (table.requirement_idx, day_pos), 1)
+
+        lengths = [len(spec.rotationSequence) if spec.rotationSequence and spec.coverageAnchor else 0
+                   for spec in self.specs]
+        max_length = max(lengths + [1])
+        offsets = np.arange(max_length)
+        self.work = np.ones((len(self.specs), len(self.days), max_length), dtype=bool)
+        for r, spec in enumerate(self.specs):
+            if not lengths[r]:
+                continue
+            off_days = np.array([shift == 'O' for shift in spec.rotationSequence])
+            since_anchor = self.days - spec.coverageAnchor.toordinal()
+            # Same cycle-day arithmetic as the fixed-offset rule in build_model
+            self.work[r] = ~off_days[(since_anchor[:, None] - offsets[None, :]) % lengths[r]]
+
+        by_signature = {}
+        masks = []
+        self.classes: List[List[str]] = []
+        for emp in employees:
+            mask = np.stack([employee_day_mask(emp, spec, self.days) for spec in self.specs]) \
+                if self.specs else np.zeros((0, len(self.days)), dtype=bool)
+            key = mask.tobytes()
+            if key not in by_signature:
+                by_signature[key] = len(self.classes)
+                self.classes.append([])
+                masks.append(mask)
+            self.classes[by_signature[key]].append(emp.get('employeeId'))
+        self.eligible = np.array(masks, dtype=bool).reshape(len(masks), len(self.specs), len(self.days))
+        self.cycles = [
+            max([lengths[r] for r in range(len(self.specs)) if self.eligible[c, r].any()] + [1])
+            for c in range(len(self.classes))
+        ]
+        self.current = {emp.get('employeeId'): emp.get('rotationOffset', 0) for emp in employees}
+        self._day_cache: Dict[tuple, int] = {}
+        # Per class, day and offset: positions (among the day's requirements)
+        # a member can take, or None
+        self._day_demand = []
+        self._reach = [[] for _ in self.classes]
+        for d in range(len(self.days)):
+            requirements = np.flatnonzero(self.demand[:, d])
+            self._day_demand.append(self.demand[requirements, d].tolist())
+            for c, cycle in enumerate(self.cycles):
+                reach = self.eligible[c, requirements, d][None, :] & self.work[requirements, d, :cycle].T
+                self._reach[c].append([tuple(np.flatnonzero(row).tolist()) or None for row in reach])
+
+    @property
+    def total_slots(self) -> int:
+        return int(self.demand.sum())
+
+    # ---------- candidates ----------
+
+    def counts_from_offsets(self, offsets: Dict[str, int]) -> Tuple[Tuple[int, ...], ...]:
+        """Candidate (members per offset, per class) of an employee -> offset map."""
+        state = []
+        for members, cycle in zip(self.classes, self.cycles):
+            counts = [0] * cycle
+            for emp_id in members:
+                counts[offsets.get(emp_id, 0) % cycle] += 1
+            state.append(tuple(counts))
+        return tuple(state)
+
+    def staggered(self) -> Tuple[Tuple[int, ...], ...]:
+        """Members spread round-robin over the cycle (the old greedy start)."""
+        return self.counts_from_offsets({
+            emp_id: i % cycle
+            for members, cycle in zip(self.classes, self.cycles)
+            for i, emp_id in enumerate(members)
+        })
+
+    def offsets_from_counts(self, state) -> Dict[str, int]:
+        """Employee offsets realising a candidate, keeping input offsets where possible."""
+        offsets = {}
+        for members, counts in zip(self.classes, state):
+            cycle = len(counts)
+            left = list(counts)
+            movers = []
+            for emp_id in members:
+                current = self.current.get(emp_id, 0)
+                if cycle > 1 and current < cycle and left[current] > 0:
+                    offsets[emp_id] = current
+                    left[current] -= 1
+                else:
+                    movers.append(emp_id)
+            slots = [o for o in range(cycle) for _ in range(left[o])]
+            for emp_id, offset in zip(movers, slots):
+                offsets[emp_id] = offset if cycle > 1 else self.current.get(emp_id, 0)
+        return offsets
+
+    def churn(self, state) -> int:
+        """Employees whose offset differs from the input."""
+        offsets = self.offsets_from_counts(state)
+        return sum(1 for emp_id, offset in offsets.items() if offset != self.current.get(emp_id, 0))
+
+    # ---------- surrogate ----------
+
+    def coverage(self, state) -> int:
+        """Slots fillable under the candidate, summed over days (upper bound)."""
+        return sum(self._flow(d, self._day_supply(d, state)) for d in range(len(self.days)))
+
+    def _day_supply(self, d: int, state) -> Dict[tuple, int]:
+        # Merge (class, offset) groups that reach the same requirements today
+        supply = defaultdict(int)
+        for c, counts in enumerate(state):
+            reach = self._reach[c][d]
+            for offset, count in enumerate(counts):
+                if count and reach[offset] is not None:
+                    supply[reach[offset]] += count
+        return supply
+
+    def _flow(self, d: int, supply: Dict[tuple, int]) -> int:
+        key = (d, tuple(sorted((reach, count) for reach, count in supply.items() if count)))
+        if key not in self._day_cache:
+            self._day_cache[key] = max_flow(
+                [count for _, count in key[1]],
+                self._day_demand[d],
+                [list(reach) for reach, _ in key[1]],
+            )
+        return self._day_cache[key]
+
+    # ---------- search ----------
+
+    def climb(self, state, max_moves: int = DEFAULT_MAX_MOVES, seen: Optional[Dict] = None):
+        """First-improvement hill climbing over single-member offset moves.
+
+        A move only re-scores the days on which the two offsets differ,
+        under-covered days first (only they can gain). Every fully scored
+        candidate is recorded in ``seen`` (state -> coverage).
+        Returns the local optimum and its coverage.
+        """
+        seen = {} if seen is None else seen
+        supplies = [self._day_supply(d, state) for d in range(len(self.days))]
+        day_values = [self._flow(d, supply) for d, supply in enumerate(supplies)]
+        day_totals = [sum(demand) for demand in self._day_demand]
+        best = seen[state] = sum(day_values)
+
+        def rescore(days, c, source, target):
+            values = {}
+            for d in days:
+                supply = dict(supplies[d])
+                reach = self._reach[c][d]
+                if reach[source] is not None:
+                    supply[reach[source]] -= 1
+                if reach[target] is not None:
+                    supply[reach[target]] = supply.get(reach[target], 0) + 1
+                values[d] = (self._flow(d, supply), supply)
+            return values
+
+        for _ in range(max_moves):
+            if best == self.total_slots:
+                break
+            for candidate, c, source, target, changed in self._moves(state):
+                short = [d for d in changed if day_values[d] < day_totals[d]]
+                rescored = rescore(short, c, source, target)
+                if sum(value - day_values[d] for d, (value, _) in rescored.items()) <= 0:
+                    continue
+                rescored.update(rescore([d for d in changed if d not in rescored], c, source, target))
+                coverage = best + sum(value - day_values[d] for d, (value, _) in rescored.items())
+                seen.setdefault(candidate, coverage)
+                if coverage > best:
+                    state, best = candidate, coverage
+                    for d, (value, supply) in rescored.items():
+                        day_values[d], supplies[d] = value, supply
+                    break
+            else:
+                break
+        return state, best
+
+    def _moves(self, state):
+        """Single-member moves (class, source offset, target offset) with the days they affect."""
+        for c, counts in enumerate(state):
+            reach = self._reach[c]
+            for source in range(len(counts)):
+                if not counts[source]:
+                    continue
+                for target in range(len(counts)):
+                    changed = [d for d, day in enumerate(reach) if day[source] != day[target]]
+                    if target == source or not changed:
+                        continue  # no-op: both offsets reach the same requirements every day
+                    moved = list(counts)
+                    moved[source] -= 1
+                    moved[target] += 1
+                    yield state[:c] + (tuple(moved),) + state[c + 1:], c, source, target, changed
+
+
+def count_unassigned(compiled: CompiledModel, offsets: Dict[str, int], time_limit: Optional[float] = None) -> int:
+    """Unassigned slots of a CP-SAT solve of the compiled model with the given offsets."""
+    _status, _result, assignments, _violations = compiled.solve(offsets=offsets, time_limit=time_limit)
+    if not assignments:
+        return len(compiled.ctx['slots'])
+    return sum(1 for a in assignments if not a.get('employeeId'))
+
+
+def search_offsets(
+    ctx: Dict,
+    verify_top: int = DEFAULT_VERIFY_TOP,
+    time_limit: Optional[float] = None,
+    max_moves: int = DEFAULT_MAX_MOVES,
+) -> Dict:
+    """
+    Find rotation offsets that maximise coverage.
+
+    Args:
+        ctx: Input context (as returned by load_input)
+        verify_top: Best surrogate candidates to verify with CP-SAT (0: surrogate only);
+            the input offsets are verified alongside and kept unless beaten
+        time_limit: CP-SAT time limit per verification (default: ctx timeLimit)
+        max_moves: Hill-climbing moves per start
+
+    Returns:
+        Dict with offsets (employee ID -> offset), changed (IDs whose offset moved),
+        baseline / best surrogate coverage, the ranked candidates and durationSec
+    """
+    start = time.perf_counter()
+    problem = OffsetProblem(ctx)
+    current = problem.counts_from_offsets(problem.current)
+    seen: Dict = {}
+    for seed in (current, problem.staggered()):
+        if problem.climb(seed, max_moves, seen)[1] == problem.total_slots:
+            break  # nothing left to gain from another start
+
+    churn = {state: problem.churn(state) for state in seen}
+    ranked = sorted(seen, key=lambda state: (-seen[state], churn[state]))
+    candidates = [{'state': state, 'coverage': seen[state], 'churn': churn[state]}
+                  for state in ranked[:max(verify_top, 1)]]
+    print(f"[offset_search] {len(problem.classes)} eligibility classes, "
+          f"{len(seen)} candidates scored in {time.perf_counter() - start:.2f}s")
+    print(f"  Surrogate coverage: input {seen[current]}/{problem.total_slots}, "
+          f"best {candidates[0]['coverage']}/{problem.total_slots}")
+
+    best = candidates[0]
+    if verify_top > 0:
+        if all(candidate['state'] != current for candidate in candidates):
+            candidates.append({'state': current, 'coverage': seen[current], 'churn': 0})
+        # One model build; each candidate only changes the off-day bounds
+        compiled = CompiledModel(dict(ctx, fixedRotationOffset=True))
+        for candidate in candidates:
+            candidate['unassigned'] = count_unassigned(
+                compiled, problem.offsets_from_counts(candidate['state']), time_limit)
+            print(f"  Verified candidate (coverage {candidate['coverage']}, churn {candidate['churn']}): "
+                  f"{candidate['unassigned']} unassigned")
+        # Fewest unassigned; ties go to the least churn (the input offsets have none)
+        best = min(candidates, key=lambda candidate: (candidate['unassigned'], candidate['churn']))
+
+    offsets = problem.offsets_from_counts(best['state'])
+    return {
+        'offsets': offsets,
+        'changed': sorted(emp_id for emp_id, offset in offsets.items()
+                          if offset != problem.current.get(emp_id, 0)),
+        'baselineCoverage': seen[current],
+        'coverage': best['coverage'],
+        'totalSlots': problem.total_slots,
+        'unassigned': best.get('unassigned'),
+        'candidates': [{k: v for k, v in candidate.items() if k != 'state'} for candidate in candidates],
+        'durationSec': round(time.perf_counter() - start, 3),
+    }
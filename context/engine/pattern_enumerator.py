@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Pattern Enumerator - all feasible work patterns for the configuration optimizer.
+
+Enumerates repeating work patterns over cycle lengths, shift-type sequences and
+off-day placements by depth-first search, pruning a prefix as soon as it
+breaks a rule:
+
+- a run of work days longer than maxConsecutiveWorkDays
+- fewer than minOffDaysPerWeek off days in a 7-day window
+- more hours in a 7-day window than the weekly limit
+- too many / too few work days for the cycle
+
+Within one block of consecutive work days the shift type is constant (a
+change of shift needs a day off in between), which keeps two-shift searches
+tractable at 14-day cycles.
+
+Rotations of a pattern give identical coverage at a different offset, so only
+the canonical rotation is kept: the lexicographically smallest rotation with
+shift codes in the order given and 'O' last (e.g. DDDDOO, never OODDDD). Results are
+memoised per (shift types, cycle length, limits) key.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SHIFT_NORMAL_HOURS = 11.0  # 12 gross - 1 lunch
+
+
+def max_consecutive_work_days(pattern: List[str]) -> int:
+    """Longest run of work days when the pattern repeats (wraps around the cycle)."""
+    if 'O' not in pattern:
+        return len(pattern) * 2  # works forever; any finite cap rejects it
+    longest = run = 0
+    for shift in list(pattern) + list(pattern):
+        run = run + 1 if shift != 'O' else 0
+        longest = max(longest, run)
+    return min(longest, len(pattern))
+
+
+def peak_weekly_work_days(pattern: List[str]) -> int:
+    """Most work days in any 7-day window of the repeating pattern."""
+    cycle_length = len(pattern)
+    return max(
+        sum(1 for i in range(7) if pattern[(start + i) % cycle_length] != 'O')
+        for start in range(cycle_length)
+    )
+
+
+def weekly_hour_limit(constraints: Dict) -> float:
+    """Weekly hours one employee may work: normal cap plus the monthly OT allowance per week."""
+    normal = constraints.get('maxWeeklyNormalHours', 44)
+    monthly_ot = constraints.get('maxMonthlyOTHours', 72)
+    return normal + monthly_ot * 12 / 52
+
+
+def _sort_key(pattern, order: Tuple[str, ...] = ()) -> tuple:
+    rank = {shift: i for i, shift in enumerate(order)}
+    return tuple((shift == 'O', rank.get(shift, len(rank)), shift) for shift in pattern)
+
+
+def canonical_rotation(pattern: List[str], shift_order: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    """
+    Representative rotation of a pattern: smallest with shift codes ranked by
+    shift_order (then alphabetically) and 'O' last, so work days lead.
+    """
+    pattern = tuple(pattern)
+    rotations = (pattern[i:] + pattern[:i] for i in range(len(pattern)))
+    return min(rotations, key=lambda rotation: _sort_key(rotation, shift_order))
+
+
+@lru_cache(maxsize=256)
+def _enumerate(
+    shift_types: Tuple[str, ...],
+    cycle_length: int,
+    min_work_days: int,
+    max_work_days: int,
+    max_consecutive: int,
+    max_work_per_week: int,
+) -> Tuple[Tuple[str, ...], ...]:
+    # Symbols in canonical order: shift codes first, 'O' last. Prefixes are
+    # grown as pre-necklaces (Fredricksen-Kessler-Maiorana): `period` is the
+    # length of the prefix's longest Lyndon prefix, a symbol smaller than the
+    # one `period` days back can never start the smallest rotation, and a full
+    # cycle is canonical iff period divides the cycle length.
+    symbols = shift_types + ('O',)
+    rank = {shift: i for i, shift in enumerate(symbols)}
+    found = []
+    pattern = []
+
+    def extend(work_days: int, run: int, period: int):
+        day = len(pattern)
+        if work_days + (cycle_length - day) < min_work_days:
+            return
+        if day == cycle_length:
+            wraps_mixed = pattern[-1] != 'O' and pattern[-1] != pattern[0]  # block across the cycle end
+            if (cycle_length % period == 0 and not wraps_mixed
+                    and max_consecutive_work_days(pattern) <= max_consecutive
+                    and peak_weekly_work_days(pattern) <= max_work_per_week):
+                found.append(tuple(pattern))
+            return
+        window_work = sum(1 for shift in pattern[max(0, day - 6):] if shift != 'O')
+        floor = rank[pattern[day - period]] if day else 0
+        for shift in symbols[floor:]:
+            next_period = period if day and rank[shift] == floor else day + 1
+            if shift == 'O':
+                if day == 0:
+                    continue  # the canonical rotation starts with a work day
+                pattern.append(shift)
+                extend(work_days, 0, next_period)
+                pattern.pop()
+                continue
+            # One shift type per work block: only the block's type may follow a work day
+            if run and shift != pattern[-1]:
+                continue
+            if work_days + 1 > max_work_days or run + 1 > max_consecutive:
+                continue
+            if window_work + 1 > max_work_per_week:
+                continue
+            pattern.append(shift)
+            extend(work_days + 1, run + 1, next_period)
+            pattern.pop()
+
+    extend(0, 0, 1)
+    return tuple(found)
+
+
+def enumerate_patterns(
+    shift_types: Iterable[str],
+    cycle_lengths: Iterable[int] = (6,),
+    constraints: Optional[Dict] = None,
+    min_work_days: Optional[int] = None,
+    max_work_days: Optional[int] = None,
+    shift_normal_hours: float = DEFAULT_SHIFT_NORMAL_HOURS,
+) -> List[List[str]]:
+    """
+    Enumerate feasible work patterns in canonical (rotation-free) form.
+
+    Args:
+        shift_types: Shift codes a work day may take (e.g. ['D', 'N'])
+        cycle_lengths: Cycle lengths to enumerate
+        constraints: maxConsecutiveWorkDays, minOffDaysPerWeek,
+            maxWeeklyNormalHours and maxMonthlyOTHours (see weekly_hour_limit)
+        min_work_days: Minimum work days per cycle (default: half the cycle)
+        max_work_days: Maximum work days per cycle (default: cycle - 1)
+        shift_normal_hours: Hours per shift counted against the weekly limit
+
+    Returns:
+        Patterns ordered by cycle length, then canonical order
+    """
+    constraints = constraints or {}
+    shift_types = tuple(dict.fromkeys(shift_types))  # dedupe, keep the caller's preference order
+    max_consecutive = constraints.get('maxConsecutiveWorkDays', 12)
+    max_by_off_days = 7 - constraints.get('minOffDaysPerWeek', 1)
+    max_by_hours = int(weekly_hour_limit(constraints) // shift_normal_hours) if shift_normal_hours > 0 else 7
+    max_work_per_week = min(max_by_off_days, max_by_hours)
+
+    patterns = []
+    for cycle_length in sorted(set(cycle_lengths)):
+        low = max(1, cycle_length // 2) if min_work_days is None else min_work_days
+        high = cycle_length - 1 if max_work_days is None else min(max_work_days, cycle_length)
+        found = _enumerate(shift_types, cycle_length, low, high, max_consecutive, max_work_per_week)
+        patterns.extend(sorted(found, key=lambda p: _sort_key(p, shift_types)))
+    return [list(pattern) for pattern in patterns]
+
+
+def cache_info():
+    """lru_cache statistics of the enumerator (hits, misses, currsize)."""
+    return _enumerate.cache_info()
@@ -0,0 +1,188 @@
+"""Opt-in per-phase profiling for solve() (cProfile + tracemalloc).
+
+Profiling is enabled by putting a PhaseProfiler in ctx['profiler'] (the API
+does this for ?profile=1 or SOLVER_PROFILE=1; the CLI for --profile). When
+ctx has no profiler, solve() uses a shared null context per phase, so the
+disabled path costs one dict lookup.
+
+Each phase (build_model, constraints, cpsat_solve, extract, score,
+output_build) runs under its own cProfile.Profile; phases never nest. The
+report lists wall time, the top-N functions by cumulative time, and the
+tracemalloc peak / net allocation of every phase. Raw stats can also be
+dumped as .pstats files for `python -m pstats` or snakeviz.
+
+tracemalloc is process-wide. Concurrent profiled solves (SOLVE_CONCURRENCY
+> 1) share one trace: the first profiler starts it and the last one to close
+stops it. The peak is only reset when no other traced phase is running.
+Phases that overlapped another solve's phase are flagged memoryShared,
+because their peak and net figures include that solve's allocations.
+
+cProfile allows one active profiler per process (Python 3.12 raises
+ValueError on a second enable()). Phases take it behind _profile_lock; a
+phase that finds it held, or finds another profiling tool active, runs
+without cProfile and is flagged cpuProfileSkipped with no topFunctions.
+"""
+import cProfile
+import io
+import os
+import pathlib
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_TOP_N = int(os.getenv("PROFILE_TOP_N", "15"))
+
+_NO_PROFILE = nullcontext()
+
+# Shared tracemalloc state of all profilers in the process (guarded by _trace_lock)
+_trace_lock = threading.Lock()
+_trace_users = 0  # profilers holding the trace
+_trace_started = False  # True if a profiler (not the host process) started it
+_active_phases = 0  # memory-traced phases running right now
+_phase_starts = 0  # memory-traced phases started so far
+
+# Held by the phase whose cProfile.Profile is enabled
+_profile_lock = threading.Lock()
+
+
+def _acquire_trace():
+    global _trace_users, _trace_started
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace_started = True
+        _trace_users += 1
+
+
+def _release_trace():
+    global _trace_users, _trace_started
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0 and _trace_started:
+            tracemalloc.stop()
+            _trace_started = False
+
+
+def profiling_enabled_by_env() -> bool:
+    return os.getenv("SOLVER_PROFILE", "0").lower() in ("1", "true", "yes")
+
+
+def phase_context(ctx):
+    """Return a `phase(name)` context-manager factory for this solve.
+
+    With no ctx['profiler'] this returns the shared null context, so the
+    disabled path allocates nothing per phase.
+    """
+    profiler = ctx.get('profiler')
+    if profiler is None:
+        return lambda name: _NO_PROFILE
+    return profiler.phase
+
+
+def _function_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in / C function, e.g. "<method 'Solve' ...>"
+    parts = pathlib.PurePath(filename).parts
+    return f"{'/'.join(parts[-2:])}:{line}({name})"
+
+
+class PhaseProfiler:
+    """Collects cProfile stats and tracemalloc peaks per solve phase."""
+
+    def __init__(self, top_n=DEFAULT_TOP_N, dump_dir=None, run_id=None, trace_memory=True):
+        self.top_n = top_n
+        self.dump_dir = pathlib.Path(dump_dir) if dump_dir else None
+        self.run_id = run_id or time.strftime("%Y%m%d_%H%M%S")
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.artifacts = []
+        self._holds_trace = False
+
+    @contextmanager
+    def phase(self, name):
+        global _active_phases, _phase_starts
+        if self.trace_memory:
+            if not self._holds_trace:
+                _acquire_trace()
+                self._holds_trace = True
+            with _trace_lock:
+                shared = _active_phases > 0
+                if not shared:
+                    tracemalloc.reset_peak()  # would clobber the peak of a running phase
+                _active_phases += 1
+                _phase_starts += 1
+                started_as = _phase_starts
+                mem_before, _ = tracemalloc.get_traced_memory()
+        profile = self._enable_profile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                _profile_lock.release()
+            wall = time.perf_counter() - start
+            record = {"phase": name, "wallMs": round(wall * 1000, 1)}
+            if self.trace_memory:
+                with _trace_lock:
+                    shared = shared or _active_phases > 1 or _phase_starts != started_as
+                    _active_phases -= 1
+                    mem_after, peak = tracemalloc.get_traced_memory()
+                record["peakMemoryMB"] = round(peak / 1e6, 2)
+                record["netAllocatedMB"] = round((mem_after - mem_before) / 1e6, 2)
+                if shared:
+                    record["memoryShared"] = True
+            if profile is None:
+                record["cpuProfileSkipped"] = True
+                record["topFunctions"] = []
+            else:
+                record["topFunctions"] = self._top_functions(profile)
+                if self.dump_dir is not None:
+                    record["pstats"] = self._dump(profile, name)
+            self.phases.append(record)
+
+    @staticmethod
+    def _enable_profile():
+        """An enabled cProfile.Profile, or None while another profile is active."""
+        if not _profile_lock.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiling tool (Python >= 3.12)
+            _profile_lock.release()
+            return None
+        return profile
+
+    def _top_functions(self, profile):
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": _function_label(func),
+                "calls": nc,
+                "totalMs": round(tt * 1000, 2),
+                "cumulativeMs": round(ct * 1000, 2),
+            }
+            for func, (cc, nc, tt, ct, callers) in rows[:self.top_n]
+        ]
+
+    def _dump(self, profile, name):
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = self.dump_dir / f"profile_{self.run_id}_{name}.pstats"
+        profile.dump_stats(str(path))
+        self.artifacts.append(path.name)
+        return path.name
+
+    def close(self):
+        """Release the shared trace (stopped once no profiler holds it)."""
+        if self._holds_trace:
+            _release_trace()
+            self._holds_trace = False
+
+    def report(self):
+        """JSON-serialisable summary for the response meta / solver_result."""
+        return {"topN": self.top_n, "phases": list(self.phases), "artifacts": list(self.artifacts)}
@@ -6,60 +6,209 @@ atomic "slot" objects representing each shift assignment opportunity on each day
 Example:
   Input: demandId=D001, rotationSequence=[D,D,N,N,O,O,O], startDate=2025-11-03
   Output: List of Slot objects for each (date, shiftCode) pair in the planning horizon
+
+build_slot_table() produces the same slots as a columnar SlotTable (NumPy arrays)
+with vectorised filters; build_slots() materialises it into Slot objects.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date, timedelta
-import uuid
+import sys
 
+import numpy as np
 
-@dataclass
-class Slot:
-    """Represents a single shift slot to be filled.
+from .time_utils import ShiftShape, shift_shape
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=None)
+def ordinal_date(ordinal: int) -> date:
+    """Return the (shared) date object for a proleptic Gregorian ordinal."""
+    return date.fromordinal(ordinal)
+
+
+@lru_cache(maxsize=None)
+def ordinal_midnight(ordinal: int) -> datetime:
+    """Return the (shared) midnight datetime for a proleptic Gregorian ordinal."""
+    return datetime.combine(date.fromordinal(ordinal), datetime.min.time())
+
+
+@lru_cache(maxsize=None)
+def _isoformat(d: date) -> str:
+    return d.isoformat()
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Convert a time string (HH:MM format) into minutes after midnight.
+    
+    Args:
+        time_str: Time in 'HH:MM' format (e.g., '07:00')
+    
+    Returns:
+        Minutes after midnight (e.g., 420)
+    """
+    parts = time_str.split(':')
+    hour = int(parts[0])
+    minute = int(parts[1]) if len(parts) > 1 else 0
+    return hour * 60 + minute
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RequirementSpec:
+    """Immutable requirement-level attributes shared by every slot of a requirement.
+    
+    One instance is created per (demand, shift group, requirement), so the
+    whitelist, blacklist, rotation and qualification containers are held once
+    instead of once per slot. IDs are interned. Compared and hashed by identity.
     
     Attributes:
-        slot_id: Unique identifier for this slot (demandId-requirementId-date-shiftCode-uuid)
-        demandId: Reference to the demand item this slot fulfills
+        demandId: Reference to the demand item
         requirementId: Reference to the specific requirement within the demand
-        date: Date of the shift (calendar date)
-        shiftCode: Shift code (e.g., 'D', 'N', 'O')
-        start: Shift start time (datetime)
-        end: Shift end time (datetime)
         locationId: Location where the shift is located
         ouId: Organizational unit
         productTypeId: Product type (e.g., 'APO', 'AVSO')
         rankId: Rank requirement
         genderRequirement: Gender requirement ('Any', 'M', 'F', 'Mix')
         schemeRequirement: Scheme requirement ('A', 'B', 'P', 'Global')
-        requiredQualifications: List of required qualification codes
+        requiredQualifications: Required qualification codes
         rotationSequence: Rotation pattern for this requirement
-        preferredTeams: List of preferred team IDs
+        coverageAnchor: Anchor date of the rotation cycle
+        preferredTeams: Preferred team IDs
         whitelist: Whitelist constraints {teamIds, employeeIds}
         blacklist: Blacklist with date ranges {employeeIds: [{employeeId, blacklistStartDate, blacklistEndDate}]}
     """
-    slot_id: str
     demandId: str
     requirementId: str
-    date: date
-    shiftCode: str
-    start: datetime
-    end: datetime
     locationId: str
     ouId: str
     productTypeId: str
     rankId: str
     genderRequirement: str
     schemeRequirement: str
-    requiredQualifications: List[str]
-    rotationSequence: List[str]
+    requiredQualifications: Tuple[str, ...]
+    rotationSequence: Tuple[str, ...]
     coverageAnchor: date
-    preferredTeams: List[str]
+    preferredTeams: Tuple[str, ...]
     whitelist: Dict[str, List[str]]
     blacklist: Dict[str, List[Dict[str, str]]]
 
 
+@dataclass(frozen=True, slots=True)
+class Slot:
+    """Represents a single shift slot to be filled.
+    
+    Compact representation: only per-slot data is stored (date as an ordinal,
+    times as minutes after that day's midnight); requirement-level attributes
+    are shared through ``spec`` and exposed as read-only properties.
+    
+    Attributes:
+        slot_id: Deterministic identifier (demandId-requirementId-shiftCode-Pposition-date);
+            identical input always yields identical IDs
+        index: Compact integer index of this slot in the build_slots() output
+        spec: Shared RequirementSpec of the requirement this slot belongs to
+        shiftCode: Shift code (e.g., 'D', 'N'), interned
+        position: Position index within the requirement headcount
+        day: Date of the shift as a proleptic Gregorian ordinal
+        start_min: Shift start in minutes after midnight of ``day``
+        end_min: Shift end in minutes after midnight of ``day`` (> 1440 for overnight shifts)
+    """
+    slot_id: str
+    index: int
+    spec: RequirementSpec
+    shiftCode: str
+    position: int
+    day: int
+    start_min: int
+    end_min: int
+    
+    @property
+    def date(self) -> date:
+        """Date of the shift (calendar date)."""
+        return ordinal_date(self.day)
+    
+    @property
+    def start(self) -> datetime:
+        """Shift start time (datetime)."""
+        return ordinal_midnight(self.day) + timedelta(minutes=self.start_min)
+    
+    @property
+    def end(self) -> datetime:
+        """Shift end time (datetime)."""
+        return ordinal_midnight(self.day) + timedelta(minutes=self.end_min)
+    
+    @property
+    def key(self) -> Tuple[str, str, str, int, int]:
+        """Stable hashable identity: (demandId, requirementId, shiftCode, position, day)."""
+        return (self.spec.demandId, self.spec.requirementId, self.shiftCode, self.position, self.day)
+    
+    @property
+    def duration_min(self) -> int:
+        """Shift duration in minutes."""
+        return self.end_min - self.start_min
+    
+    @property
+    def shape(self) -> ShiftShape:
+        """Interned hour breakdown (tenths of hours) of this slot's shift."""
+        return shift_shape(self.start_min, self.end_min - self.start_min)
+    
+    # Requirement-level attributes (shared through spec)
+    demandId = property(lambda self: self.spec.demandId)
+    requirementId = property(lambda self: self.spec.requirementId)
+    locationId = property(lambda self: self.spec.locationId)
+    ouId = property(lambda self: self.spec.ouId)
+    productTypeId = property(lambda self: self.spec.productTypeId)
+    rankId = property(lambda self: self.spec.rankId)
+    genderRequirement = property(lambda self: self.spec.genderRequirement)
+    schemeRequirement = property(lambda self: self.spec.schemeRequirement)
+    requiredQualifications = property(lambda self: self.spec.requiredQualifications)
+    rotationSequence = property(lambda self: self.spec.rotationSequence)
+    coverageAnchor = property(lambda self: self.spec.coverageAnchor)
+    preferredTeams = property(lambda self: self.spec.preferredTeams)
+    whitelist = property(lambda self: self.spec.whitelist)
+    blacklist = property(lambda self: self.spec.blacklist)
+
+
+def rotation_off_day(slot, offset: int) -> bool:
+    """True if the slot falls on an 'O' day of its rotation for an employee on ``offset``."""
+    rotation_seq = slot.rotationSequence
+    if not rotation_seq or not slot.coverageAnchor:
+        return False
+    days_from_base = slot.day - slot.coverageAnchor.toordinal()
+    return rotation_seq[(days_from_base - offset) % len(rotation_seq)] == 'O'
+
+
+def make_slot_id(demand_id: str, requirement_id: str, shift_code: str,
+                 position: int, day: date, shift_group: int = 0) -> str:
+    """Build the deterministic slot ID for (demand, requirement, shift, position, date).
+    
+    The shift group index is only appended for secondary shift groups of a
+    demand, so the common single-group case keeps the short form.
+    
+    Examples:
+        make_slot_id('D1', 'R1', 'D', 0, date(2025, 12, 1)) → 'D1-R1-D-P0-2025-12-01'
+        make_slot_id('D1', 'R1', 'D', 0, date(2025, 12, 1), 1) → 'D1-R1-D-P0-2025-12-01-S1'
+    """
+    slot_id = f"{demand_id}-{requirement_id}-{shift_code}-P{position}-{_isoformat(day)}"
+    if shift_group:
+        slot_id += f"-S{shift_group}"
+    return slot_id
+
+
+def slot_index_map(slots: List[Slot]) -> Dict[str, int]:
+    """Map slot_id → slot index, e.g. to carry hints or cached results across runs."""
+    return {slot.slot_id: slot.index for slot in slots}
+
+
+def _intern(value):
+    """Intern string IDs so repeated values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def combine(d: date, time_str: str) -> datetime:
     """Combine a date and time string (HH:MM format) into a datetime object.
     
@@ -94,34 +243,136 @@ def daterange(start: date, end: date) -> List[date]:
     return dates
 
 
-def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
-    """Expand demandItems + requirements + shift rotations into concrete daily slots.
+class SlotTable:
+    """Columnar slot representation backed by NumPy arrays.
+    
+    One row per slot, in the same order as build_slots(). Categorical values
+    are stored as integer codes into small lookup lists, so filters over the
+    whole horizon are vectorised array operations. Slot objects are only
+    created on demand (iter_slots / slot).
+    
+    Columns (all NumPy arrays of equal length):
+        demand_idx: Index into ``demand_ids``
+        requirement_idx: Index into ``specs`` (one RequirementSpec per requirement)
+        day: Date as a proleptic Gregorian ordinal
+        shift_idx: Index into ``shift_codes``
+        position: Position index within the requirement headcount
+        start_min: Shift start in minutes after midnight of ``day``
+        end_min: Shift end in minutes after midnight of ``day``
+        location_code: Index into ``locations``
+        rank_code: Index into ``ranks``
+    """
+    
+    COLUMNS = ('demand_idx', 'requirement_idx', 'day', 'shift_idx', 'position',
+               'start_min', 'end_min', 'location_code', 'rank_code')
+    
+    def __init__(self, specs: List[RequirementSpec], spec_groups: List[int],
+                 spec_suffixes: List[str], shift_codes: List[str], demand_ids: List[str],
+                 locations: List[str], ranks: List[str], columns: Dict[str, np.ndarray]):
+        self.specs = specs
+        self.spec_groups = spec_groups
+        self.spec_suffixes = spec_suffixes
+        self.shift_codes = shift_codes
+        self.demand_ids = demand_ids
+        self.locations = locations
+        self.ranks = ranks
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+    
+    def __len__(self) -> int:
+        return len(self.day)
+    
+    # ---------- vectorised filters (return boolean masks) ----------
+    
+    def date_mask(self, start: Optional[date] = None, end: Optional[date] = None) -> np.ndarray:
+        """Rows whose date lies in [start, end] (either bound optional)."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.day >= start.toordinal()
+        if end is not None:
+            mask &= self.day <= end.toordinal()
+        return mask
+    
+    def shift_mask(self, shift_codes) -> np.ndarray:
+        """Rows whose shift code is one of ``shift_codes``."""
+        codes = [i for i, code in enumerate(self.shift_codes) if code in set(shift_codes)]
+        return np.isin(self.shift_idx, codes)
+    
+    def weekday_mask(self, weekdays) -> np.ndarray:
+        """Rows falling on one of ``weekdays`` (0=Monday … 6=Sunday)."""
+        return np.isin((self.day - 1) % 7, list(weekdays))
+    
+    # ---------- materialisation ----------
+    
+    def slot(self, row: int) -> Slot:
+        """Create the Slot object for one row."""
+        return next(self.iter_slots(np.array([row])))
+    
+    def iter_slots(self, rows: Optional[np.ndarray] = None):
+        """Lazily yield Slot objects.
+        
+        Args:
+            rows: Optional boolean mask or integer row indices to restrict the output
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        elif rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        specs = self.specs
+        shift_codes = self.shift_codes
+        # Convert the selected columns to Python ints once instead of per row
+        columns = zip(
+            rows.tolist(),
+            self.requirement_idx[rows].tolist(),
+            self.shift_idx[rows].tolist(),
+            self.position[rows].tolist(),
+            self.day[rows].tolist(),
+            self.start_min[rows].tolist(),
+            self.end_min[rows].tolist(),
+        )
+        for row, req, shift, position, day, start_min, end_min in columns:
+            spec = specs[req]
+            shift_code = shift_codes[shift]
+            slot_id = make_slot_id(spec.demandId, spec.requirementId, shift_code, position,
+                                   ordinal_date(day), self.spec_groups[req]) + self.spec_suffixes[req]
+            yield Slot(slot_id, row, spec, shift_code, position, day, start_min, end_min)
+
+
+def _code(lookup: Dict[Any, int], values: List[Any], value: Any) -> int:
+    """Return the integer code of ``value``, adding it to the lookup if new."""
+    if value not in lookup:
+        lookup[value] = len(values)
+        values.append(value)
+    return lookup[value]
+
+
+def build_slot_table(inputs: Dict[str, Any]) -> SlotTable:
+    """Expand demandItems + requirements + shift rotations into a columnar SlotTable.
     
     Process (v0.70 schema):
-    1. Parse planning horizon (startDate, endDate)
-    2. For each demandItem:
-       - Get shiftStartDate as rotation anchor
-       - For each shift definition:
-         - Map shiftCode → shift details (start time, end time, nextDay flag)
-         - Get whitelist/blacklist from shift level
-       - For each requirement:
-         - Get rotation sequence per requirement
-         - Get gender, scheme, qualifications per requirement
-         - Create individual slots (headcount=1 each)
-    3. For each day in planning horizon:
-       - Determine which shift applies based on rotation offset
-       - Create a Slot object for each position (NOT grouped by headcount)
-    4. Return list of all slots
+    1. Parse planning horizon (startDate, endDate) into an array of day ordinals
+    2. For each demandItem / shift definition:
+       - Map shiftCode → shift details (start time, end time, nextDay flag)
+       - Mask the horizon by coverageDays and public-holiday flags (once per shift group)
+    3. For each requirement:
+       - Create one RequirementSpec (gender, scheme, qualifications, rotation, lists)
+       - For each shift code in its work pattern, append headcount × covered-days rows
+    
+    The rotation sequence is only used for EMPLOYEE matching via rotationOffset,
+    NOT for determining which days need slots: slots are created for every
+    covered day, for each shift code that appears in the work pattern.
     
     Args:
         inputs: Input context dict with demandItems and planningHorizon
     
     Returns:
-        List of Slot objects ready for assignment
+        SlotTable with one row per slot (headcount=1 each)
     """
     horizon = inputs.get("planningHorizon", {})
     start_date = datetime.fromisoformat(horizon.get("startDate", "") + "T00:00:00").date()
     end_date = datetime.fromisoformat(horizon.get("endDate", "") + "T00:00:00").date()
+    horizon_days = np.arange(start_date.toordinal(), end_date.toordinal() + 1, dtype=np.int32)
+    horizon_weekdays = (horizon_days - 1) % 7  # 0=Monday, 6=Sunday
     
     # Get public holidays from context
     public_holidays_str = inputs.get("publicHolidays", [])
@@ -132,8 +383,22 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
             public_holidays.add(ph_date)
         except:
             pass
+    ph_ordinals = np.array(sorted(d.toordinal() for d in public_holidays), dtype=np.int32)
+    is_ph = np.isin(horizon_days, ph_ordinals)
+    is_eve_of_ph = np.isin(horizon_days + 1, ph_ordinals)
+    
+    day_name_to_idx = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6}
     
-    slots: List[Slot] = []
+    specs: List[RequirementSpec] = []
+    spec_groups: List[int] = []
+    spec_suffixes: List[str] = []
+    spec_key_counts: Dict[Tuple[str, str, int], int] = {}
+    shift_codes: List[str] = []
+    demand_ids: List[str] = []
+    locations: List[str] = []
+    ranks: List[str] = []
+    lookups = {'shift': {}, 'demand': {}, 'location': {}, 'rank': {}}
+    blocks = {name: [] for name in SlotTable.COLUMNS}
     
     print(f"\n[slot_builder] Expanding demands into slots...")
     print(f"  Planning horizon: {start_date} to {end_date}")
@@ -143,6 +408,8 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
         demand_id = dmd.get("demandId")
         location_id = dmd.get("locationId")
         ou_id = dmd.get("ouId")
+        demand_code = _code(lookups['demand'], demand_ids, _intern(demand_id))
+        location_code = _code(lookups['location'], locations, _intern(location_id))
         
         # Anchor date for rotation cycle
         base = datetime.fromisoformat(dmd.get("shiftStartDate", "") + "T00:00:00").date()
@@ -154,19 +421,14 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
             # Build map: shiftCode → shift details
             details = {}
             for sd in sh.get("shiftDetails", []):
-                shift_code = sd.get("shiftCode")
-                details[shift_code] = sd
+                details[sd.get("shiftCode")] = sd
             
             preferred_teams = sh.get("preferredTeams", [])
             whitelist = sh.get("whitelist", {"teamIds": [], "employeeIds": []})
             blacklist = sh.get("blacklist", {"employeeIds": []})
             
-            # Get coverageDays - can be array of day names or legacy integer
-            coverage_days_input = sh.get("coverageDays", 7)
-            coverage_days_names = []
-            coverage_anchor_str = sh.get("coverageAnchor")
-            
             # Parse coverage anchor date (used for rotation cycle calculation)
+            coverage_anchor_str = sh.get("coverageAnchor")
             if coverage_anchor_str:
                 try:
                     coverage_anchor_date = datetime.fromisoformat(coverage_anchor_str + "T00:00:00").date()
@@ -175,20 +437,27 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
             else:
                 coverage_anchor_date = base
             
+            # Get coverageDays - can be array of day names or legacy integer (7 means all 7 days)
+            coverage_days_input = sh.get("coverageDays", 7)
             if isinstance(coverage_days_input, list):
-                # New format: array of day names ["Mon", "Tue", "Wed", ...]
                 coverage_days_names = coverage_days_input
-                coverage_days_count = len(coverage_days_names)
             else:
-                # Legacy format: integer (7 means all 7 days)
-                coverage_days_count = coverage_days_input
-                coverage_days_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][:coverage_days_count]
+                coverage_days_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][:coverage_days_input]
+            coverage_weekdays = [day_name_to_idx.get(d, -1) for d in coverage_days_names]
             
             # Get public holiday inclusion flags (default to True if not specified)
             include_public_holidays = sh.get("includePublicHolidays", True)
             include_eve_of_public_holidays = sh.get("includeEveOfPublicHolidays", True)
             
-            print(f"    Shift #{shift_idx}: coverage_days={coverage_days_names}, includePH={include_public_holidays}, includeEvePH={include_eve_of_public_holidays}")
+            # Days of the horizon that need coverage for this shift group
+            covered = np.isin(horizon_weekdays, coverage_weekdays)
+            if not include_public_holidays:
+                covered &= ~is_ph
+            if not include_eve_of_public_holidays:
+                covered &= ~is_eve_of_ph
+            covered_days = horizon_days[covered]
+            
+            print(f"    Shift #{shift_idx}: coverage_days={coverage_days_names}, includePH={include_public_holidays}, includeEvePH={include_eve_of_public_holidays}, coveredDays={len(covered_days)}")
             
             # Process each requirement within this demand
             requirements = dmd.get("requirements", [])
@@ -212,127 +481,100 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
                     print(f"      ⚠️  Requirement {requirement_id} has empty work pattern, skipping")
                     continue
                 
-                print(f"      Requirement {requirement_id}: product={product_type}, rank={rank_id}, headcount={headcount}, gender={gender_req}, scheme={scheme_req}")
-                print(f"        Work Pattern: {work_pattern}")
-                
-                # Determine the shift code to use (first non-"O" code from sequence)
-                non_o_codes = [code for code in work_pattern if code != "O"]
-                default_shift_code = non_o_codes[0] if non_o_codes else list(details.keys())[0] if details else "D"
-                
-                # CRITICAL: coverageDays defines business need for continuous coverage
-                # Slots must be created for ALL days in coverage window that match coverageDays
-                # The rotation sequence is used for EMPLOYEE matching via rotationOffset
-                # NOT for determining which days need slots!
-                
-                # Map day names to weekday indices
-                day_name_to_idx = {
-                    "Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6
-                }
-                coverage_weekdays = set(day_name_to_idx.get(d, -1) for d in coverage_days_names)
-                
-                # CRITICAL UNDERSTANDING:
-                # 1. shiftDetails defines WHAT shifts exist (e.g., D and N = 2 shifts per day)
-                # 2. coverageDays defines WHEN coverage is needed (e.g., Mon-Sun = every day)
-                # 3. headcount defines HOW MANY people per shift (e.g., 2 = need 2 people)
-                # 4. workPattern is ONLY for EMPLOYEE assignment logic (NOT slot creation)
-                #
-                # SLOT CREATION LOGIC:
-                # SLOT CREATION LOGIC:
-                # - Determine which shift codes to create based on workPattern
-                # - If workPattern = ["D","D","D","D","O","O"] → Only create D slots
-                # - If workPattern = ["N","N","N","N","O","O"] → Only create N slots
-                # - If workPattern = ["D","D","N","N","O","O"] → Create both D and N slots
-                # - Create headcount number of slots for each shift code that appears in workPattern
-                
-                # Extract unique shift codes from workPattern (excluding 'O')
-                shift_codes_in_pattern = set()
-                for code in work_pattern:
-                    if code != 'O':
-                        shift_codes_in_pattern.add(code)
-                
+                # Slots are created for each shift code in the work pattern (excluding 'O')
+                # that exists in shiftDetails, e.g. [D,D,N,N,O,O] → D and N slots
+                shift_codes_in_pattern = {code for code in work_pattern if code != 'O'}
                 if not shift_codes_in_pattern:
                     print(f"      ⚠️  No shift codes found in workPattern (only 'O'), skipping")
                     continue
                 
-                # Verify these shift codes exist in shiftDetails
-                available_shift_codes = list(details.keys())
-                shift_codes_to_create = [code for code in shift_codes_in_pattern if code in available_shift_codes]
-                
+                shift_codes_to_create = sorted(code for code in shift_codes_in_pattern if code in details)
                 if not shift_codes_to_create:
                     print(f"      ⚠️  Shift codes {shift_codes_in_pattern} from workPattern not found in shiftDetails, skipping")
                     continue
                 
-                print(f"        Creating slots for shift codes from workPattern: {sorted(shift_codes_to_create)}")
+                spec_code = len(specs)
+                specs.append(RequirementSpec(
+                    demandId=_intern(demand_id),
+                    requirementId=_intern(requirement_id),
+                    locationId=_intern(location_id),
+                    ouId=_intern(ou_id),
+                    productTypeId=_intern(product_type),
+                    rankId=_intern(rank_id),
+                    genderRequirement=_intern(gender_req),
+                    schemeRequirement=_intern(scheme_req),
+                    requiredQualifications=tuple(_intern(q) for q in required_quals),
+                    rotationSequence=tuple(_intern(code) for code in work_pattern),
+                    coverageAnchor=coverage_anchor_date,
+                    preferredTeams=tuple(_intern(t) for t in preferred_teams),
+                    whitelist=whitelist,
+                    blacklist=blacklist
+                ))
+                spec_groups.append(shift_idx)
+                # Duplicate requirementId within a demand/shift group: disambiguate deterministically
+                spec_key = (demand_id, requirement_id, shift_idx)
+                duplicates = spec_key_counts.get(spec_key, 0)
+                spec_key_counts[spec_key] = duplicates + 1
+                spec_suffixes.append(f"-{duplicates}" if duplicates else "")
+                rank_code = _code(lookups['rank'], ranks, _intern(rank_id))
                 
-                # Generate slots for each shift code found in workPattern
-                for shift_code in sorted(shift_codes_to_create):
-                    shift_detail = details.get(shift_code)
-                    if not shift_detail:
-                        continue
+                n_days = len(covered_days)
+                for shift_code in shift_codes_to_create:
+                    shift_detail = details[shift_code]
+                    
+                    # Parse shift times (minutes after midnight of the slot date)
+                    start_min = time_to_minutes(shift_detail.get("start", "00:00"))
+                    end_min = time_to_minutes(shift_detail.get("end", "00:00"))
                     
-                    # Parse shift times
-                    start_time_str = shift_detail.get("start", "00:00")
-                    end_time_str = shift_detail.get("end", "00:00")
-                    next_day_flag = shift_detail.get("nextDay", False)
+                    # Handle overnight shifts
+                    if end_min <= start_min or shift_detail.get("nextDay", False):
+                        end_min += MINUTES_PER_DAY
                     
-                    # Generate slots for each position (headcount times)
-                    # Each slot is individual (headcount=1 per slot)
-                    for position_idx in range(headcount):
-                        position_slot_count = 0
-                        
-                        for cur_day in daterange(start_date, end_date):
-                            # Check if this day's weekday is in the coverage days
-                            cur_weekday = cur_day.weekday()  # 0=Monday, 6=Sunday
-                            if cur_weekday not in coverage_weekdays:
-                                continue
-                            
-                            # Skip if current day is a public holiday and includePublicHolidays is False
-                            if cur_day in public_holidays and not include_public_holidays:
-                                continue
-                            
-                            # Skip if current day is eve of public holiday and includeEveOfPublicHolidays is False
-                            next_day = cur_day + timedelta(days=1)
-                            if next_day in public_holidays and not include_eve_of_public_holidays:
-                                continue
-                            
-                            # Create shift start/end times
-                            start = combine(cur_day, start_time_str)
-                            end = combine(cur_day, end_time_str)
-                            
-                            # Handle overnight shifts
-                            if end <= start or next_day_flag:
-                                end = end + timedelta(days=1)
-                            
-                            # Create individual slot (headcount=1 per slot)
-                            slot_id = f"{demand_id}-{requirement_id}-{shift_code}-P{position_idx}-{cur_day.isoformat()}-{uuid.uuid4().hex[:6]}"
-                            slot = Slot(
-                                slot_id=slot_id,
-                                demandId=demand_id,
-                                requirementId=requirement_id,
-                                date=cur_day,
-                                shiftCode=shift_code,
-                                start=start,
-                                end=end,
-                                locationId=location_id,
-                                ouId=ou_id,
-                                productTypeId=product_type,
-                                rankId=rank_id,
-                                genderRequirement=gender_req,
-                                schemeRequirement=scheme_req,
-                                requiredQualifications=required_quals,
-                                rotationSequence=work_pattern,
-                                coverageAnchor=coverage_anchor_date,
-                                preferredTeams=preferred_teams,
-                                whitelist=whitelist,
-                                blacklist=blacklist
-                            )
-                            slots.append(slot)
-                            position_slot_count += 1
-                        
-                        print(f"        Shift {shift_code}, Position {position_idx}: Created {position_slot_count} slots")
-    
-    print(f"[slot_builder] ✓ Expanded to {len(slots)} total slots\n")
-    return slots
+                    shift_code_idx = _code(lookups['shift'], shift_codes, _intern(shift_code))
+                    
+                    # One row per (position, covered day), positions outermost
+                    n_rows = headcount * n_days
+                    blocks['demand_idx'].append(np.full(n_rows, demand_code, dtype=np.int32))
+                    blocks['requirement_idx'].append(np.full(n_rows, spec_code, dtype=np.int32))
+                    blocks['day'].append(np.tile(covered_days, headcount))
+                    blocks['shift_idx'].append(np.full(n_rows, shift_code_idx, dtype=np.int16))
+                    blocks['position'].append(np.repeat(np.arange(headcount, dtype=np.int16), n_days))
+                    blocks['start_min'].append(np.full(n_rows, start_min, dtype=np.int16))
+                    blocks['end_min'].append(np.full(n_rows, end_min, dtype=np.int16))
+                    blocks['location_code'].append(np.full(n_rows, location_code, dtype=np.int32))
+                    blocks['rank_code'].append(np.full(n_rows, rank_code, dtype=np.int32))
+                
+                print(f"      Requirement {requirement_id}: product={product_type}, rank={rank_id}, headcount={headcount}, gender={gender_req}, scheme={scheme_req}, "
+                      f"pattern={work_pattern}, shifts={shift_codes_to_create} → {headcount * n_days * len(shift_codes_to_create)} slots")
+    
+    dtypes = {'demand_idx': np.int32, 'requirement_idx': np.int32, 'day': np.int32,
+              'shift_idx': np.int16, 'position': np.int16, 'start_min': np.int16,
+              'end_min': np.int16, 'location_code': np.int32, 'rank_code': np.int32}
+    columns = {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtype=dtypes[name])
+        for name, parts in blocks.items()
+    }
+    table = SlotTable(specs, spec_groups, spec_suffixes, shift_codes, demand_ids,
+                      locations, ranks, columns)
+    
+    print(f"[slot_builder] ✓ Expanded to {len(table)} total slots\n")
+    return table
+
+
+def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
+    """Expand demandItems + requirements + shift rotations into concrete daily slots.
+    
+    Materialises every row of build_slot_table(inputs) as a Slot object; use
+    the table directly (or SlotTable.iter_slots) when a columnar view or a
+    lazy stream is sufficient.
+    
+    Args:
+        inputs: Input context dict with demandItems and planningHorizon
+    
+    Returns:
+        List of Slot objects ready for assignment
+    """
+    return list(build_slot_table(inputs).iter_slots())
 
 
 def print_slots(slots: List[Slot], limit: Optional[int] = None) -> None:
@@ -0,0 +1,297 @@
+"""Slot Matching - per-day bipartite matchings between slots and employees.
+
+build_model lets an employee take at most one slot per day, so each day is a
+bipartite matching between the day's slots and the employees eligible for
+them. Hopcroft-Karp solves each day in milliseconds:
+
+- Bound: the day-by-day maximum matchings, on eligibility alone, are a proven
+  upper bound on the slots any roster can fill. solve() reports the gap
+  between the CP-SAT roster and this bound.
+- Roster: matching the days in date order while tracking each employee's
+  rest, consecutive days and weekly / monthly hours gives a roster that keeps
+  the C1-C4 and C17 limits by construction. It seeds the CP-SAT hints and is
+  returned when CP-SAT stops without a solution.
+
+Eligibility is read from the model index (ctx['x_by_slot']), narrowed by the
+C1 scheme cap, the C7 / C11 / C12 rules and rotation off days. The roster
+also keeps C9 gender mix (see _gender_mix).
+"""
+
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .capacity_analysis import employee_day_mask
+from .slot_builder import rotation_off_day
+
+# Hard limits of the constraint modules (see C1, C2, C3, C4, C17)
+MAX_GROSS_MINUTES_BY_SCHEME = {'A': 14 * 60, 'B': 13 * 60, 'P': 9 * 60}
+MAX_WEEKLY_NORMAL_TENTHS = 440
+MAX_MONTHLY_OT_TENTHS = 720
+MAX_CONSECUTIVE_DAYS = 12
+DEFAULT_MIN_REST_MINUTES = 480
+
+
+def hopcroft_karp(adjacency: List[List[int]], num_right: int) -> List[int]:
+    """Maximum bipartite matching.
+
+    Args:
+        adjacency: Right-vertex indices adjacent to each left vertex
+        num_right: Number of right vertices
+
+    Returns:
+        Matched right vertex per left vertex (-1 if unmatched)
+    """
+    unmatched = float('inf')
+    match_left = [-1] * len(adjacency)
+    match_right = [-1] * num_right
+    for u, neighbours in enumerate(adjacency):  # greedy start
+        for v in neighbours:
+            if match_right[v] < 0:
+                match_left[u], match_right[v] = v, u
+                break
+
+    while True:
+        # BFS layers from the free left vertices
+        dist = [unmatched] * len(adjacency)
+        queue = deque()
+        for u, v in enumerate(match_left):
+            if v < 0:
+                dist[u] = 0
+                queue.append(u)
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                w = match_right[v]
+                if w < 0:
+                    found = True
+                elif dist[w] == unmatched:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            return match_left
+
+        # Vertex-disjoint shortest augmenting paths (iterative DFS along the layers)
+        pointer = [0] * len(adjacency)
+        for root in range(len(adjacency)):
+            if match_left[root] >= 0:
+                continue
+            stack, path = [root], []
+            while stack:
+                u = stack[-1]
+                advanced = False
+                while pointer[u] < len(adjacency[u]):
+                    v = adjacency[u][pointer[u]]
+                    pointer[u] += 1
+                    w = match_right[v]
+                    if w < 0:
+                        path.append(v)
+                        for left, right in zip(stack, path):
+                            match_left[left], match_right[right] = right, left
+                        stack = []
+                        advanced = True
+                        break
+                    if dist[w] == dist[u] + 1:
+                        path.append(v)
+                        stack.append(w)
+                        advanced = True
+                        break
+                if not advanced:
+                    dist[u] = unmatched
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+
+def min_rest_minutes(ctx: Dict) -> int:
+    """C4 minimum rest between shifts (minutes) configured in the constraint list."""
+    for constraint in ctx.get('constraintList', []):
+        if constraint.get('id') == 'apgdMinRestBetweenShifts':
+            return constraint.get('params', {}).get('minRestMinutes', DEFAULT_MIN_REST_MINUTES)
+    return DEFAULT_MIN_REST_MINUTES
+
+
+def _candidates(ctx: Dict, offsets: Optional[Dict[str, int]]) -> Dict[str, List[str]]:
+    """slot_id -> employee IDs that may take it (model index narrowed by C1 / C7 / C11 / C12 / rotation)."""
+    slots = ctx.get('slots', [])
+    x_by_slot = ctx.get('x_by_slot', {})
+    employees = {emp.get('employeeId'): emp for emp in ctx.get('employees', [])}
+    if not slots:
+        return {}
+    first_day = min(slot.day for slot in slots)
+    days = np.arange(first_day, max(slot.day for slot in slots) + 1)
+    masks = {}  # (employeeId, spec) -> allowed days
+    candidates = {}
+    for slot in slots:
+        allowed = []
+        for emp_id, _ in x_by_slot.get(slot.slot_id, ()):
+            emp = employees[emp_id]
+            if slot.duration_min > MAX_GROSS_MINUTES_BY_SCHEME.get(emp.get('scheme', 'A'), 14 * 60):
+                continue
+            if slot.preferredTeams and emp.get('teamId') not in slot.preferredTeams:
+                continue
+            key = (emp_id, slot.spec)
+            if key not in masks:
+                masks[key] = employee_day_mask(emp, slot.spec, days)
+            if not masks[key][slot.day - first_day]:
+                continue
+            if offsets is not None and rotation_off_day(slot, offsets.get(emp_id, 0)):
+                continue
+            allowed.append(emp_id)
+        candidates[slot.slot_id] = allowed
+    return candidates
+
+
+def _gender_mix(ctx: Dict, candidates: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Candidates with C9 'Mix' kept: one slot of each group male-only, another female-only.
+
+    C9 needs a man and a woman among a group's slots (same date, demand and
+    requirement) whenever both are eligible. Reserving one slot for each keeps
+    the mix in any roster that fills both.
+    """
+    genders = {emp.get('employeeId'): emp.get('gender') for emp in ctx.get('employees', [])}
+    groups = defaultdict(list)
+    for slot in ctx.get('slots', []):
+        if slot.genderRequirement == 'Mix':
+            groups[(slot.date, slot.demandId, slot.requirementId)].append(slot.slot_id)
+    mixed = dict(candidates)
+    for slot_ids in groups.values():
+        if len(slot_ids) < 2:
+            continue
+        eligible = {genders.get(emp_id) for slot_id in slot_ids for emp_id in candidates.get(slot_id, ())}
+        if not {'M', 'F'} <= eligible:
+            continue
+        for slot_id, gender in zip(sorted(slot_ids), ('M', 'F')):
+            mixed[slot_id] = [emp_id for emp_id in candidates[slot_id] if genders.get(emp_id) == gender]
+    return mixed
+
+
+def _match_day(day_slots, candidates, allowed=None) -> Dict[str, str]:
+    """Maximum matching of one day's slots; ``allowed(emp_id, slot)`` filters edges."""
+    index = {}
+    adjacency = []
+    for slot in day_slots:
+        adjacency.append([
+            index.setdefault(emp_id, len(index))
+            for emp_id in candidates.get(slot.slot_id, ())
+            if allowed is None or allowed(emp_id, slot)
+        ])
+    employees = list(index)
+    match = hopcroft_karp(adjacency, len(employees))
+    return {slot.slot_id: employees[v] for slot, v in zip(day_slots, match) if v >= 0}
+
+
+def match_slots(ctx: Dict) -> Dict:
+    """
+    Coverage bound and rule-aware matching roster of a built model.
+
+    Args:
+        ctx: Context after build_model (slots, x_by_slot, employees, constraintList)
+
+    Returns:
+        Dict with upperBound (slots any roster can fill), totalSlots,
+        assignments (slot_id -> employeeId of the matching roster),
+        dayBounds (ISO date -> bound of that day) and durationMs
+    """
+    match_start = time.perf_counter()
+    slots = ctx.get('slots', [])
+    fixed_offsets = ctx.get('fixedRotationOffset', True)
+    input_offsets = {emp.get('employeeId'): emp.get('rotationOffset', 0) for emp in ctx.get('employees', [])}
+    # The roster always follows one offset per employee; the bound only when offsets are fixed
+    roster_offsets = dict(input_offsets, **(ctx.get('offsetHints') or {})) if not fixed_offsets else input_offsets
+    bound_candidates = _candidates(ctx, input_offsets if fixed_offsets else None)
+    roster_candidates = _gender_mix(ctx, bound_candidates if fixed_offsets else _candidates(ctx, roster_offsets))
+
+    slots_by_day = defaultdict(list)
+    for slot in slots:
+        slots_by_day[slot.day].append(slot)
+
+    min_rest = min_rest_minutes(ctx)
+    last_end = {}  # employeeId -> (day, end minute) of the last shift
+    streak = {}  # employeeId -> (last day worked, consecutive days ending there)
+    week_normal = defaultdict(int)  # (employeeId, ISO year, ISO week) -> normal tenths
+    month_ot = defaultdict(int)  # (employeeId, year, month) -> OT tenths
+
+    def allowed(emp_id, slot):
+        if emp_id in last_end:
+            last_day, end_min = last_end[emp_id]
+            if (slot.day - last_day) * 1440 + slot.start_min - end_min < min_rest:
+                return False
+        last_day, run = streak.get(emp_id, (None, 0))
+        if last_day == slot.day - 1 and run >= MAX_CONSECUTIVE_DAYS:
+            return False
+        iso = slot.date.isocalendar()
+        shape = slot.shape
+        if week_normal[(emp_id, iso[0], iso[1])] + shape.normal > MAX_WEEKLY_NORMAL_TENTHS:
+            return False
+        return month_ot[(emp_id, slot.date.year, slot.date.month)] + shape.ot <= MAX_MONTHLY_OT_TENTHS
+
+    assignments = {}
+    day_bounds = {}
+    for day in sorted(slots_by_day):
+        # Earliest shifts first, so the greedy start favours the usual rest order
+        day_slots = sorted(slots_by_day[day], key=lambda s: (s.start_min, s.slot_id))
+        day_bounds[day] = len(_match_day(day_slots, bound_candidates))
+        matched = _match_day(day_slots, roster_candidates, allowed)
+        for slot in day_slots:
+            emp_id = matched.get(slot.slot_id)
+            if emp_id is None:
+                continue
+            assignments[slot.slot_id] = emp_id
+            last_end[emp_id] = (slot.day, slot.end_min)
+            last_day, run = streak.get(emp_id, (None, 0))
+            streak[emp_id] = (slot.day, run + 1 if last_day == slot.day - 1 else 1)
+            iso = slot.date.isocalendar()
+            week_normal[(emp_id, iso[0], iso[1])] += slot.shape.normal
+            month_ot[(emp_id, slot.date.year, slot.date.month)] += slot.shape.ot
+
+    result = {
+        "totalSlots": len(slots),
+        "upperBound": sum(day_bounds.values()),
+        "assignments": assignments,
+        "dayBounds": {slots_by_day[day][0].date.isoformat(): bound for day, bound in day_bounds.items()},
+        "offsets": roster_offsets,
+        "durationMs": round((time.perf_counter() - match_start) * 1000, 1),
+    }
+    print(f"[slot_matching] Upper bound {result['upperBound']}/{len(slots)} slots, "
+          f"matching roster fills {len(assignments)} in {result['durationMs']}ms")
+    return result
+
+
+def add_matching_hints(model, ctx: Dict, matching: Dict) -> int:
+    """Hint the matching roster to CP-SAT (assignment, unassigned and offset variables).
+
+    Returns:
+        Number of hinted variables
+    """
+    assigned = matching['assignments']
+    hinted = 0
+    for slot in ctx.get('slots', []):
+        emp_id = assigned.get(slot.slot_id)
+        for other, var in ctx['x_by_slot'].get(slot.slot_id, ()):
+            model.AddHint(var, int(other == emp_id))
+            hinted += 1
+        model.AddHint(ctx['unassigned'][slot.slot_id], int(emp_id is None))
+        hinted += 1
+    offset_hints = ctx.get('offsetHints') or {}
+    variables = model.Proto().variables
+    for emp_id, var in (ctx.get('offset_vars') or {}).items():
+        if emp_id not in offset_hints:  # build_model already hinted these
+            cycle = variables[var.Index()].domain[-1] + 1
+            model.AddHint(var, matching['offsets'].get(emp_id, 0) % cycle)
+            hinted += 1
+    return hinted
+
+
+def coverage_report(assigned: int, matching: Dict, source: str) -> Dict:
+    """Filled slots against the matching bound (for solver_result['coverage'])."""
+    return {
+        "assigned": assigned,
+        "totalSlots": matching['totalSlots'],
+        "upperBound": matching['upperBound'],
+        "gap": matching['upperBound'] - assigned,
+        "source": source,
+    }
@@ -4,15 +4,21 @@
 - Supports delta-solve (preserve published assignments).
 """
 from ortools.sat.python import cp_model
+import numpy as np
 import importlib, pkgutil
 from datetime import datetime
 import time
 from collections import defaultdict
 from .data_loader import load_input
 from .score_helpers import ScoreBook
-from .slot_builder import build_slots
+from .slot_builder import build_slot_table, rotation_off_day
+from .capacity_analysis import analyze_capacity, capacity_summary
+from .slot_matching import add_matching_hints, coverage_report, match_slots
+from .unassigned_diagnosis import explain_unassigned
+from . import metrics
+from .profiling import phase_context
 
-def build_model(ctx):
+def build_model(ctx, capacity=None):
     """Build CP-SAT model with decision variables for slot-employee assignments.
     
     Decision variables:
@@ -22,18 +28,39 @@ def build_model(ctx):
     - Headcount: Each slot gets exactly as many assignments as headcount requires
     - One assignment per day per employee: No employee assigned to multiple slots on same day
     
+    Slots the capacity analysis proves unfillable get no decision variables
+    (they are fixed unassigned).
+    
     Args:
         ctx: Context dict containing demandItems, employees, etc.
+        capacity: Report of analyze_capacity() for this ctx (computed when omitted,
+            unless the input sets capacityAnalysis to false)
     
     Returns:
         Tuple of (model, assignments_dict) where assignments_dict is x[(slot_id, emp_id)]
     """
     model = cp_model.CpModel()
+    phase_timings = ctx.setdefault('phase_timings', {})  # phase -> seconds (see metrics.py)
     
-    # Build slots from demand items
-    slots = build_slots(ctx)
+    # Build slots from demand items (columnar table + materialised Slot objects)
+    with metrics.timed("slot_build", phase_timings):
+        slot_table = build_slot_table(ctx)
+        slots = list(slot_table.iter_slots())
+    ctx['slot_table'] = slot_table  # Vectorised date/shift/weekday filters
     ctx['slots'] = slots  # Store in context for constraint use
     
+    # Pre-solve capacity: slots beyond the eligible headcount get no variables
+    if capacity is None and ctx.get('capacityAnalysis', True):
+        with metrics.timed("capacity", phase_timings):
+            # CompiledModel applies offsets per solve, so its bound ignores rotation
+            capacity = analyze_capacity(
+                ctx, slot_table,
+                rotation=ctx.get('fixedRotationOffset', True) and not ctx.get('deferRotationBounds'),
+            )
+    ctx['capacity'] = capacity
+    unfillable = set(capacity['fixedSlotIds']) if capacity else set()
+    phase_start = time.perf_counter()
+    
     employees = ctx.get('employees', [])
     
     print(f"[build_model] Creating decision variables...")
@@ -45,11 +72,14 @@ def build_model(ctx):
     
     # Create decision variables: x[(slot_id, emp_id)] = 1 if assigned
     x = {}
+    x_by_slot = defaultdict(list)  # slot_id -> [(emp_id, var)] in employee order
     gender_filtered = 0
     scheme_filtered = 0
     blacklist_filtered = 0
     
     for slot in slots:
+        if slot.slot_id in unfillable:
+            continue
         for emp in employees:
             emp_id = emp.get('employeeId')
             
@@ -130,9 +160,13 @@ def build_model(ctx):
             # Create decision variable for all whitelisted pairs
             # Pattern enforcement will be handled as hard constraints below
             var_name = f"x[{slot.slot_id}][{emp_id}]"
-            x[(slot.slot_id, emp_id)] = model.NewBoolVar(var_name)
+            var = model.NewBoolVar(var_name)
+            x[(slot.slot_id, emp_id)] = var
+            x_by_slot[slot.slot_id].append((emp_id, var))
     
     print(f"[build_model] ✓ Created {len(x)} decision variables")
+    if unfillable:
+        print(f"  ℹ️  {len(unfillable)} slots fixed unassigned by the capacity analysis")
     if gender_filtered > 0:
         print(f"  ℹ️  Filtered {gender_filtered} employee-slot pairs based on gender requirement")
     if scheme_filtered > 0:
@@ -148,6 +182,8 @@ def build_model(ctx):
         unassigned[slot.slot_id] = model.NewBoolVar(f"unassigned_slot_{slot.slot_id}")
     
     print(f"  ✓ Created {len(unassigned)} unassigned slot variables")
+    metrics.observe_phase("variables", time.perf_counter() - phase_start, phase_timings)
+    phase_start = time.perf_counter()
     
     # ========== CONSTRAINT 1: HEADCOUNT SATISFACTION (MODIFIED) ==========
     print(f"\n[build_model] Adding headcount constraints (with unassigned option)...")
@@ -156,9 +192,7 @@ def build_model(ctx):
         # v0.70: Each slot represents 1 position (headcount is implicit=1)
         # Sum assignments for this slot must equal 1 OR slot is marked unassigned
         # Only include employees that are whitelisted for this slot
-        slot_assignments = [x[(slot.slot_id, emp.get('employeeId'))] 
-                           for emp in employees 
-                           if (slot.slot_id, emp.get('employeeId')) in x]
+        slot_assignments = [var for _, var in x_by_slot.get(slot.slot_id, [])]
         
         if slot_assignments:  # Only add constraint if there are valid employees
             # MODIFIED: Either assign exactly 1 employee OR mark slot as unassigned
@@ -239,6 +273,7 @@ def build_model(ctx):
         # Create offset decision variables for each employee
         # Offset range: 0 to (pattern_length - 1)
         pattern_length = 6  # Default 6-day cycle
+        offset_hints = ctx.get('offsetHints') or {}  # employeeId -> offset
         
         for emp in employees:
             emp_id = emp.get('employeeId')
@@ -251,8 +286,15 @@ def build_model(ctx):
             
             # Create integer decision variable for offset
             offset_vars[emp_id] = model.NewIntVar(0, pattern_length - 1, f"offset_{emp_id}")
+            
+            # Optional starting point, e.g. offsets recommended by the configuration optimizer
+            if emp_id in offset_hints:
+                model.AddHint(offset_vars[emp_id], offset_hints[emp_id] % pattern_length)
         
-        print(f"  ✓ Created {len(offset_vars)} offset decision variables (range: 0-{pattern_length-1})\n")
+        print(f"  ✓ Created {len(offset_vars)} offset decision variables (range: 0-{pattern_length-1})")
+        if offset_hints:
+            print(f"  ✓ Hinted {sum(1 for emp_id in offset_vars if emp_id in offset_hints)} offsets from ctx['offsetHints']")
+        print()
         ctx['offset_vars'] = offset_vars  # Store for extraction later
     else:
         print(f"  ✓ Using fixed rotation offsets from employee data\n")
@@ -261,8 +303,14 @@ def build_model(ctx):
     print(f"[build_model] Adding work pattern constraints...")
     pattern_constraints = 0
     
+    pattern_slots = slots
+    if fixed_rotation_offset and ctx.get('deferRotationBounds'):
+        # CompiledModel fixes off-day variables through bounds on every solve
+        print(f"  ✓ Fixed-offset off days deferred to per-solve variable bounds")
+        pattern_slots = []
+    
     # For each employee-slot pair, enforce pattern matching
-    for slot in slots:
+    for slot in pattern_slots:
         rotation_seq = slot.rotationSequence
         if not rotation_seq:
             continue
@@ -285,12 +333,8 @@ def build_model(ctx):
             
             if fixed_rotation_offset:
                 # MODE 1: Use fixed offset from employee data
-                emp_offset = emp.get('rotationOffset', 0)
-                emp_cycle_day = (days_from_base - emp_offset) % cycle_days
-                expected_shift = rotation_seq[emp_cycle_day]
-                
                 # HARD CONSTRAINT: If pattern says 'O' (off day), employee cannot work
-                if expected_shift == 'O':
+                if rotation_off_day(slot, emp.get('rotationOffset', 0)):
                     model.Add(x[(slot.slot_id, emp_id)] == 0)
                     pattern_constraints += 1
             else:
@@ -431,14 +475,22 @@ def build_model(ctx):
     
     # Store model artifacts in context for later extraction
     ctx['x'] = x
+    ctx['x_by_slot'] = x_by_slot
     ctx['unassigned'] = unassigned
     ctx['total_unassigned'] = total_unassigned
     ctx['model'] = model
     ctx['solver'] = None  # Will be set after solving
+    metrics.observe_phase("base_model", time.perf_counter() - phase_start, phase_timings)
     
     return model
 
 
+def model_size(model) -> tuple:
+    """(variables, constraints) currently in the CP-SAT model proto."""
+    proto = model.Proto()
+    return len(proto.variables), len(proto.constraints)
+
+
 def apply_constraints(model, ctx):
     """Apply custom constraints from the constraints/ directory."""
     
@@ -482,21 +534,63 @@ def apply_constraints(model, ctx):
     ]
     
     all_constraints = hard_constraints + soft_constraints
-    
-    for mod_name in all_constraints:
-        try:
-            mod = importlib.import_module(f"context.constraints.{mod_name}")
-            if hasattr(mod, "add_constraints"):
-                mod.add_constraints(model, ctx)
-        except Exception as e:
-            print(f"  Warning: Could not load {mod_name}: {e}")
+    phase_timings = ctx.setdefault('phase_timings', {})
+    model_stats = ctx.setdefault('model_stats', [])  # per-module size deltas (see model_size)
+    
+    with metrics.timed("constraints", phase_timings):
+        for mod_name in all_constraints:
+            module_start = time.perf_counter()
+            vars_before, constraints_before = model_size(model)
+            try:
+                mod = importlib.import_module(f"context.constraints.{mod_name}")
+                if hasattr(mod, "add_constraints"):
+                    mod.add_constraints(model, ctx)
+            except Exception as e:
+                print(f"  Warning: Could not load {mod_name}: {e}")
+            elapsed = time.perf_counter() - module_start
+            metrics.CONSTRAINT_MODULE_SECONDS.observe(elapsed, module=mod_name)
+            vars_after, constraints_after = model_size(model)
+            model_stats.append({
+                "module": mod_name,
+                "vars": vars_after - vars_before,
+                "constraints": constraints_after - constraints_before,
+                "buildMs": round(elapsed * 1000, 1),
+            })
     
     print(f"  ✓ Loaded constraint modules\n")
 
 
+def _solution_values(solver, variables) -> np.ndarray:
+    """Read the solution values of many variables in one call.
+    
+    Indexes the raw CP-SAT response by variable index instead of calling
+    solver.Value() once per variable (and avoids the pandas dependency of
+    solver.BooleanValues()).
+    
+    Args:
+        solver: CpSolver instance after solving
+        variables: Sequence of CP-SAT variables
+    
+    Returns:
+        int64 NumPy array with one value per variable
+    """
+    if not variables:
+        return np.zeros(0, dtype=np.int64)
+    solution = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    indices = np.fromiter((var.Index() for var in variables), dtype=np.int64, count=len(variables))
+    return solution[indices]
+
+
+CAPACITY_REASON = "Fewer eligible on-pattern employees than slots (capacity analysis)"
+
+
 def extract_assignments(ctx, solver) -> list:
     """Extract assignments from solver solution.
     
+    Only existing decision variables are visited (grouped by slot via
+    ctx['x_by_slot']) and their values are read in a single vectorised call,
+    so assignment records are only built for true values.
+    
     Args:
         ctx: Context dict with slots, employees, x (decision variables), unassigned variables
         solver: CpSolver instance after solving
@@ -504,71 +598,110 @@ def extract_assignments(ctx, solver) -> list:
     Returns:
         List of assignment dicts in output format (includes both assigned and unassigned slots)
     """
-    assignments = []
     x = ctx.get('x', {})
     unassigned = ctx.get('unassigned', {})
     slots = ctx.get('slots', [])
-    employees_map = {emp.get('employeeId'): emp for emp in ctx.get('employees', [])}
+    x_by_slot = ctx.get('x_by_slot')
+    
+    if x_by_slot is None:
+        # Context built without the model index: derive it from x
+        x_by_slot = defaultdict(list)
+        for (slot_id, emp_id), var in x.items():
+            x_by_slot[slot_id].append((emp_id, var))
     
     print(f"[extract_assignments] Extracting assignments from solution...")
     
+    # Flatten the index: one entry per existing variable, in slot order
+    var_slot_pos = []
+    var_emp_ids = []
+    variables = []
+    for slot_pos, slot in enumerate(slots):
+        for emp_id, var in x_by_slot.get(slot.slot_id, ()):
+            var_slot_pos.append(slot_pos)
+            var_emp_ids.append(emp_id)
+            variables.append(var)
+    
+    unassigned_pos = [pos for pos, slot in enumerate(slots) if slot.slot_id in unassigned]
+    unassigned_vars = [unassigned[slots[pos].slot_id] for pos in unassigned_pos]
+    
+    x_values = _solution_values(solver, variables)
+    unassigned_values = _solution_values(solver, unassigned_vars)
+    
+    # Group the true assignments by slot position
+    assigned_by_slot = defaultdict(list)
+    for i in np.flatnonzero(x_values == 1):
+        assigned_by_slot[var_slot_pos[i]].append(var_emp_ids[i])
+    
+    unassigned_slots = {unassigned_pos[i] for i in np.flatnonzero(unassigned_values == 1)}
+    return assignment_records(ctx, assigned_by_slot, unassigned_slots)
+
+
+def assignment_records(ctx, assigned_by_slot, unassigned_slots) -> list:
+    """Assignment dicts in output format, in slot order.
+    
+    Args:
+        ctx: Context dict with slots (and the capacity report, if any)
+        assigned_by_slot: Slot position -> assigned employee IDs
+        unassigned_slots: Slot positions reported unassigned
+    """
+    slots = ctx.get('slots', [])
+    assignments = []
+    capacity_fixed = set((ctx.get('capacity') or {}).get('fixedSlotIds', ()))
+    
     assigned_count = 0
     unassigned_count = 0
     
-    for slot in slots:
-        slot_assigned = False
-        
-        # Check if any employee is assigned to this slot
-        for emp_id, emp in employees_map.items():
-            var_key = (slot.slot_id, emp_id)
-            if var_key in x:
-                # Check if this variable is assigned in the solution
-                if solver.Value(x[var_key]) == 1:
-                    assignment = {
-                        "assignmentId": f"{slot.demandId}-{slot.date.isoformat()}-{slot.shiftCode}-{emp_id}",
-                        "demandId": slot.demandId,
-                        "requirementId": slot.requirementId,  # v0.70: Include requirement ID
-                        "date": slot.date.isoformat(),
-                        "shiftId": slot.shiftCode,
-                        "slotId": slot.slot_id,
-                        "shiftCode": slot.shiftCode,
-                        "startDateTime": slot.start.isoformat(),
-                        "endDateTime": slot.end.isoformat(),
-                        "employeeId": emp_id,
-                        "status": "ASSIGNED",
-                        "constraintResults": {
-                            "hard": [],
-                            "soft": []
-                        }
-                    }
-                    assignments.append(assignment)
-                    slot_assigned = True
-                    assigned_count += 1
+    for slot_pos in sorted(assigned_by_slot.keys() | unassigned_slots):
+        slot = slots[slot_pos]
+        date_str = slot.date.isoformat()
+        start_str = slot.start.isoformat()
+        end_str = slot.end.isoformat()
+        emp_ids = assigned_by_slot.get(slot_pos)
         
-        # Check if slot is marked as unassigned
-        if not slot_assigned and slot.slot_id in unassigned:
-            if solver.Value(unassigned[slot.slot_id]) == 1:
-                # Create unassigned slot entry
+        if emp_ids:
+            for emp_id in emp_ids:
                 assignment = {
-                    "assignmentId": f"{slot.demandId}-{slot.date.isoformat()}-{slot.shiftCode}-UNASSIGNED",
+                    "assignmentId": f"{slot.demandId}-{date_str}-{slot.shiftCode}-{emp_id}",
                     "demandId": slot.demandId,
                     "requirementId": slot.requirementId,  # v0.70: Include requirement ID
-                    "date": slot.date.isoformat(),
+                    "date": date_str,
                     "shiftId": slot.shiftCode,
                     "slotId": slot.slot_id,
                     "shiftCode": slot.shiftCode,
-                    "startDateTime": slot.start.isoformat(),
-                    "endDateTime": slot.end.isoformat(),
-                    "employeeId": None,
-                    "status": "UNASSIGNED",
-                    "reason": "No employee could be assigned without violating hard constraints",
+                    "startDateTime": start_str,
+                    "endDateTime": end_str,
+                    "employeeId": emp_id,
+                    "status": "ASSIGNED",
                     "constraintResults": {
                         "hard": [],
                         "soft": []
                     }
                 }
                 assignments.append(assignment)
-                unassigned_count += 1
+                assigned_count += 1
+        else:
+            # Slot is marked as unassigned
+            assignment = {
+                "assignmentId": f"{slot.demandId}-{date_str}-{slot.shiftCode}-UNASSIGNED",
+                "demandId": slot.demandId,
+                "requirementId": slot.requirementId,  # v0.70: Include requirement ID
+                "date": date_str,
+                "shiftId": slot.shiftCode,
+                "slotId": slot.slot_id,
+                "shiftCode": slot.shiftCode,
+                "startDateTime": start_str,
+                "endDateTime": end_str,
+                "employeeId": None,
+                "status": "UNASSIGNED",
+                "reason": (CAPACITY_REASON if slot.slot_id in capacity_fixed
+                           else "No employee could be assigned without violating hard constraints"),
+                "constraintResults": {
+                    "hard": [],
+                    "soft": []
+                }
+            }
+            assignments.append(assignment)
+            unassigned_count += 1
     
     print(f"  ✓ Extracted {assigned_count} assigned slots")
     print(f"  ✓ Extracted {unassigned_count} unassigned slots")
@@ -606,42 +739,17 @@ def calculate_scores(ctx, assignments) -> tuple:
     
     # Count unassigned slots as hard violations (unfilled demand)
     # Analyze which constraints blocked each unassigned slot
+    diagnosis = {}
     if unassigned_count > 0:
         print(f"  ℹ️  {unassigned_count} slots could not be filled without violating hard constraints")
         
-        # Build lookup structures
-        employees_list = ctx.get('employees', [])
-        slots_list = ctx.get('slots', [])
-        slots_dict = {s.slot_id: s for s in slots_list}
+        # Rank the constraints that kept each slot open (no re-solve)
+        diagnosis = explain_unassigned(ctx, assignments)
         
         for a in assignments:
             if a.get('status') == 'UNASSIGNED':
                 slot_id = a.get('slotId')
-                slot = slots_dict.get(slot_id)
-                
-                # Determine blocking constraint(s)
-                blocking_reasons = []
-                
-                if slot:
-                    slot_rank = getattr(slot, 'rankId', None)
-                    slot_scheme = getattr(slot, 'schemeRequirement', 'Global')
-                    slot_duration = (slot.end - slot.start).total_seconds() / 3600.0
-                    
-                    # Check C11: Rank mismatch
-                    employee_ranks = {emp.get('employeeId'): emp.get('rankId') for emp in employees_list}
-                    if slot_rank and not any(rank == slot_rank for rank in employee_ranks.values()):
-                        blocking_reasons.append('C11-rankId')
-                    
-                    # Check C1: Scheme daily hours
-                    if slot_scheme == 'P' and slot_duration > 9.0:
-                        blocking_reasons.append('C1-scheme-hours')
-                    elif slot_scheme == 'B' and slot_duration > 13.0:
-                        blocking_reasons.append('C1-scheme-hours')
-                    elif slot_scheme == 'A' and slot_duration > 14.0:
-                        blocking_reasons.append('C1-scheme-hours')
-                
-                # Record violation with constraint info
-                constraint_id = blocking_reasons[0] if blocking_reasons else 'unknown'
+                constraint_id = diagnosis.get(slot_id, {}).get('primary', 'unknown')
                 score_book.hard(
                     f"hard-{constraint_id}",
                     f"Slot {slot_id} on {a.get('date')} for {a.get('demandId')} is unassigned"
@@ -654,10 +762,20 @@ def calculate_scores(ctx, assignments) -> tuple:
     assigned_slots = [a for a in assignments if a.get('status') == 'ASSIGNED']
     
     # ========== POST-SOLUTION CONSTRAINT VALIDATION ==========
-    from context.engine.time_utils import split_shift_hours
+    from context.engine.time_utils import shape_of
     from collections import defaultdict
     from datetime import datetime
     
+    # Hour breakdowns are looked up from the slot's interned ShiftShape (tenths of hours)
+    slots_by_id = {s.slot_id: s for s in ctx.get('slots', [])}
+    
+    def assignment_shape(a):
+        slot = slots_by_id.get(a.get('slotId'))
+        if slot is not None:
+            return slot.shape
+        return shape_of(datetime.fromisoformat(a.get('startDateTime')),
+                        datetime.fromisoformat(a.get('endDateTime')))
+    
     # Aggregate assignments by employee and date (only assigned slots)
     emp_assignments_by_date = defaultdict(list)  # (emp_id, date) -> [assignments]
     emp_assignments_by_week = defaultdict(list)  # (emp_id, week) -> [assignments]
@@ -690,47 +808,32 @@ def calculate_scores(ctx, assignments) -> tuple:
         scheme = emp.get('scheme', 'A')
         max_gross = max_gross_by_scheme.get(scheme, 14)
         
-        daily_gross = 0
-        for a in day_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            daily_gross += hours_dict['gross']
+        daily_gross = sum(assignment_shape(a).gross for a in day_assignments)  # tenths
         
-        if daily_gross > max_gross:
+        if daily_gross > max_gross * 10:
             score_book.hard(
                 "C1",
-                f"{emp_id} on {date_str}: {daily_gross}h exceeds scheme {scheme} limit ({max_gross}h)"
+                f"{emp_id} on {date_str}: {daily_gross / 10}h exceeds scheme {scheme} limit ({max_gross}h)"
             )
     
     # ========== C2a CHECK: Weekly Normal Hours (44h cap) ==========
     for (emp_id, week_key), week_assignments in emp_assignments_by_week.items():
-        weekly_normal = 0
-        for a in week_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            weekly_normal += hours_dict['normal']
+        weekly_normal = sum(assignment_shape(a).normal for a in week_assignments)  # tenths
         
-        if weekly_normal > 44.0:
+        if weekly_normal > 440:
             score_book.hard(
                 "C2",
-                f"{emp_id} in {week_key}: {weekly_normal:.1f}h exceeds 44h weekly normal cap"
+                f"{emp_id} in {week_key}: {weekly_normal / 10:.1f}h exceeds 44h weekly normal cap"
             )
     
     # ========== C17 CHECK: Monthly OT Hours (72h cap) ==========
     for (emp_id, month_key), month_assignments in emp_assignments_by_month.items():
-        monthly_ot = 0
-        for a in month_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            monthly_ot += hours_dict['ot']
+        monthly_ot = sum(assignment_shape(a).ot for a in month_assignments)  # tenths
         
-        if monthly_ot > 72.0:
+        if monthly_ot > 720:
             score_book.hard(
                 "C17",
-                f"{emp_id} in {month_key}: {monthly_ot:.1f}h OT exceeds 72h monthly cap"
+                f"{emp_id} in {month_key}: {monthly_ot / 10:.1f}h OT exceeds 72h monthly cap"
             )
     
     # ========== C3 CHECK: Max Consecutive Working Days (≤12) ==========
@@ -826,12 +929,7 @@ def calculate_scores(ctx, assignments) -> tuple:
         working_days = len(set((a.get('date') for a in week_assignments)))
         
         # Calculate normal hours
-        weekly_normal = 0
-        for a in week_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            weekly_normal += hours_dict['normal']
+        weekly_normal = sum(assignment_shape(a).normal for a in week_assignments) / 10
         
         limit = 34.98 if working_days <= 4 else 29.98
         if weekly_normal > limit:
@@ -1054,7 +1152,9 @@ def calculate_scores(ctx, assignments) -> tuple:
                     "demandId": a.get('demandId'),
                     "date": a.get('date'),
                     "shiftCode": a.get('shiftCode'),
-                    "reason": a.get('reason', 'No feasible assignment')
+                    "reason": a.get('reason', 'No feasible assignment'),
+                    "blockingConstraints": diagnosis.get(a.get('slotId'), {}).get('blocking', []),
+                    "residualEmployees": diagnosis.get(a.get('slotId'), {}).get('residual', [])
                 }
                 for a in assignments if a.get('status') == 'UNASSIGNED'
             ]
@@ -1091,21 +1191,94 @@ def solve(ctx):
     print(f"[SOLVER STARTING]")
     print(f"{'='*80}\n")
     
-    model = build_model(ctx)
-    apply_constraints(model, ctx)
+    ctx['phase_timings'] = phase_timings = {}
+    ctx['model_stats'] = model_stats = []
+    profile_phase = phase_context(ctx)  # no-op unless ctx['profiler'] is set
+    
+    # Hopeless inputs: skip the model when full coverage is provably impossible
+    capacity = None
+    if ctx.get('capacityFastFail'):
+        with metrics.timed("capacity", phase_timings):
+            capacity = analyze_capacity(ctx)
+        if capacity['shortfall'] > 0:
+            return capacity_fast_fail(ctx, capacity, start_time, start_timestamp)
+    
+    build_start = time.perf_counter()
+    with profile_phase("build_model"):
+        model = build_model(ctx, capacity)
+    num_vars, num_constraints = model_size(model)
+    model_stats.append({
+        "module": "build_model",
+        "vars": num_vars,
+        "constraints": num_constraints,
+        "buildMs": round((time.perf_counter() - build_start) * 1000, 1),
+    })
+    with profile_phase("constraints"):
+        apply_constraints(model, ctx)
+    
+    # Per-day matchings: coverage bound, CP-SAT hints and the timeout fallback
+    matching = None
+    if ctx.get('slotMatching', True):
+        with profile_phase("matching"), metrics.timed("matching", phase_timings):
+            matching = match_slots(ctx)
+            hinted = add_matching_hints(model, ctx, matching)
+        print(f"[solve] Hinted {hinted} variables from the matching roster\n")
+    
+    return solve_model(ctx, model, start_time, start_timestamp, matching=matching)
+
+
+def solve_model(ctx, model, start_time=None, start_timestamp=None, keep_slot=None, matching=None):
+    """
+    Solve an already built model and report it like solve().
+    
+    Runs CP-SAT, extracts assignments and scores them. Shared by solve() and
+    CompiledModel, which re-solves one model under different bounds.
+    
+    Args:
+        keep_slot: Optional predicate on assignment dicts; assignments it rejects
+            are dropped before scoring (CompiledModel's disabled demands)
+        matching: Optional match_slots() result; its bound is reported as the
+            coverage gap and its roster is returned when CP-SAT stops without
+            a solution (UNKNOWN)
+    
+    Returns:
+        Tuple of (status_code, solver_result_dict, assignments_list, scores_dict)
+    """
+    start_time = time.time() if start_time is None else start_time
+    start_timestamp = start_timestamp or datetime.now().isoformat()
+    phase_timings = ctx.setdefault('phase_timings', {})
+    model_stats = ctx.setdefault('model_stats', [])
+    profile_phase = phase_context(ctx)
+    
+    num_vars, num_constraints = model_size(model)
+    metrics.record_model_size(num_vars, num_constraints)
     
     # Solve
     print(f"[solve] Running CP-SAT solver...")
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = ctx.get("timeLimit", 15)
-    status = solver.Solve(model)
+    # Optional pins for reproducible runs (benchmarks); CP-SAT defaults otherwise
+    if ctx.get("numWorkers") is not None:
+        solver.parameters.num_workers = ctx["numWorkers"]
+    if ctx.get("randomSeed") is not None:
+        solver.parameters.random_seed = ctx["randomSeed"]
+    if ctx.get("deterministicTimeLimit") is not None:
+        solver.parameters.max_deterministic_time = ctx["deterministicTimeLimit"]
+    with profile_phase("cpsat_solve"), metrics.timed("cpsat_solve", phase_timings):
+        status = solver.Solve(model)
     
     print(f"[solve] Raw status code: {status} (OPTIMAL={cp_model.OPTIMAL}, FEASIBLE={cp_model.FEASIBLE}, INFEASIBLE={cp_model.INFEASIBLE}, MODEL_INVALID={cp_model.MODEL_INVALID})")
     
     # Extract assignments
     assignments = []
     if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        assignments = extract_assignments(ctx, solver)
+        with profile_phase("extract"), metrics.timed("extract", phase_timings):
+            assignments = extract_assignments(ctx, solver)
+            if keep_slot is not None:
+                assignments = [a for a in assignments if keep_slot(a)]
+        gap = metrics.objective_gap(solver)
+        metrics.OBJECTIVE_GAP.observe(gap)
+        metrics.LAST_OBJECTIVE_GAP.set(gap)
         print(f"[solve] Solution found with {len(assignments)} assignments")
         
         # Extract optimized rotation offsets if they were decision variables
@@ -1123,8 +1296,21 @@ def solve(ctx):
             ctx['optimized_offsets'] = optimized_offsets
             print(f"  ✓ Extracted {len(optimized_offsets)} optimized offsets\n")
     
+    # Without a CP-SAT solution, the matching roster is returned in its place
+    fallback = status == cp_model.UNKNOWN and matching is not None
+    if fallback:
+        print(f"[solve] No CP-SAT solution; using the matching roster")
+        assignments = matching_assignments(ctx, matching)
+        if keep_slot is not None:
+            assignments = [a for a in assignments if keep_slot(a)]
+        if not ctx.get('fixedRotationOffset', True) and 'offset_vars' in ctx:
+            ctx['optimized_offsets'] = {
+                emp_id: matching['offsets'].get(emp_id, 0) for emp_id in ctx['offset_vars']
+            }
+    
     # Calculate scores
-    hard_score, soft_score, violations, score_breakdown = calculate_scores(ctx, assignments)
+    with profile_phase("score"), metrics.timed("score", phase_timings):
+        hard_score, soft_score, violations, score_breakdown = calculate_scores(ctx, assignments)
     
     end_time = time.time()
     end_timestamp = datetime.now().isoformat()
@@ -1139,6 +1325,8 @@ def solve(ctx):
         4: "OPTIMAL"
     }
     solver_status = status_map.get(status, "UNKNOWN")  # type: ignore[arg-type]
+    if fallback and hard_score == 0:
+        solver_status = "FEASIBLE"  # the matching roster passed post-solution validation
     
     # Override status based on hard constraint violations
     # If there are unassigned slots (hard_score > 0), the solution is INFEASIBLE
@@ -1151,6 +1339,10 @@ def solve(ctx):
     print(f"[solve] Status: {solver_status}")
     print(f"{'='*80}\n")
     
+    metrics.SOLVE_SECONDS.observe(duration_seconds)
+    metrics.SOLVES_TOTAL.inc(status=solver_status)
+    metrics.CPSAT_STATUS_TOTAL.inc(status=solver.StatusName(status))
+    
     # Build solver result dict with scores
     solver_result = {
         "status_code": status,
@@ -1158,6 +1350,10 @@ def solve(ctx):
         "start_timestamp": start_timestamp,
         "end_timestamp": end_timestamp,
         "duration_seconds": round(duration_seconds, 3),
+        "time_limit_sec": ctx.get("timeLimit", 15),
+        "num_vars": num_vars,
+        "num_constraints": num_constraints,
+        "model_breakdown": model_stats,
         "scores": {
             "hard": hard_score,
             "soft": soft_score,
@@ -1169,9 +1365,88 @@ def solve(ctx):
     # Add optimized offsets to result if they were computed
     if 'optimized_offsets' in ctx:
         solver_result['optimizedRotationOffsets'] = ctx['optimized_offsets']
+    if ctx.get('capacity'):
+        solver_result['capacity'] = capacity_summary(ctx['capacity'])
+    if matching is not None:
+        assigned = len({a['slotId'] for a in assignments if a.get('employeeId')})
+        solver_result['coverage'] = coverage_report(assigned, matching, "matching" if fallback else "cpsat")
+        print(f"[solve] Coverage: {assigned} of at most {matching['upperBound']} fillable slots "
+              f"(gap {solver_result['coverage']['gap']})")
     
     return status, solver_result, assignments, violations
 
+
+def matching_assignments(ctx, matching) -> list:
+    """Assignment dicts of the matching roster (every other slot unassigned)."""
+    roster = matching['assignments']
+    slots = ctx.get('slots', [])
+    assigned_by_slot = {pos: [roster[slot.slot_id]] for pos, slot in enumerate(slots) if slot.slot_id in roster}
+    unassigned_slots = {pos for pos in range(len(slots)) if pos not in assigned_by_slot}
+    return assignment_records(ctx, assigned_by_slot, unassigned_slots)
+
+
+def capacity_fast_fail(ctx, capacity, start_time, start_timestamp):
+    """
+    solve()'s result when the capacity analysis proves full coverage impossible.
+    
+    No model is built or solved. The hard score is the proven minimum number
+    of unassigned slots; no roster is returned.
+    
+    Returns:
+        Tuple of (status_code, solver_result_dict, assignments_list, scores_dict)
+    """
+    score_book = ScoreBook(ctx.get('solverScoreConfig', {}))
+    for group in capacity['groups']:
+        score_book.hard(
+            "hard-capacity",
+            f"{group['unfillable']} of {group['required']} slots for {group['demandId']}/"
+            f"{group['requirementId']} on {group['date']} have no eligible employee"
+        )
+    for day in capacity['days']:
+        score_book.hard(
+            "hard-capacity",
+            f"At most {day['fillable']} of {day['required']} slots on {day['date']} can be filled"
+        )
+    hard_score = capacity['shortfall']
+    duration_seconds = time.time() - start_time
+    print(f"[solve] Capacity fast fail: at most {capacity['upperBound']} of "
+          f"{capacity['totalSlots']} slots can be filled; CP-SAT skipped")
+    print(f"[solve] Status: INFEASIBLE")
+    print(f"{'='*80}\n")
+    
+    metrics.SOLVE_SECONDS.observe(duration_seconds)
+    metrics.SOLVES_TOTAL.inc(status="INFEASIBLE")
+    
+    solver_result = {
+        "status_code": cp_model.INFEASIBLE,
+        "status": "INFEASIBLE",
+        "start_timestamp": start_timestamp,
+        "end_timestamp": datetime.now().isoformat(),
+        "duration_seconds": round(duration_seconds, 3),
+        "time_limit_sec": ctx.get("timeLimit", 15),
+        "num_vars": 0,
+        "num_constraints": 0,
+        "model_breakdown": [],
+        "scores": {
+            "hard": hard_score,
+            "soft": 0,
+            "overall": hard_score
+        },
+        "scoreBreakdown": {
+            "hard": {"violations": score_book.violations},
+            "soft": {"totalPenalty": 0, "details": []},
+            "unassignedSlots": {
+                "count": hard_score,
+                "total": capacity['totalSlots'],
+                "percentage": round(100 * hard_score / capacity['totalSlots'], 2),
+                "slots": []
+            }
+        },
+        "capacity": capacity_summary(capacity),
+        "fastFail": True
+    }
+    return cp_model.INFEASIBLE, solver_result, [], score_book.violations
+
 if __name__ == "__main__":
     ctx = load_input("../samples/input.sample.json")
     status, result, assignments, violations = solve(ctx)
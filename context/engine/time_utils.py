@@ -18,9 +18,13 @@ Examples:
   10:00-14:00 → gross=4,  lunch=0, normal=4,  ot=0  (4h short shift, no lunch)
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime, time
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 
+import numpy as np
+
 
 def span_hours(start_dt: datetime, end_dt: datetime) -> float:
     """Calculate gross hours between two datetimes.
@@ -147,6 +151,11 @@ def split_shift_hours(start_dt: datetime, end_dt: datetime) -> dict:
             'paid': 4.5
         }
     """
+    seconds = (end_dt - start_dt).total_seconds()
+    if seconds >= 0 and seconds % 60 == 0:
+        # Whole-minute shifts (the norm) are a lookup in the ShiftShape cache
+        return shift_shape(start_dt.hour * 60 + start_dt.minute, int(seconds // 60)).as_dict()
+    
     gross = span_hours(start_dt, end_dt)
     ln = lunch_hours(gross)
     normal, ot = split_normal_ot(gross)
@@ -160,6 +169,108 @@ def split_shift_hours(start_dt: datetime, end_dt: datetime) -> dict:
     }
 
 
+# ============ INTERNED SHIFT SHAPES ============
+
+@dataclass(frozen=True, slots=True)
+class ShiftShape:
+    """Immutable hour breakdown of one (start, duration) shift shape.
+    
+    A roster only has a handful of distinct shapes, so each is computed once
+    (see shift_shape) and every later hour calculation is a table lookup.
+    
+    Integer fields are in tenths of hours, the unit used by the CP-SAT hour
+    constraints (C2, C6, C17); as_dict() returns the float breakdown of
+    split_shift_hours.
+    
+    Attributes:
+        start_minute: Shift start in minutes after midnight
+        duration_minute: Shift duration in minutes
+        gross: Gross hours (tenths)
+        lunch: Lunch hours (tenths)
+        normal: Normal hours (tenths)
+        ot: OT hours (tenths)
+        paid: Paid hours (tenths)
+    """
+    start_minute: int
+    duration_minute: int
+    gross: int
+    lunch: int
+    normal: int
+    ot: int
+    paid: int
+    hours: Tuple[float, float, float, float, float] = field(repr=False)
+    
+    def as_dict(self) -> dict:
+        """Float breakdown {'gross', 'lunch', 'normal', 'ot', 'paid'} (new dict per call)."""
+        gross, ln, normal, ot, paid = self.hours
+        return {'gross': gross, 'lunch': ln, 'normal': normal, 'ot': ot, 'paid': paid}
+
+
+def _tenths(hours: float) -> int:
+    return int(round(hours * 10))
+
+
+@lru_cache(maxsize=None)
+def shift_shape(start_minute: int, duration_minute: int) -> ShiftShape:
+    """Return the interned ShiftShape for a shift starting at ``start_minute``.
+    
+    Args:
+        start_minute: Minutes after midnight (e.g., 480 for 08:00)
+        duration_minute: Shift duration in minutes (e.g., 720 for 12h)
+    
+    Returns:
+        Cached ShiftShape (same object for the same key)
+    
+    Examples:
+        shift_shape(480, 720) → gross=120, lunch=10, normal=80, ot=30 (12h day shift)
+    """
+    if duration_minute < 0:
+        raise ValueError(f"Shift duration {duration_minute} minutes is negative")
+    gross = round(duration_minute / 60.0, 2)
+    ln = lunch_hours(gross)
+    normal, ot = split_normal_ot(gross)
+    return ShiftShape(
+        start_minute=start_minute,
+        duration_minute=duration_minute,
+        gross=_tenths(gross),
+        lunch=_tenths(ln),
+        normal=_tenths(normal),
+        ot=_tenths(ot),
+        paid=_tenths(gross),
+        hours=(gross, ln, normal, ot, gross)
+    )
+
+
+def shape_of(start_dt: datetime, end_dt: datetime) -> ShiftShape:
+    """Return the ShiftShape of a shift given as datetimes (whole minutes)."""
+    minutes = int((end_dt - start_dt).total_seconds() // 60)
+    return shift_shape(start_dt.hour * 60 + start_dt.minute, minutes)
+
+
+def split_shift_hours_array(start_minutes, duration_minutes) -> Dict[str, np.ndarray]:
+    """Vectorised split_shift_hours over NumPy arrays of shift shapes.
+    
+    Each distinct (start, duration) pair is resolved once through the
+    ShiftShape cache and broadcast back to the inputs.
+    
+    Args:
+        start_minutes: Array of shift starts (minutes after midnight)
+        duration_minutes: Array of shift durations (minutes)
+    
+    Returns:
+        Dict of int64 arrays in tenths of hours: 'gross', 'lunch', 'normal', 'ot', 'paid'
+    """
+    pairs = np.stack([np.asarray(start_minutes, dtype=np.int64).ravel(),
+                      np.asarray(duration_minutes, dtype=np.int64).ravel()], axis=1)
+    unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    shapes = [shift_shape(int(start), int(duration)) for start, duration in unique_pairs]
+    return {
+        name: np.array([getattr(shape, name) for shape in shapes], dtype=np.int64)[inverse]
+        for name in ('gross', 'lunch', 'normal', 'ot', 'paid')
+    }
+
+
 def validate_shift_hours(start_dt: datetime, end_dt: datetime, max_gross_by_scheme: Optional[Dict] = None) -> dict:
     """Validate shift against scheme limits and return detailed breakdown.
     
@@ -0,0 +1,235 @@
+"""Unassigned Diagnosis - ranked blocking constraints per unassigned slot.
+
+Each open slot is tested against every employee, with the rest of the
+returned roster kept as it is. No model is solved. There are two kinds of
+rule:
+
+- Eligibility rules, read from the slot and the employee: the variable
+  filters in build_model, C7, C11, C12 preferred teams, the C1 scheme cap,
+  and rotation off days.
+- Roster rules, checked against the employee's other assignments: one slot
+  per day, C4 rest, C3 consecutive days, C2 weekly normal hours and C17
+  monthly OT.
+
+Each rule is checked for all employees of a slot at once (NumPy arrays).
+Rules are ranked by how many employees only they block, so relaxing that
+rule alone would free those employees. Ties go to the rule that blocks more
+employees. Employees that no rule blocks are listed as residual. A rule that
+spans several slots (such as C9 gender mix) or the time limit kept them out.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from .slot_matching import (
+    MAX_CONSECUTIVE_DAYS,
+    MAX_GROSS_MINUTES_BY_SCHEME,
+    MAX_MONTHLY_OT_TENTHS,
+    MAX_WEEKLY_NORMAL_TENTHS,
+    min_rest_minutes,
+)
+
+# Rule IDs in check order (ties in the ranking keep this order)
+RULES = (
+    'C9-gender',
+    'scheme',
+    'S16-whitelist',
+    'S16-blacklist',
+    'C12-preferredTeams',
+    'C11-rankId',
+    'C7-qualification',
+    'C1-scheme-hours',
+    'rotation-offday',
+    'one-slot-per-day',
+    'C4-rest',
+    'C3-consecutive-days',
+    'C2-weekly-hours',
+    'C17-monthly-ot',
+)
+
+# Residual employee IDs listed per slot
+RESIDUAL_LIMIT = 10
+
+
+def _expiry_ordinals(emp: Dict) -> Dict[str, int]:
+    """Qualification code -> expiry date ordinal (unparseable expiries are left out)."""
+    expiries = {}
+    for qual in list(emp.get('licenses', [])) + list(emp.get('qualifications', [])):
+        try:
+            expiries[qual['code']] = datetime.strptime(qual['expiryDate'], '%Y-%m-%d').date().toordinal()
+        except (KeyError, ValueError, TypeError):
+            continue
+    return expiries
+
+
+class _Roster:
+    """Per-employee, per-day view of the returned roster (arrays of shape employees x days)."""
+
+    def __init__(self, assignments: List[Dict], emp_index: Dict[str, int], slots_by_id: Dict, first_day: int, num_days: int):
+        self.first_day = first_day
+        self.start = np.full((len(emp_index), num_days), -1, dtype=np.int32)
+        self.end = np.full((len(emp_index), num_days), -1, dtype=np.int32)
+        day_dates = [datetime.fromordinal(first_day + d).date() for d in range(num_days)]
+        weeks = {key: i for i, key in enumerate(dict.fromkeys(d.isocalendar()[:2] for d in day_dates))}
+        months = {key: i for i, key in enumerate(dict.fromkeys((d.year, d.month) for d in day_dates))}
+        self.week_of = np.array([weeks[d.isocalendar()[:2]] for d in day_dates])
+        self.month_of = np.array([months[(d.year, d.month)] for d in day_dates])
+        self.week_normal = np.zeros((len(emp_index), len(weeks)), dtype=np.int32)
+        self.month_ot = np.zeros((len(emp_index), len(months)), dtype=np.int32)
+
+        for a in assignments:
+            emp = emp_index.get(a.get('employeeId'))
+            slot = slots_by_id.get(a.get('slotId'))
+            if emp is None or slot is None or a.get('status') != 'ASSIGNED':
+                continue
+            d = slot.day - first_day
+            self.start[emp, d] = slot.start_min
+            self.end[emp, d] = slot.end_min
+            self.week_normal[emp, self.week_of[d]] += slot.shape.normal
+            self.month_ot[emp, self.month_of[d]] += slot.shape.ot
+
+        # Consecutive worked days ending at / starting from each day
+        worked = self.start >= 0
+        self.worked = worked
+        self.run_before = np.zeros(worked.shape, dtype=np.int32)
+        self.run_after = np.zeros(worked.shape, dtype=np.int32)
+        for d in range(num_days):
+            previous = self.run_before[:, d - 1] if d else 0
+            self.run_before[:, d] = np.where(worked[:, d], previous + 1, 0)
+        for d in reversed(range(num_days)):
+            following = self.run_after[:, d + 1] if d + 1 < num_days else 0
+            self.run_after[:, d] = np.where(worked[:, d], following + 1, 0)
+
+    def blocks(self, slot, min_rest: int) -> Dict[str, np.ndarray]:
+        """Roster rules that keep each employee from also taking ``slot``."""
+        d = slot.day - self.first_day
+        num_days = self.worked.shape[1]
+        no_rest = np.zeros(self.worked.shape[0], dtype=bool)
+        if d > 0:
+            prev_worked = self.worked[:, d - 1]
+            no_rest |= prev_worked & (slot.start_min + 1440 - self.end[:, d - 1] < min_rest)
+        if d + 1 < num_days:
+            next_worked = self.worked[:, d + 1]
+            no_rest |= next_worked & (self.start[:, d + 1] + 1440 - slot.end_min < min_rest)
+        none = np.zeros(self.worked.shape[0], dtype=np.int32)
+        before = self.run_before[:, d - 1] if d > 0 else none
+        after = self.run_after[:, d + 1] if d + 1 < num_days else none
+        shape = slot.shape
+        return {
+            'one-slot-per-day': self.worked[:, d],
+            'C4-rest': no_rest,
+            'C3-consecutive-days': before + 1 + after > MAX_CONSECUTIVE_DAYS,
+            'C2-weekly-hours': self.week_normal[:, self.week_of[d]] + shape.normal > MAX_WEEKLY_NORMAL_TENTHS,
+            'C17-monthly-ot': self.month_ot[:, self.month_of[d]] + shape.ot > MAX_MONTHLY_OT_TENTHS,
+        }
+
+
+def explain_unassigned(ctx: Dict, assignments: List[Dict]) -> Dict[str, Dict]:
+    """
+    Ranked blocking constraints of every unassigned slot.
+
+    Args:
+        ctx: Context after build_model (slots, employees, constraintList, capacity)
+        assignments: Assignment dicts of the returned roster
+
+    Returns:
+        slot_id -> {primary, blocking, residual, employees}. blocking lists
+        {constraint, blocked, sole} with the most decisive rule first. primary
+        is 'capacity' for slots the capacity analysis fixed or slots with no
+        employees, 'residual' if an employee passes every rule, and the top
+        ranked rule otherwise.
+    """
+    slots_by_id = {slot.slot_id: slot for slot in ctx.get('slots', [])}
+    open_slots = [slots_by_id[a['slotId']] for a in assignments
+                  if a.get('status') == 'UNASSIGNED' and a.get('slotId') in slots_by_id]
+    if not open_slots:
+        return {}
+    diagnosis_start = time.perf_counter()
+
+    employees = ctx.get('employees', [])
+    emp_ids = np.array([emp.get('employeeId') for emp in employees], dtype=object)
+    emp_index = {emp_id: i for i, emp_id in enumerate(emp_ids)}
+    genders = np.array([emp.get('gender', 'Unknown') for emp in employees], dtype=object)
+    schemes = np.array([emp.get('scheme', '') for emp in employees], dtype=object)
+    ranks = np.array([emp.get('rankId', 'UNKNOWN') for emp in employees], dtype=object)
+    teams = np.array([emp.get('teamId') for emp in employees], dtype=object)
+    gross_caps = np.array([MAX_GROSS_MINUTES_BY_SCHEME.get(s, 14 * 60) for s in schemes], dtype=np.int32)
+    expiries = [_expiry_ordinals(emp) for emp in employees]
+    # Solved offsets when CP-SAT chose them, else the input offsets
+    offset_by_emp = ctx.get('optimized_offsets') or {}
+    offsets = np.array([offset_by_emp.get(emp.get('employeeId'), emp.get('rotationOffset', 0) or 0)
+                        for emp in employees], dtype=np.int64)
+
+    all_days = [slot.day for slot in slots_by_id.values()]
+    first_day = min(all_days)
+    roster = _Roster(assignments, emp_index, slots_by_id, first_day, max(all_days) - first_day + 1)
+    min_rest = min_rest_minutes(ctx)
+    capacity_fixed = set((ctx.get('capacity') or {}).get('fixedSlotIds', ()))
+
+    report = {}
+    for slot in open_slots:
+        none = np.zeros(len(employees), dtype=bool)
+        blocks = dict.fromkeys(RULES, none)
+        if slot.genderRequirement in ('M', 'F'):
+            blocks['C9-gender'] = genders != slot.genderRequirement
+        if slot.schemeRequirement != 'Global':
+            blocks['scheme'] = schemes != slot.schemeRequirement
+        whitelist = slot.whitelist
+        if any(whitelist.get(k) for k in ('employeeIds', 'teamIds')):
+            blocks['S16-whitelist'] = ~(np.isin(emp_ids, list(whitelist.get('employeeIds') or []))
+                                        | np.isin(teams, list(whitelist.get('teamIds') or [])))
+        blacklisted = []
+        for entry in (slot.blacklist or {}).get('employeeIds', []):
+            try:
+                start = datetime.fromisoformat(entry.get('blacklistStartDate', '')).date().toordinal()
+                end = datetime.fromisoformat(entry.get('blacklistEndDate', '')).date().toordinal()
+            except ValueError:
+                continue  # unparseable range: build_model allows the assignment too
+            if start <= slot.day <= end:
+                blacklisted.append(entry.get('employeeId'))
+        if blacklisted:
+            blocks['S16-blacklist'] = np.isin(emp_ids, blacklisted)
+        if slot.preferredTeams:
+            blocks['C12-preferredTeams'] = ~np.isin(teams, list(slot.preferredTeams))
+        blocks['C11-rankId'] = ranks != slot.rankId
+        if slot.requiredQualifications:
+            blocks['C7-qualification'] = np.array([
+                any(held.get(code, -1) < slot.day for code in slot.requiredQualifications)
+                for held in expiries
+            ], dtype=bool)
+        blocks['C1-scheme-hours'] = slot.duration_min > gross_caps
+        if slot.rotationSequence and slot.coverageAnchor:
+            sequence = np.array(slot.rotationSequence, dtype=object)
+            days_from_base = slot.day - slot.coverageAnchor.toordinal()
+            blocks['rotation-offday'] = sequence[(days_from_base - offsets) % len(sequence)] == 'O'
+        blocks.update(roster.blocks(slot, min_rest))
+
+        matrix = np.vstack([blocks[rule] for rule in RULES]) if len(employees) else np.zeros((len(RULES), 0), dtype=bool)
+        blocked = matrix.sum(axis=1)
+        sole = (matrix & (matrix.sum(axis=0) == 1)).sum(axis=1)
+        ranked = sorted((i for i in range(len(RULES)) if blocked[i]), key=lambda i: (-sole[i], -blocked[i], i))
+        residual = emp_ids[~matrix.any(axis=0)].tolist()
+
+        if slot.slot_id in capacity_fixed or not len(employees):
+            primary = 'capacity'
+        elif residual:
+            primary = 'residual'
+        else:
+            primary = RULES[ranked[0]]
+        report[slot.slot_id] = {
+            "primary": primary,
+            "blocking": [
+                {"constraint": RULES[i], "blocked": int(blocked[i]), "sole": int(sole[i])}
+                for i in ranked
+            ],
+            "residual": residual[:RESIDUAL_LIMIT],
+            "employees": len(employees),
+        }
+
+    duration_ms = round((time.perf_counter() - diagnosis_start) * 1000, 1)
+    print(f"[unassigned_diagnosis] Explained {len(report)} unassigned slots "
+          f"against {len(employees)} employees in {duration_ms}ms")
+    return report
@@ -12,10 +12,13 @@ Or production:
 """
 
 import os
+import re
 import sys
+import asyncio
 import json
 import uuid
 import time
+import zlib
 import logging
 import pathlib
 from typing import Optional
@@ -25,18 +28,33 @@ from datetime import datetime
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 from fastapi import FastAPI, File, UploadFile, Query, HTTPException, Request
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse, PlainTextResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
 
 from context.engine.data_loader import load_input
 from context.engine.solver_engine import solve
-from context.engine.config_optimizer import optimize_all_requirements, format_output_config
+from context.engine import metrics
+from context.engine.profiling import PhaseProfiler, phase_context, profiling_enabled_by_env
+from context.engine.config_optimizer import CONFIG_MODES, optimize_all_requirements, format_output_config
+from src.roster_pipeline import OFFSET_MODES, prepare_pipeline, solve_pipeline
 from src.models import (
     SolveRequest, SolveResponse, HealthResponse, 
     Score, SolverRunMetadata, Meta, Violation
 )
-from src.output_builder import build_output
+from src.output_builder import (
+    build_output, iter_output_ndjson, build_matrix_output, project_assignments,
+    parse_fields, NDJSON_MEDIA_TYPE, OUTPUT_FORMATS
+)
+from src.output_store import OutputStore
 
 # ============================================================================
 # LOGGING SETUP
@@ -67,6 +85,157 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
         response.headers["X-Request-ID"] = request_id
         return response
 
+# ============================================================================
+# MIDDLEWARE: REQUEST BODY DECOMPRESSION + SIZE CAP
+# ============================================================================
+
+# Largest request body accepted, after decompression (default 100 MB)
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(100 * 1024 * 1024)))
+
+# Responses smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+def _make_decompressor(encoding: str):
+    """Return a streaming decompressor for a Content-Encoding, or None if unsupported."""
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        # zlib-wrapped deflate (RFC 9110); raw deflate is handled on first chunk
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+
+def _has_zlib_header(data: bytes) -> bool:
+    """True if data starts with a valid zlib (RFC 1950) header."""
+    return len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+
+
+def _decompress_chunk(decompressor, data: bytes, remaining: int) -> bytes:
+    """Decompress one chunk without ever producing more than remaining + 1 bytes."""
+    if hasattr(decompressor, "unconsumed_tail"):
+        out = []
+        produced = 0
+        while data:
+            part = decompressor.decompress(data, remaining - produced + 1)
+            produced += len(part)
+            out.append(part)
+            if produced > remaining:
+                raise _BodyTooLarge()
+            data = decompressor.unconsumed_tail
+        return b"".join(out)
+    # zstandard decompressobj has no output bound; check after each chunk
+    part = decompressor.decompress(data)
+    if len(part) > remaining:
+        raise _BodyTooLarge()
+    return part
+
+
+class RequestDecompressionMiddleware:
+    """
+    Transparently decode `Content-Encoding: gzip | deflate | zstd` request bodies.
+
+    The body is decompressed incrementally as it arrives and the decoded
+    size is capped at max_body_size (413 once exceeded, so a compression bomb
+    never materialises). The app then sees a plain body with the encoding
+    header removed. Uncompressed bodies with a Content-Length above the cap
+    are rejected up front; chunked uncompressed bodies are counted as they
+    are read.
+    """
+
+    def __init__(self, app, max_body_size: int = MAX_REQUEST_BODY_BYTES):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope["headers"])
+        encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+        content_length = headers.get(b"content-length")
+        
+        if encoding in ("", "identity"):
+            if content_length is not None and int(content_length) > self.max_body_size:
+                await self._reject(scope, receive, send, 413, "Request body too large.")
+                return
+            if content_length is not None:
+                await self.app(scope, receive, send)
+                return
+        
+        decompressor = None
+        if encoding not in ("", "identity"):
+            decompressor = _make_decompressor(encoding)
+            if decompressor is None:
+                await self._reject(scope, receive, send, 415, f"Unsupported Content-Encoding: {encoding}")
+                return
+        
+        # Read (and decode) the body chunk by chunk under the size cap
+        chunks = []
+        size = 0
+        try:
+            more_body = True
+            first = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                data = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if decompressor is not None and data:
+                    if first and encoding == "deflate" and not _has_zlib_header(data):
+                        # Raw deflate stream without the zlib header
+                        decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+                    first = False
+                    data = _decompress_chunk(decompressor, data, self.max_body_size - size)
+                size += len(data)
+                if size > self.max_body_size:
+                    raise _BodyTooLarge()
+                chunks.append(data)
+            if decompressor is not None and hasattr(decompressor, "flush"):
+                tail = decompressor.flush()
+                size += len(tail)
+                if size > self.max_body_size:
+                    raise _BodyTooLarge()
+                chunks.append(tail)
+        except _BodyTooLarge:
+            await self._reject(scope, receive, send, 413, "Request body too large.")
+            return
+        except (zlib.error, ValueError, getattr(zstandard, "ZstdError", ValueError)) as e:
+            await self._reject(scope, receive, send, 400, f"Malformed {encoding} request body: {e}")
+            return
+        
+        body = b"".join(chunks)
+        chunks.clear()
+        scope = dict(scope)
+        scope["headers"] = [
+            (k, v) for k, v in scope["headers"]
+            if k not in (b"content-encoding", b"content-length", b"transfer-encoding")
+        ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+        
+        sent = False
+        
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        await self.app(scope, replay, send)
+
+    @staticmethod
+    async def _reject(scope, receive, send, status_code: int, detail: str):
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
+
 # ============================================================================
 # FASTAPI APP
 # ============================================================================
@@ -81,6 +250,24 @@ app = FastAPI(
 
 # Add middleware
 app.add_middleware(RequestIdMiddleware)
+app.add_middleware(RequestDecompressionMiddleware, max_body_size=MAX_REQUEST_BODY_BYTES)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=6)
+
+# Re-validate /solve responses through SolveResponse (debug aid; off by default,
+# also enabled per request with strict=1)
+VALIDATE_RESPONSE = os.getenv("SOLVE_VALIDATE_RESPONSE", "0").lower() in ("1", "true", "yes")
+
+# Solves run in the threadpool, at most SOLVE_CONCURRENCY at a time; the rest
+# queue here (ngrs_solve_queue_depth) while the event loop stays responsive
+SOLVE_CONCURRENCY = int(os.getenv("SOLVE_CONCURRENCY", "1"))
+solve_semaphore = asyncio.Semaphore(SOLVE_CONCURRENCY)
+
+# Profiling (?profile=1 or SOLVER_PROFILE=1) writes .pstats files here,
+# downloadable from /profiles/{name}
+PROFILE_DIR = pathlib.Path(os.getenv("PROFILE_DIR", "output/profiles"))
+
+# Background writer for solve outputs (see src/output_store.py for OUTPUT_* env)
+output_store = OutputStore.from_env()
 
 # Add CORS
 cors_origins = os.getenv(
@@ -100,11 +287,46 @@ app.add_middleware(
 # HELPER FUNCTIONS
 # ============================================================================
 
-async def load_json_from_upload(file: UploadFile) -> dict:
-    """Load and parse JSON from uploaded file."""
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+async def load_json_from_upload(file: UploadFile, max_size: int = None) -> dict:
+    """
+    Load and parse JSON from uploaded file.
+    
+    The upload is read in chunks and rejected with 413 once it exceeds
+    max_size (default MAX_REQUEST_BODY_BYTES). Gzip-compressed uploads
+    (e.g. input.json.gz) are decompressed on the fly under the same cap.
+    """
+    max_size = MAX_REQUEST_BODY_BYTES if max_size is None else max_size
     try:
-        raw = await file.read()
+        if file.size is not None and file.size > max_size and not (file.filename or "").endswith(".gz"):
+            raise _BodyTooLarge()
+        chunks = []
+        size = 0
+        decompressor = None
+        first = True
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if first:
+                first = False
+                if chunk[:2] == b"\x1f\x8b":
+                    decompressor = _make_decompressor("gzip")
+            if decompressor is not None:
+                chunk = _decompress_chunk(decompressor, chunk, max_size - size)
+            size += len(chunk)
+            if size > max_size:
+                raise _BodyTooLarge()
+            chunks.append(chunk)
+        raw = b"".join(chunks)
         return json.loads(raw)
+    except _BodyTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploaded file exceeds the {max_size} byte limit."
+        )
     except json.JSONDecodeError as e:
         raise HTTPException(
             status_code=422,
@@ -174,6 +396,77 @@ def get_input_json(request_obj: Optional[SolveRequest], uploaded_file_json: Opti
     return input_json, warnings
 
 
+def build_solve_response(output_dict: dict, validate: bool = False) -> ORJSONResponse:
+    """
+    Serialise an already-built output dict straight to an ORJSONResponse.
+
+    Returning a Response instance bypasses FastAPI's response_model pass, so
+    large assignment lists are not copied through Pydantic twice. With
+    validate=True the dict is checked against SolveResponse first.
+    """
+    if validate:
+        SolveResponse.model_validate(output_dict)
+    return ORJSONResponse(content=output_dict)
+
+
+def stream_solve_response(input_json, ctx, status_code, solver_result, assignments, violations,
+                          request_id, warnings, start_time, fields=None,
+                          profile=None) -> StreamingResponse:
+    """
+    Stream a solve result as NDJSON: header, assignment lines, trailer.
+
+    The output file is queued once the trailer has been sent.
+    """
+    def on_complete(output_dict):
+        try:
+            output_store.save(
+                output_dict, request_id=request_id,
+                input_hash=output_dict["meta"].get("inputHash"),
+            ).add_done_callback(_log_save_failure)
+        except Exception as e:
+            logger.warning("Failed to queue output file: %s", str(e))
+        logger.info(
+            "solve requestId=%s status=%s hard=%s soft=%s assignments=%s durMs=%s stream=ndjson",
+            request_id,
+            output_dict["solverRun"]["status"],
+            output_dict["score"]["hard"],
+            output_dict["score"]["soft"],
+            len(assignments),
+            int((time.perf_counter() - start_time) * 1000)
+        )
+
+    body = iter_output_ndjson(
+        input_json, ctx, status_code, solver_result, assignments, violations,
+        meta_extra={"requestId": request_id, "warnings": warnings,
+                    **({"profile": profile} if profile is not None else {})},
+        on_complete=on_complete,
+        fields=fields,
+    )
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE)
+
+
+async def run_solve(ctx, solver=solve):
+    """Run solve() (or ``solver``) off the event loop, bounded by SOLVE_CONCURRENCY."""
+    metrics.SOLVE_QUEUE_DEPTH.inc()
+    try:
+        await solve_semaphore.acquire()
+    finally:
+        metrics.SOLVE_QUEUE_DEPTH.dec()
+    metrics.SOLVES_IN_FLIGHT.inc()
+    try:
+        return await run_in_threadpool(solver, ctx)
+    finally:
+        metrics.SOLVES_IN_FLIGHT.dec()
+        solve_semaphore.release()
+
+
+def _log_save_failure(future):
+    """Log background output write failures (they no longer reach the request)."""
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Failed to save output file: %s", str(exc))
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -184,6 +477,18 @@ async def health():
     return HealthResponse(status="ok")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus text exposition of in-process solver metrics.
+    
+    Per-phase timings (slot_build, variables, base_model, constraints and
+    each constraint module, cpsat_solve, extract, score, output_build),
+    model size, CP-SAT status, objective gap, queue depth and in-flight solves.
+    """
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/version")
 async def get_version():
     """Get API and solver version information."""
@@ -202,6 +507,9 @@ async def solve_endpoint(
     time_limit: int = Query(15, ge=1, le=120),
     strict: int = Query(0, ge=0, le=1),
     validate: int = Query(0, ge=0, le=1),
+    output_format: str = Query("standard", alias="format"),
+    fields: Optional[str] = Query(None),
+    profile: int = Query(0, ge=0, le=1),
 ):
     """
     Solve a scheduling problem.
@@ -212,8 +520,20 @@ async def solve_endpoint(
     
     Query parameters:
     - time_limit: Max solve time in seconds (1-120, default 15)
-    - strict: If 1, error if both body and file provided (default 0)
+    - strict: If 1, error if both body and file provided and validate the
+      response against SolveResponse (default 0)
     - validate: If 1, validate input against schema (default 0)
+    - format: "standard" (default) or "matrix" (employee × date shift-code
+      grid plus a list of unassigned slots)
+    - fields: Comma-separated assignment fields to return in the standard
+      format, e.g. fields=employeeId,date,shiftCode
+    - profile: If 1 (or SOLVER_PROFILE=1), profile each solve phase with
+      cProfile/tracemalloc; results go to meta.profile and the .pstats
+      files can be fetched from /profiles/{name}
+    
+    Send `Accept: application/x-ndjson` (standard format) to stream the result as NDJSON:
+    a header line (solverRun, score), one line per assignment, then a
+    trailer line (scoreBreakdown, unmetDemand, meta).
     
     Returns:
     - 200: Solution found (regardless of solver status)
@@ -225,8 +545,16 @@ async def solve_endpoint(
     request_id = request.state.request_id
     start_time = time.perf_counter()
     warnings = []
+    profiler = None
     
     try:
+        if output_format not in OUTPUT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown format '{output_format}'; expected one of {', '.join(OUTPUT_FORMATS)}."
+            )
+        assignment_fields = parse_fields(fields)
+        
         # ====== PARSE INPUT ======
         # Extract raw body JSON to support both wrapped and raw formats
         raw_body_json = None
@@ -260,6 +588,8 @@ async def solve_endpoint(
         # ====== LOAD DATA ======
         ctx = load_input(input_json)
         ctx["timeLimit"] = time_limit
+        if profile or profiling_enabled_by_env():
+            profiler = ctx["profiler"] = PhaseProfiler(dump_dir=PROFILE_DIR, run_id=request_id[:8])
         
         # ====== OPTIONAL: SCHEMA VALIDATION ======
         if validate:
@@ -268,27 +598,40 @@ async def solve_endpoint(
             pass
         
         # ====== SOLVE ======
-        status_code, solver_result, assignments, violations = solve(ctx)
+        status_code, solver_result, assignments, violations = await run_solve(ctx)
+        
+        # ====== STREAMING (NDJSON) OUTPUT ======
+        if output_format == "standard" and NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            return stream_solve_response(
+                input_json, ctx, status_code, solver_result, assignments, violations,
+                request_id=request_id, warnings=warnings, start_time=start_time,
+                fields=assignment_fields,
+                profile=profiler.report() if profiler is not None else None,
+            )
         
         # ====== BUILD OUTPUT ======
-        output_dict = build_output(
-            input_json, ctx, status_code, solver_result, assignments, violations
-        )
+        with phase_context(ctx)("output_build"), metrics.timed("output_build"):
+            output_dict = build_output(
+                input_json, ctx, status_code, solver_result, assignments, violations
+            )
         
         # ====== ENRICH RESPONSE ======
         output_dict["meta"]["requestId"] = request_id
         output_dict["meta"]["warnings"] = warnings
+        if profiler is not None:
+            output_dict["meta"]["profile"] = profiler.report()
         
         # ====== SAVE OUTPUT TO FILE ======
+        # Queued on the store's background thread; never blocks the response
         try:
-            timestamp = datetime.now().strftime("%d%m_%H%M")
-            outfile_name = f"output_{timestamp}.json"
-            outfile_path = pathlib.Path("output") / outfile_name
-            outfile_path.parent.mkdir(parents=True, exist_ok=True)
-            outfile_path.write_text(json.dumps(output_dict, indent=2), encoding="utf-8")
-            logger.info("solve output saved to %s", outfile_path)
+            save_future = output_store.save(
+                output_dict,
+                request_id=request_id,
+                input_hash=output_dict["meta"].get("inputHash"),
+            )
+            save_future.add_done_callback(_log_save_failure)
         except Exception as e:
-            logger.warning("Failed to save output file: %s", str(e))
+            logger.warning("Failed to queue output file: %s", str(e))
         
         # ====== LOG ======
         elapsed_ms = int((time.perf_counter() - start_time) * 1000)
@@ -302,7 +645,13 @@ async def solve_endpoint(
             elapsed_ms
         )
         
-        return SolveResponse(**output_dict)
+        # The saved file above always holds the full standard output
+        if output_format == "matrix":
+            return ORJSONResponse(content=build_matrix_output(output_dict, ctx))
+        return build_solve_response(
+            project_assignments(output_dict, assignment_fields),
+            validate=bool(strict) or VALIDATE_RESPONSE,
+        )
     
     except HTTPException:
         raise
@@ -318,6 +667,19 @@ async def solve_endpoint(
             exc_info=True
         )
         raise HTTPException(status_code=500, detail=error_msg)
+    
+    finally:
+        if profiler is not None:
+            profiler.close()
+
+
+@app.get("/profiles/{name}")
+async def get_profile(name: str):
+    """Download a .pstats profile written by a ?profile=1 solve."""
+    path = PROFILE_DIR / name
+    if not re.fullmatch(r"profile_[\w-]+\.pstats", name) or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Profile not found: {name}")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
 
 
 @app.get("/schema")
@@ -342,6 +704,8 @@ async def get_schemas():
 async def configure_endpoint(
     request: Request,
     file: Optional[UploadFile] = File(None),
+    mode: str = Query("heuristic"),
+    joint: int = Query(0, ge=0, le=1),
 ):
     """
     Configuration Optimizer: Find optimal work patterns and staffing.
@@ -355,6 +719,13 @@ async def configure_endpoint(
     - JSON body: {"requirements": [...], "constraints": {...}, "planningHorizon": {...}}
     - Uploaded file: multipart/form-data with file field
     
+    Query parameters:
+    - mode: "heuristic" (default) or "exact" (CP-SAT, provably minimal staffing)
+    - joint: 1 = requirements with the same product, rank, scheme and shifts
+      may share one employee pool
+    
+    Requirements are optimised in CONFIG_WORKERS processes (default 1).
+    
     Returns:
     - 200: Optimized configuration with recommendations
     - 400: Invalid input
@@ -365,6 +736,12 @@ async def configure_endpoint(
     request_id = request.state.request_id
     start_time = time.perf_counter()
     
+    if mode not in CONFIG_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode '{mode}'; expected one of: {', '.join(CONFIG_MODES)}"
+        )
+    
     try:
         # ====== PARSE INPUT ======
         raw_body_json = None
@@ -408,7 +785,9 @@ async def configure_endpoint(
         optimized_result = optimize_all_requirements(
             requirements=config_input["requirements"],
             constraints=constraints,
-            planning_horizon=config_input["planningHorizon"]
+            planning_horizon=config_input["planningHorizon"],
+            mode=mode,
+            joint=bool(joint)
         )
         
         # ====== FORMAT OUTPUT ======
@@ -452,6 +831,138 @@ async def configure_endpoint(
         raise HTTPException(status_code=500, detail=error_msg)
 
 
+@app.post("/pipeline", response_class=ORJSONResponse)
+async def pipeline_endpoint(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    mode: str = Query("heuristic"),
+    joint: int = Query(0, ge=0, le=1),
+    offsets: str = Query("fixed"),
+    time_limit: int = Query(15, ge=1, le=120),
+):
+    """
+    Configure and solve in one round-trip: simple requirements in, roster out.
+    
+    Runs the configuration optimizer (as /configure), synthesises employees
+    and demand items from the recommendations in memory and solves them
+    (as /solve). The body is parsed once; no intermediate input is written.
+    
+    Accepts the /configure input (JSON body or uploaded file).
+    
+    Query parameters:
+    - mode, joint: as /configure
+    - offsets: "fixed" (default) - recommended rotation offsets are fixed;
+      "hint" - the solver optimises offsets starting from the recommendation;
+      the fixed-offset roster is solved too and returned if it is better
+    - time_limit: solver time limit in seconds (per solve)
+    
+    Returns:
+    - 200: /solve output plus the "configuration" used to build it
+    - 400: Invalid input
+    - 500: Internal server error
+    """
+    
+    request_id = request.state.request_id
+    start_time = time.perf_counter()
+    
+    if mode not in CONFIG_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode '{mode}'; expected one of: {', '.join(CONFIG_MODES)}"
+        )
+    if offsets not in OFFSET_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown offsets '{offsets}'; expected one of: {', '.join(OFFSET_MODES)}"
+        )
+    
+    try:
+        # ====== PARSE INPUT ======
+        raw_body_json = None
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                raw_body = await request.body()
+                if raw_body:
+                    raw_body_json = json.loads(raw_body)
+            except Exception:
+                raw_body_json = None
+        
+        uploaded_json = None
+        if file:
+            uploaded_json = await load_json_from_upload(file)
+        
+        config_input = uploaded_json if uploaded_json else raw_body_json
+        if config_input is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Provide either JSON body or upload a JSON file with requirements, constraints, and planningHorizon."
+            )
+        for field in ("requirements", "planningHorizon"):
+            if field not in config_input:
+                raise HTTPException(status_code=400, detail=f"Missing '{field}' field in input.")
+        
+        # ====== CONFIGURE + BUILD SOLVER INPUT ======
+        pipeline = await run_in_threadpool(
+            prepare_pipeline, config_input,
+            mode=mode, joint=bool(joint), offsets=offsets, time_limit=time_limit,
+        )
+        input_json = pipeline["input"]
+        
+        # ====== SOLVE ======
+        # Hint mode keeps the fixed-offset roster as a floor (two solves)
+        status_code, solver_result, assignments, violations = await run_solve(pipeline, solve_pipeline)
+        ctx = pipeline["ctx"]
+        
+        # ====== BUILD OUTPUT ======
+        with metrics.timed("output_build"):
+            output_dict = build_output(
+                input_json, ctx, status_code, solver_result, assignments, violations
+            )
+        output_dict["configuration"] = pipeline["configuration"]
+        output_dict["meta"]["requestId"] = request_id
+        output_dict["meta"]["warnings"] = pipeline["warnings"]
+        
+        # ====== SAVE OUTPUT TO FILE ======
+        try:
+            save_future = output_store.save(
+                output_dict,
+                request_id=request_id,
+                input_hash=output_dict["meta"].get("inputHash"),
+            )
+            save_future.add_done_callback(_log_save_failure)
+        except Exception as e:
+            logger.warning("Failed to queue output file: %s", str(e))
+        
+        # ====== LOG ======
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        logger.info(
+            "pipeline requestId=%s totalEmployees=%s status=%s hard=%s assignments=%s durMs=%s",
+            request_id,
+            pipeline["configuration"]["summary"]["totalEmployees"],
+            output_dict["solverRun"]["status"],
+            output_dict["score"]["hard"],
+            len(assignments),
+            elapsed_ms
+        )
+        
+        return ORJSONResponse(content=output_dict)
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        error_msg = f"Pipeline error: {str(e)}"
+        logger.error(
+            "pipeline requestId=%s error=%s durMs=%s",
+            request_id,
+            str(e),
+            elapsed_ms,
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -8,6 +8,7 @@ This tool analyzes simple requirements and suggests:
 
 Usage:
     python src/configure_roster.py --in input/requirements_simple.json --out config/recommended.json
+    python src/configure_roster.py --in input/requirements_simple.json --mode exact
 """
 
 import sys
@@ -17,7 +18,7 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 import json
 import argparse
 from datetime import datetime
-from context.engine.config_optimizer import optimize_all_requirements, format_output_config
+from context.engine.config_optimizer import CONFIG_MODES, optimize_all_requirements, format_output_config
 
 
 def load_requirements(filepath: str) -> dict:
@@ -104,6 +105,12 @@ def main():
                        help='Output configuration file (JSON)')
     parser.add_argument('--employees', dest='employee_file', required=False,
                        help='Output employee list file (JSON)')
+    parser.add_argument('--mode', choices=CONFIG_MODES, default='heuristic',
+                       help='heuristic (fast closed form) or exact (CP-SAT minimal staffing)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for requirements (default: CONFIG_WORKERS or 1)')
+    parser.add_argument('--joint', action='store_true',
+                       help='Let requirements with the same product/rank/scheme/shifts share employees')
     
     args = parser.parse_args()
     
@@ -120,7 +127,10 @@ def main():
     optimized = optimize_all_requirements(
         requirements_data['requirements'],
         requirements_data['constraints'],
-        requirements_data['planningHorizon']
+        requirements_data['planningHorizon'],
+        mode=args.mode,
+        workers=args.workers,
+        joint=args.joint
     )
     
     # Format output
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""Synthetic Scenario Generator - Scaled v0.70 solver inputs for benchmarking.
+
+Produces a valid v0.70 input (employees + demandItems) at a configurable
+scale from a fixed seed. Requirements are synthesised first; staffing is
+then sized per requirement (enough employees to cover its headcount under
+its work pattern, plus slack) and turned into employees with
+`configure_roster.generate_employee_list`, so the output uses the same
+employee records the configuration optimizer produces.
+
+Non-scaled sections (constraintList, schemeMap, solverRunTime, ...) are
+copied from a template input (default: input/input_v0.7.json).
+
+Usage:
+    python src/generate_scenario.py --employees 1000 --demands 20 --days 31 --seed 7 \\
+        --out input/generated/scenario_1000.json
+"""
+
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+import json
+import math
+import random
+import argparse
+from datetime import date, timedelta
+
+from src.configure_roster import generate_employee_list
+
+DEFAULT_TEMPLATE = pathlib.Path(__file__).resolve().parents[1] / "input" / "input_v0.7.json"
+
+# Shift catalogue: code -> (start, end, nextDay)
+SHIFT_DETAILS = {
+    "D": ("08:00", "20:00", False),
+    "N": ("20:00", "08:00", True),
+    "E": ("07:00", "15:00", False),   # 8h early shift
+    "M": ("09:00", "17:00", False),   # 8h shift for part-timers (scheme P, <=9h/day)
+}
+
+# Work patterns by name: (pattern, schemes it suits). Each pattern uses a
+# single shift code: the slot builder creates slots for every code in a
+# requirement's pattern on every covered day, so mixed-code patterns would
+# double the demand.
+PATTERNS = {
+    "DDDDOO": (["D", "D", "D", "D", "O", "O"], ("A", "B")),
+    "NNNNOO": (["N", "N", "N", "N", "O", "O"], ("A", "B")),
+    "NNONNO": (["N", "N", "O", "N", "N", "O"], ("A", "B")),
+    "EEEEEOO": (["E", "E", "E", "E", "E", "O", "O"], ("A", "B")),
+    "MMMMOOO": (["M", "M", "M", "M", "O", "O", "O"], ("P",)),
+}
+
+DEFAULT_PATTERN_MIX = {"DDDDOO": 4, "NNNNOO": 3, "NNONNO": 1, "EEEEEOO": 2, "MMMMOOO": 1}
+
+# (productTypeId, rankId) pairs
+PRODUCTS = [("APO", "APO"), ("CVSO", "CVSO2"), ("AVSO", "AVSO1"), ("SO", "SO")]
+
+QUALIFICATIONS = ["FRISKING-LIC", "DETENTION-LIC", "XRAY-LIC", "FIRSTAID-CERT", "K9-HANDLER"]
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _weighted_choice(rng, weights: dict):
+    keys = sorted(weights)
+    return rng.choices(keys, weights=[weights[k] for k in keys], k=1)[0]
+
+
+def team_for_demand(demand_id: str) -> str:
+    """Team whose employees staff a synthetic demand (DMD_0007 -> TEAM-0007)."""
+    return "TEAM-" + demand_id.split("_", 1)[1]
+
+
+def employees_for_headcount(headcount: int, pattern: list) -> int:
+    """Employees needed so that `headcount` are on duty every day of the cycle."""
+    work_days = sum(1 for code in pattern if code != "O")
+    return math.ceil(headcount * len(pattern) / max(1, work_days))
+
+
+def staggered_offsets(count: int, pattern: list) -> list:
+    """
+    Rotation offsets for `count` employees on one pattern, spreading on-duty
+    days as evenly as possible over the cycle (each employee takes the
+    offset that covers the currently least-covered days).
+    """
+    cycle = len(pattern)
+    coverage = [0] * cycle
+    offsets = []
+    for _ in range(count):
+        best = min(
+            range(cycle),
+            key=lambda o: sorted(coverage[c] for c in range(cycle) if pattern[(c - o) % cycle] != "O"),
+        )
+        for c in range(cycle):
+            if pattern[(c - best) % cycle] != "O":
+                coverage[c] += 1
+        offsets.append(best)
+    return offsets
+
+
+def synthesize_demand_items(
+    rng: random.Random,
+    num_demands: int,
+    requirements_per_demand: int,
+    start_date: date,
+    pattern_mix: dict = None,
+    scheme_weights: dict = None,
+    gender_weights: dict = None,
+    qualification_rate: float = 0.5,
+    whitelist_rate: float = 0.3,
+    ph_inclusion_rate: float = 0.5,
+) -> list:
+    """
+    Synthesise demandItems with one headcount-1 requirement skeleton each.
+
+    Headcounts are sized later (see generate_scenario); every requirement's
+    work pattern only uses shift codes defined in its demand's shiftDetails.
+    Returns the demandItems list (v0.70 schema).
+    """
+    pattern_mix = pattern_mix or DEFAULT_PATTERN_MIX
+    scheme_weights = scheme_weights or {"A": 6, "B": 3, "P": 1}
+    gender_weights = gender_weights or {"Any": 8, "M": 1, "F": 1}
+    demand_items = []
+    req_counter = 1
+
+    for d in range(num_demands):
+        demand_id = f"DMD_{d + 1:04d}"
+        team_id = team_for_demand(demand_id)
+        requirements = []
+        codes = set()
+        for _ in range(requirements_per_demand):
+            scheme = _weighted_choice(rng, scheme_weights)
+            suitable = {name: w for name, w in pattern_mix.items() if scheme in PATTERNS[name][1]}
+            if not suitable:
+                suitable = {name: 1 for name, (_, schemes) in PATTERNS.items() if scheme in schemes}
+            pattern = list(PATTERNS[_weighted_choice(rng, suitable)][0])
+            codes.update(code for code in pattern if code != "O")
+            product, rank = rng.choice(PRODUCTS)
+            quals = []
+            if rng.random() < qualification_rate:
+                quals = sorted(rng.sample(QUALIFICATIONS, rng.randint(1, 3)))
+            requirements.append({
+                "requirementId": f"R{req_counter:05d}",
+                "productTypeId": product,
+                "rankId": rank,
+                "headcount": 1,
+                "workPattern": pattern,
+                "requiredQualifications": quals,
+                "gender": _weighted_choice(rng, gender_weights),
+                "Scheme": scheme,
+            })
+            req_counter += 1
+
+        include_ph = rng.random() < ph_inclusion_rate
+        team_ids = [team_id] if rng.random() < whitelist_rate else []
+        demand_items.append(build_demand_item(
+            demand_id, f"LOC-{d // 3 + 1:03d}", f"OU-{d % 5 + 1:02d}", start_date,
+            {code: SHIFT_DETAILS[code] for code in sorted(codes)}, requirements,
+            include_ph=include_ph, team_ids=team_ids,
+        ))
+
+    return demand_items
+
+
+def build_demand_item(
+    demand_id: str,
+    location_id: str,
+    ou_id: str,
+    start_date: date,
+    shift_details: dict,
+    requirements: list,
+    coverage_days: list = None,
+    include_ph: bool = False,
+    team_ids: list = None,
+) -> dict:
+    """
+    One v0.70 demandItem with a single shift group anchored on start_date.
+
+    shift_details maps shift code -> (start, end, nextDay) like SHIFT_DETAILS;
+    team_ids (optional) becomes the shift group's team whitelist.
+    """
+    return {
+        "demandId": demand_id,
+        "locationId": location_id,
+        "ouId": ou_id,
+        "shiftStartDate": start_date.isoformat(),
+        "shifts": [{
+            "shiftDetails": [
+                {"shiftCode": code, "start": start, "end": end, "nextDay": next_day}
+                for code, (start, end, next_day) in shift_details.items()
+            ],
+            "includePublicHolidays": include_ph,
+            "includeEveOfPublicHolidays": True,
+            "shiftSetId": f"Set_{demand_id}",
+            "coverageDays": list(coverage_days or WEEKDAYS),
+            "coverageAnchor": start_date.isoformat(),
+            "whitelist": {
+                "teamIds": list(team_ids or []),
+                "employeeIds": [],
+            },
+            "blacklist": {"employeeIds": []},
+        }],
+        "requirements": requirements,
+    }
+
+
+def _size_headcounts(rng, requirements: list, num_employees: int, staffing_slack: float):
+    """Grow headcounts until the minimum staffing reaches num_employees / (1 + slack)."""
+    target_min = num_employees / (1 + staffing_slack)
+    needed = {r["requirementId"]: employees_for_headcount(r["headcount"], r["workPattern"])
+              for r in requirements}
+    total = sum(needed.values())
+    while requirements:
+        req = rng.choice(requirements)
+        extra = employees_for_headcount(req["headcount"] + 1, req["workPattern"]) - needed[req["requirementId"]]
+        if total + extra > target_min:
+            break
+        req["headcount"] += 1
+        needed[req["requirementId"]] += extra
+        total += extra
+    # Hand out the remaining employees (slack) one at a time
+    spare = num_employees - total
+    order = sorted(requirements, key=lambda r: r["requirementId"])
+    i = 0
+    while spare > 0 and order:
+        needed[order[i % len(order)]["requirementId"]] += 1
+        spare -= 1
+        i += 1
+    return needed
+
+
+def generate_scenario(
+    num_employees: int = 500,
+    num_demands: int = 10,
+    requirements_per_demand: int = 3,
+    horizon_days: int = 31,
+    start_date: str = "2025-12-01",
+    num_public_holidays: int = 1,
+    pattern_mix: dict = None,
+    scheme_weights: dict = None,
+    gender_weights: dict = None,
+    qualification_rate: float = 0.5,
+    expiring_qualification_rate: float = 0.0,
+    whitelist_rate: float = 0.3,
+    blacklist_rate: float = 0.02,
+    staffing_slack: float = 0.15,
+    seed: int = 42,
+    template: dict = None,
+) -> dict:
+    """
+    Generate a complete v0.70 input dict.
+
+    Every requirement gets enough employees (matching scheme, product, rank,
+    gender, qualifications and team) to cover its headcount under its work
+    pattern with staggered rotation offsets; `staffing_slack` adds spare
+    employees on top. If num_employees is below the minimum needed for one
+    head per requirement, the minimum is used instead.
+    """
+    rng = random.Random(seed)
+    start = date.fromisoformat(start_date)
+    end = start + timedelta(days=horizon_days - 1)
+
+    demand_items = synthesize_demand_items(
+        rng, num_demands, requirements_per_demand, start,
+        pattern_mix=pattern_mix, scheme_weights=scheme_weights, gender_weights=gender_weights,
+        qualification_rate=qualification_rate, whitelist_rate=whitelist_rate,
+    )
+    requirements = [r for item in demand_items for r in item["requirements"]]
+    staffing = _size_headcounts(rng, requirements, num_employees, staffing_slack)
+
+    # Configuration in the configure_roster recommendation format
+    recommendations = []
+    for req in requirements:
+        count = staffing[req["requirementId"]]
+        recommendations.append({
+            "requirementId": req["requirementId"],
+            "productType": req["productTypeId"],
+            "rank": req["rankId"],
+            "scheme": req["Scheme"],
+            "configuration": {
+                "employeesRequired": count,
+                "rotationOffsets": staggered_offsets(count, req["workPattern"]),
+            },
+        })
+    employees = generate_employee_list({"recommendations": recommendations})
+
+    # Enrich the employee records to the full v0.70 shape
+    req_by_id = {r["requirementId"]: r for r in requirements}
+    demand_by_req = {r["requirementId"]: item for item in demand_items for r in item["requirements"]}
+    for emp in employees:
+        req = req_by_id[emp.pop("assignedRequirement")]
+        item = demand_by_req[req["requirementId"]]
+        emp["rankId"] = emp.pop("rank")
+        emp["ouId"] = item["ouId"]
+        emp["teamId"] = team_for_demand(item["demandId"])
+        if req["gender"] in ("M", "F"):
+            emp["gender"] = req["gender"]
+        else:
+            emp["gender"] = "M" if rng.random() < 0.7 else "F"
+        quals = []
+        for code in req["requiredQualifications"]:
+            expiry = end + timedelta(days=rng.randint(30, 720))
+            if rng.random() < expiring_qualification_rate:
+                expiry = start + timedelta(days=rng.randint(0, horizon_days - 1))
+            quals.append({
+                "code": code,
+                "validFrom": (start - timedelta(days=rng.randint(30, 720))).isoformat(),
+                "expiryDate": expiry.isoformat(),
+            })
+        emp["qualifications"] = quals
+        emp["preferences"] = {}
+        emp["unavailability"] = []
+
+    # Blacklist a few employees from their own demand for a short date range
+    emps_by_team = {}
+    for emp in employees:
+        emps_by_team.setdefault(emp["teamId"], []).append(emp["employeeId"])
+    for item in demand_items:
+        for emp_id in emps_by_team.get(team_for_demand(item["demandId"]), []):
+            if rng.random() < blacklist_rate:
+                bl_start = start + timedelta(days=rng.randint(0, horizon_days - 1))
+                bl_end = min(end, bl_start + timedelta(days=rng.randint(0, 4)))
+                item["shifts"][0]["blacklist"]["employeeIds"].append({
+                    "employeeId": emp_id,
+                    "blacklistStartDate": bl_start.isoformat(),
+                    "blacklistEndDate": bl_end.isoformat(),
+                })
+
+    holidays = sorted(
+        (start + timedelta(days=d)).isoformat()
+        for d in rng.sample(range(horizon_days), min(num_public_holidays, horizon_days))
+    )
+
+    if template is None and DEFAULT_TEMPLATE.exists():
+        with open(DEFAULT_TEMPLATE, "r", encoding="utf-8") as f:
+            template = json.load(f)
+    scenario = {k: v for k, v in (template or {}).items() if k not in ("employees", "demandItems")}
+    scenario.update({
+        "schemaVersion": "0.70",
+        "planningReference": f"SYNTHETIC_E{len(employees)}_D{num_demands}_S{seed}",
+        "fixedRotationOffset": True,
+        "planningHorizon": {"startDate": start.isoformat(), "endDate": end.isoformat()},
+        "publicHolidays": holidays,
+        "demandItems": demand_items,
+        "employees": employees,
+    })
+    return scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic v0.70 solver input")
+    parser.add_argument('--employees', type=int, default=500, help='Total employees (default 500)')
+    parser.add_argument('--demands', type=int, default=10, help='Number of demand items (default 10)')
+    parser.add_argument('--requirements', type=int, default=3, help='Requirements per demand (default 3)')
+    parser.add_argument('--days', type=int, default=31, help='Planning horizon length in days (default 31)')
+    parser.add_argument('--start', default='2025-12-01', help='Horizon start date (default 2025-12-01)')
+    parser.add_argument('--holidays', type=int, default=1, help='Number of public holidays (default 1)')
+    parser.add_argument('--patterns', default=None,
+                        help='Pattern mix, e.g. "DDDDOO:4,NNNNOO:3,MMMMOOO:1" (default built-in mix)')
+    parser.add_argument('--schemes', default=None, help='Scheme weights, e.g. "A:6,B:3,P:1"')
+    parser.add_argument('--genders', default=None, help='Gender requirement weights, e.g. "Any:8,M:1,F:1"')
+    parser.add_argument('--qualification-rate', type=float, default=0.5)
+    parser.add_argument('--expiring-rate', type=float, default=0.0,
+                        help='Share of qualifications expiring inside the horizon')
+    parser.add_argument('--whitelist-rate', type=float, default=0.3)
+    parser.add_argument('--blacklist-rate', type=float, default=0.02)
+    parser.add_argument('--slack', type=float, default=0.15, help='Spare staffing ratio (default 0.15)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--template', default=None, help='Template input for non-scaled sections')
+    parser.add_argument('--out', dest='output_file', required=True, help='Output input file (JSON)')
+    args = parser.parse_args()
+
+    def parse_weights(value):
+        if not value:
+            return None
+        return {k.strip(): float(w) for k, w in (part.split(':') for part in value.split(','))}
+
+    template = None
+    if args.template:
+        with open(args.template, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+
+    pattern_mix = parse_weights(args.patterns)
+    if pattern_mix:
+        unknown = sorted(set(pattern_mix) - set(PATTERNS))
+        if unknown:
+            parser.error(f"unknown patterns {unknown}; choose from {sorted(PATTERNS)}")
+
+    scenario = generate_scenario(
+        num_employees=args.employees,
+        num_demands=args.demands,
+        requirements_per_demand=args.requirements,
+        horizon_days=args.days,
+        start_date=args.start,
+        num_public_holidays=args.holidays,
+        pattern_mix=pattern_mix,
+        scheme_weights=parse_weights(args.schemes),
+        gender_weights=parse_weights(args.genders),
+        qualification_rate=args.qualification_rate,
+        expiring_qualification_rate=args.expiring_rate,
+        whitelist_rate=args.whitelist_rate,
+        blacklist_rate=args.blacklist_rate,
+        staffing_slack=args.slack,
+        seed=args.seed,
+        template=template,
+    )
+
+    out = pathlib.Path(args.output_file)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(scenario, f, indent=2)
+
+    reqs = sum(len(d['requirements']) for d in scenario['demandItems'])
+    heads = sum(r['headcount'] for d in scenario['demandItems'] for r in d['requirements'])
+    print(f"✓ Wrote {out}")
+    print(f"  Employees: {len(scenario['employees'])}, demands: {len(scenario['demandItems'])}, "
+          f"requirements: {reqs}, daily headcount: {heads}")
+    print(f"  Horizon: {scenario['planningHorizon']['startDate']} → {scenario['planningHorizon']['endDate']}, "
+          f"public holidays: {scenario['publicHolidays']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,18 @@ class SolverRunMetadata(BaseModel):
     timeLimitSec: Optional[int] = Field(None, description="Time limit applied")
     numVars: Optional[int] = Field(None, description="Number of decision variables")
     numConstraints: Optional[int] = Field(None, description="Number of constraints")
+    modelBreakdown: Optional[List[Dict[str, Any]]] = Field(
+        None,
+        description="Per-module model size: module, vars, constraints, buildMs"
+    )
+    capacity: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Pre-solve capacity analysis: totalSlots, upperBound, shortfall, unfillable, groups, days"
+    )
+    coverage: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Filled slots against the per-day matching bound: assigned, upperBound, gap, source (cpsat or matching)"
+    )
 
 
 class Meta(BaseModel):
@@ -55,6 +67,10 @@ class Meta(BaseModel):
         None,
         description="Hour breakdown per assignment (gross, lunch, normal, ot, paid)"
     )
+    profile: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-phase profile (wall time, peak memory, top functions) when profiling is enabled"
+    )
 
 
 class Assignment(BaseModel):
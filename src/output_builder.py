@@ -6,9 +6,10 @@ Refactored from run_solver.py to ensure CLI and API produce identical output.
 
 import json
 import hashlib
-from datetime import datetime
+import orjson
+from datetime import datetime, date, timedelta
 from collections import defaultdict
-from context.engine.time_utils import split_shift_hours
+from context.engine.time_utils import shape_of
 
 
 def compute_input_hash(input_data):
@@ -17,91 +18,76 @@ def compute_input_hash(input_data):
     # This includes CP-SAT objects (IntVar), slots, and other solver internals
     clean_data = {k: v for k, v in input_data.items() 
                   if k not in ['slots', 'x', 'model', 'timeLimit', 'unassigned', 
-                               'offset_vars', 'optimized_offsets', 'total_unassigned']}
+                               'offset_vars', 'optimized_offsets', 'x_by_slot', 'slot_table', 'phase_timings', 'model_stats', 'profiler', 'total_unassigned', 'capacity', 'numWorkers', 'randomSeed', 'deterministicTimeLimit']}
     json_str = json.dumps(clean_data, sort_keys=True)
     return "sha256:" + hashlib.sha256(json_str.encode()).hexdigest()
 
 
-def build_output(input_data, ctx, status, solver_result, assignments, violations):
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+OUTPUT_FORMATS = ("standard", "matrix")
+
+# Fields of an unassigned slot kept in the matrix format's "unassigned" list
+MATRIX_UNASSIGNED_FIELDS = ("slotId", "demandId", "requirementId", "date", "shiftCode")
+
+
+def annotate_assignment(assignment, slots_by_id, employee_weekly_normal, employee_monthly_ot):
     """
-    Build output in expected schema format (v0.43+).
-    
-    This function is shared between CLI (run_solver.py) and API (api_server.py)
-    to ensure identical output format and behavior.
-    
-    Args:
-        input_data: Original input JSON (dict)
-        ctx: Context dict with planning data (including slots, constraints, etc.)
-        status: String status from solver (OPTIMAL, FEASIBLE, INFEASIBLE, etc.)
-        solver_result: Dict with solver metadata (start_timestamp, end_timestamp, duration_seconds, status)
-        assignments: List of assignment dicts from solver
-        violations: List of violation dicts from scoring
-    
-    Returns:
-        Dict in output schema format with all fields populated
+    Add the hour breakdown to one assignment (in place) and accumulate the
+    per-employee weekly normal / monthly OT totals.
     """
-    
-    # Compute input hash for reproducibility tracking
-    input_hash = compute_input_hash(ctx)
-    
-    # Extract scores from solver_result
-    scores = solver_result.get('scores', {'hard': 0, 'soft': 0, 'overall': 0})
-    score_breakdown = solver_result.get('scoreBreakdown', {
-        'hard': {'violations': []},
-        'soft': {}
-    })
-    
-    # ========== ANNOTATE ASSIGNMENTS WITH HOUR BREAKDOWN ==========
-    annotated_assignments = []
-    employee_weekly_normal = defaultdict(float)  # emp_id:week -> hours
-    employee_monthly_ot = defaultdict(float)     # emp_id:month -> hours
-    
-    for assignment in assignments:
+    try:
+        # Hour breakdowns come from the slot's interned ShiftShape (a table lookup)
+        slot = slots_by_id.get(assignment.get('slotId'))
+        if slot is not None:
+            shape = slot.shape
+        else:
+            shape = shape_of(datetime.fromisoformat(assignment.get('startDateTime')),
+                             datetime.fromisoformat(assignment.get('endDateTime')))
+        
+        # Calculate hour breakdown
+        hours_dict = shape.as_dict()
+        
+        # Add hour breakdown to assignment
+        assignment['hours'] = {
+            'gross': hours_dict['gross'],
+            'lunch': hours_dict['lunch'],
+            'normal': hours_dict['normal'],
+            'ot': hours_dict['ot'],
+            'paid': hours_dict['paid']
+        }
+        
+        # Accumulate totals per employee
+        emp_id = assignment.get('employeeId')
+        assignment_date = assignment.get('date')
+        
+        # Week calculation: ISO week (Mon-Sun)
         try:
-            start_dt = datetime.fromisoformat(assignment.get('startDateTime'))
-            end_dt = datetime.fromisoformat(assignment.get('endDateTime'))
+            date_obj = datetime.fromisoformat(assignment_date).date()
+            iso_year, iso_week, _ = date_obj.isocalendar()
+            week_key = f"{iso_year}-W{iso_week:02d}"
+            month_key = f"{iso_year}-{date_obj.month:02d}"
             
-            # Calculate hour breakdown
-            hours_dict = split_shift_hours(start_dt, end_dt)
+            # Accumulate normal hours for week
+            employee_weekly_normal[f"{emp_id}:{week_key}"] += hours_dict['normal']
             
-            # Add hour breakdown to assignment
-            assignment['hours'] = {
-                'gross': hours_dict['gross'],
-                'lunch': hours_dict['lunch'],
-                'normal': hours_dict['normal'],
-                'ot': hours_dict['ot'],
-                'paid': hours_dict['paid']
-            }
-            
-            # Accumulate totals per employee
-            emp_id = assignment.get('employeeId')
-            assignment_date = assignment.get('date')
-            
-            # Week calculation: ISO week (Mon-Sun)
-            try:
-                date_obj = datetime.fromisoformat(assignment_date).date()
-                iso_year, iso_week, _ = date_obj.isocalendar()
-                week_key = f"{iso_year}-W{iso_week:02d}"
-                month_key = f"{iso_year}-{date_obj.month:02d}"
-                
-                # Accumulate normal hours for week
-                employee_weekly_normal[f"{emp_id}:{week_key}"] += hours_dict['normal']
-                
-                # Accumulate OT hours for month
-                employee_monthly_ot[f"{emp_id}:{month_key}"] += hours_dict['ot']
-            except Exception:
-                pass  # Skip if date parsing fails
-            
-        except Exception as e:
-            # If hour calculation fails, annotate with error but continue
-            assignment['hours'] = {
-                'gross': 0, 'lunch': 0, 'normal': 0, 'ot': 0, 'paid': 0,
-                'error': str(e)
-            }
+            # Accumulate OT hours for month
+            employee_monthly_ot[f"{emp_id}:{month_key}"] += hours_dict['ot']
+        except Exception:
+            pass  # Skip if date parsing fails
         
-        annotated_assignments.append(assignment)
+    except Exception as e:
+        # If hour calculation fails, annotate with error but continue
+        assignment['hours'] = {
+            'gross': 0, 'lunch': 0, 'normal': 0, 'ot': 0, 'paid': 0,
+            'error': str(e)
+        }
     
-    # ========== BUILD EMPLOYEE HOURS SUMMARY ==========
+    return assignment
+
+
+def summarize_employee_hours(employee_weekly_normal, employee_monthly_ot):
+    """Fold the emp:week / emp:month accumulators into the meta.employeeHours shape."""
     employee_hours_summary = {}
     
     for key, total in employee_weekly_normal.items():
@@ -122,8 +108,13 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             }
         employee_hours_summary[emp_id]['monthly_ot'][month_key] = round(total, 2)
     
-    # ========== BUILD OUTPUT ==========
-    output = {
+    return employee_hours_summary
+
+
+def _output_header(ctx, status, solver_result):
+    """schemaVersion / planningReference / solverRun / score section of the output."""
+    scores = solver_result.get('scores', {'hard': 0, 'soft': 0, 'overall': 0})
+    return {
         "schemaVersion": "0.43",
         "planningReference": ctx.get("planningReference", "UNKNOWN"),
         "solverRun": {
@@ -132,21 +123,206 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             "startedAt": solver_result.get("start_timestamp", ""),
             "ended": solver_result.get("end_timestamp", ""),
             "durationSeconds": solver_result.get("duration_seconds", 0),
-            "status": solver_result.get("status", status)
+            "status": solver_result.get("status", status),
+            "timeLimitSec": solver_result.get("time_limit_sec"),
+            "numVars": solver_result.get("num_vars"),
+            "numConstraints": solver_result.get("num_constraints"),
+            "modelBreakdown": solver_result.get("model_breakdown", []),
+            "capacity": solver_result.get("capacity"),
+            "coverage": solver_result.get("coverage")
         },
         "score": {
             "overall": scores.get('overall', 0),
             "hard": scores.get('hard', 0),
             "soft": scores.get('soft', 0)
         },
-        "scoreBreakdown": score_breakdown,
+    }
+
+
+def _score_breakdown(solver_result):
+    return solver_result.get('scoreBreakdown', {
+        'hard': {'violations': []},
+        'soft': {}
+    })
+
+
+def build_output(input_data, ctx, status, solver_result, assignments, violations):
+    """
+    Build output in expected schema format (v0.43+).
+    
+    This function is shared between CLI (run_solver.py) and API (api_server.py)
+    to ensure identical output format and behavior.
+    
+    Args:
+        input_data: Original input JSON (dict)
+        ctx: Context dict with planning data (including slots, constraints, etc.)
+        status: String status from solver (OPTIMAL, FEASIBLE, INFEASIBLE, etc.)
+        solver_result: Dict with solver metadata (start_timestamp, end_timestamp, duration_seconds, status)
+        assignments: List of assignment dicts from solver
+        violations: List of violation dicts from scoring
+    
+    Returns:
+        Dict in output schema format with all fields populated
+    """
+    
+    # Compute input hash for reproducibility tracking
+    input_hash = compute_input_hash(ctx)
+    
+    # ========== ANNOTATE ASSIGNMENTS WITH HOUR BREAKDOWN ==========
+    employee_weekly_normal = defaultdict(float)  # emp_id:week -> hours
+    employee_monthly_ot = defaultdict(float)     # emp_id:month -> hours
+    slots_by_id = {s.slot_id: s for s in ctx.get('slots', [])}
+    
+    annotated_assignments = [
+        annotate_assignment(a, slots_by_id, employee_weekly_normal, employee_monthly_ot)
+        for a in assignments
+    ]
+    
+    # ========== BUILD OUTPUT ==========
+    output = _output_header(ctx, status, solver_result)
+    output.update({
+        "scoreBreakdown": _score_breakdown(solver_result),
         "assignments": annotated_assignments,
         "unmetDemand": [],
         "meta": {
             "inputHash": input_hash,
             "generatedAt": datetime.now().isoformat(),
-            "employeeHours": employee_hours_summary
+            "employeeHours": summarize_employee_hours(employee_weekly_normal, employee_monthly_ot)
         }
-    }
+    })
     
     return output
+
+
+def parse_fields(fields):
+    """Parse a `fields=` query value ("employeeId,date,shiftCode") into a tuple, or None."""
+    if not fields:
+        return None
+    parsed = tuple(f.strip() for f in fields.split(",") if f.strip())
+    return parsed or None
+
+
+def project_assignment(assignment, fields):
+    """Keep only the requested keys of one assignment record (missing keys are skipped)."""
+    return {f: assignment[f] for f in fields if f in assignment}
+
+
+def project_assignments(output, fields):
+    """
+    Return a shallow copy of a standard output dict whose assignment records
+    contain only `fields`. The original output (e.g. the copy being saved to
+    disk) is left untouched.
+    """
+    if not fields:
+        return output
+    projected = dict(output)
+    projected["assignments"] = [project_assignment(a, fields) for a in output.get("assignments", [])]
+    return projected
+
+
+def _horizon_dates(ctx):
+    horizon = (ctx or {}).get("planningHorizon") or {}
+    try:
+        start = date.fromisoformat(str(horizon["startDate"])[:10])
+        end = date.fromisoformat(str(horizon["endDate"])[:10])
+    except (KeyError, ValueError):
+        return []
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def build_matrix_output(output, ctx=None):
+    """
+    Convert a standard output dict to the compact roster-matrix format.
+    
+    The verbose per-assignment records are replaced by:
+        roster.employees  employee index (input order, then any extra assignees)
+        roster.dates      date index (planning horizon, then any extra dates)
+        roster.shifts     grid[employee][date] -> shift code, or null when off
+                          (several shifts on one day are joined with "+")
+        unassigned        slotId/demandId/requirementId/date/shiftCode per
+                          unassigned slot
+    
+    All other top-level sections (solverRun, score, scoreBreakdown,
+    unmetDemand, meta) are carried over unchanged.
+    """
+    employees = [e.get("employeeId") for e in (ctx or {}).get("employees", [])]
+    dates = _horizon_dates(ctx)
+    emp_index = {e: i for i, e in enumerate(employees)}
+    date_index = {d: i for i, d in enumerate(dates)}
+    
+    cells = []
+    unassigned = []
+    for a in output.get("assignments", []):
+        emp_id = a.get("employeeId")
+        if emp_id is None or a.get("status") == "UNASSIGNED":
+            unassigned.append({f: a.get(f) for f in MATRIX_UNASSIGNED_FIELDS})
+            continue
+        if emp_id not in emp_index:
+            emp_index[emp_id] = len(employees)
+            employees.append(emp_id)
+        day = a.get("date")
+        if day not in date_index:
+            date_index[day] = len(dates)
+            dates.append(day)
+        cells.append((emp_index[emp_id], date_index[day], a.get("shiftCode")))
+    
+    grid = [[None] * len(dates) for _ in employees]
+    for e, d, code in cells:
+        grid[e][d] = code if grid[e][d] is None else f"{grid[e][d]}+{code}"
+    
+    matrix = {k: v for k, v in output.items() if k != "assignments"}
+    matrix["format"] = "matrix"
+    matrix["roster"] = {"employees": employees, "dates": dates, "shifts": grid}
+    matrix["unassigned"] = unassigned
+    return matrix
+
+
+def iter_output_ndjson(input_data, ctx, status, solver_result, assignments, violations,
+                       meta_extra=None, chunk_size=1000, on_complete=None, fields=None):
+    """
+    Stream the output as NDJSON (application/x-ndjson), one JSON value per line.
+    
+    Lines, in order:
+        {"type": "header", "schemaVersion", "planningReference", "solverRun", "score"}
+        one assignment object per line (same records as build_output)
+        {"type": "trailer", "scoreBreakdown", "unmetDemand", "meta"}
+    
+    Assignments are annotated with hours as they are streamed and yielded in
+    byte chunks of chunk_size lines, so the full document is never held as
+    one buffer. meta_extra is merged into the trailer meta (e.g. requestId).
+    on_complete, if given, receives the equivalent build_output() dict after
+    the trailer has been yielded (assignment records are shared, not copied).
+    """
+    dumps = orjson.dumps
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    header = _output_header(ctx, status, solver_result)
+    yield dumps({"type": "header", **header}, option=option) + b"\n"
+    
+    employee_weekly_normal = defaultdict(float)
+    employee_monthly_ot = defaultdict(float)
+    slots_by_id = {s.slot_id: s for s in ctx.get('slots', [])}
+    
+    for start in range(0, len(assignments), chunk_size):
+        chunk = [
+            annotate_assignment(a, slots_by_id, employee_weekly_normal, employee_monthly_ot)
+            for a in assignments[start:start + chunk_size]
+        ]
+        if fields:
+            chunk = [project_assignment(a, fields) for a in chunk]
+        lines = [dumps(a, option=option) for a in chunk]
+        lines.append(b"")
+        yield b"\n".join(lines)
+    
+    meta = {
+        "inputHash": compute_input_hash(ctx),
+        "generatedAt": datetime.now().isoformat(),
+        "employeeHours": summarize_employee_hours(employee_weekly_normal, employee_monthly_ot),
+    }
+    meta.update(meta_extra or {})
+    trailer = {"scoreBreakdown": _score_breakdown(solver_result), "unmetDemand": [], "meta": meta}
+    yield dumps({"type": "trailer", **trailer}, option=option) + b"\n"
+    
+    if on_complete is not None:
+        on_complete({**header, "scoreBreakdown": trailer["scoreBreakdown"],
+                     "assignments": assignments, "unmetDemand": [], "meta": meta})
@@ -0,0 +1,210 @@
+"""
+Output persistence for solver results.
+
+Serialises output dicts with orjson and writes them off the request path on a
+background thread. Files are written to a temp name and atomically renamed,
+named by timestamp + input hash + request id so concurrent solves never
+overwrite each other, optionally compressed (gzip, or zstd when the
+`zstandard` package is installed) and pruned by a retention policy.
+
+Configuration (environment, all optional):
+    OUTPUT_DIR              Directory for output files (default: output)
+    OUTPUT_COMPRESSION      none | gzip | zstd (default: none)
+    OUTPUT_RETENTION_FILES  Keep at most this many output files
+    OUTPUT_RETENTION_DAYS   Delete output files older than this many days
+"""
+
+import os
+import gzip
+import time
+import uuid
+import logging
+import pathlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger("ngrs.output_store")
+
+EXTENSIONS = {None: ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+
+def serialize_output(output: dict, indent: bool = False) -> bytes:
+    """Serialise an output dict to JSON bytes with orjson."""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(output, option=option, default=str)
+
+
+def compress(data: bytes, compression: Optional[str]) -> bytes:
+    """Compress serialised output with the configured codec."""
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unknown output compression: {compression!r}")
+
+
+def _normalize_compression(value: Optional[str]) -> Optional[str]:
+    if value is None or value.strip().lower() in ("", "none", "off", "0"):
+        return None
+    value = value.strip().lower()
+    if value == "gz":
+        value = "gzip"
+    if value not in EXTENSIONS:
+        raise ValueError(f"Unknown output compression: {value!r}")
+    return value
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+class OutputStore:
+    """
+    Non-blocking writer for solver output files.
+
+    Usage:
+        store = OutputStore()
+        future = store.save(output, request_id=rid, input_hash=h)
+        # ... return the response; future.result() gives the written path
+    """
+
+    def __init__(
+        self,
+        root="output",
+        compression: Optional[str] = None,
+        max_files: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        indent: bool = False,
+    ):
+        self.root = pathlib.Path(root)
+        self.compression = _normalize_compression(compression)
+        if self.compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed; falling back to gzip output compression")
+            self.compression = "gzip"
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self.indent = indent
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-store")
+        self._prune_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **overrides) -> "OutputStore":
+        """Build a store from OUTPUT_* environment variables."""
+        days = os.getenv("OUTPUT_RETENTION_DAYS")
+        settings = {
+            "root": os.getenv("OUTPUT_DIR", "output"),
+            "compression": os.getenv("OUTPUT_COMPRESSION"),
+            "max_files": _env_int("OUTPUT_RETENTION_FILES"),
+            "max_age_days": float(days) if days else None,
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def filename(self, request_id: Optional[str] = None, input_hash: Optional[str] = None) -> str:
+        """Collision-free file name: output_DDMM_HHMM_<hash8>_<rid8>.json[.gz|.zst]."""
+        timestamp = datetime.now().strftime("%d%m_%H%M")
+        hash_part = (input_hash or "nohash").split(":")[-1][:8]
+        rid = "".join(c for c in (request_id or uuid.uuid4().hex) if c.isalnum())[:8]
+        return f"output_{timestamp}_{hash_part}_{rid}{EXTENSIONS[self.compression]}"
+
+    def path_for(self, request_id: Optional[str] = None, input_hash: Optional[str] = None) -> pathlib.Path:
+        return self.root / self.filename(request_id, input_hash)
+
+    def save(
+        self,
+        output: dict,
+        request_id: Optional[str] = None,
+        input_hash: Optional[str] = None,
+        path=None,
+    ) -> Future:
+        """
+        Queue output for writing and return immediately.
+
+        Serialisation, compression, the atomic rename and retention pruning
+        all run on the store's background thread. The returned Future
+        resolves to the written path.
+        """
+        if path is None:
+            path = self.path_for(request_id, input_hash)
+        return self._executor.submit(self._write, output, pathlib.Path(path))
+
+    def save_sync(self, output: dict, request_id=None, input_hash=None, path=None) -> pathlib.Path:
+        """Write output and wait for it to land on disk."""
+        return self.save(output, request_id, input_hash, path).result()
+
+    def _write(self, output: dict, path: pathlib.Path) -> pathlib.Path:
+        start = time.perf_counter()
+        data = compress(serialize_output(output, self.indent), self.compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        logger.info(
+            "output saved to %s (%d bytes, %.0f ms)",
+            path, len(data), (time.perf_counter() - start) * 1000
+        )
+        self.prune()
+        return path
+
+    def prune(self) -> list:
+        """Apply the retention policy to output_* files in the store root."""
+        if self.max_files is None and self.max_age_days is None:
+            return []
+        removed = []
+        with self._prune_lock:
+            files = []
+            for p in self.root.glob("output_*.json*"):
+                try:
+                    files.append((p.stat().st_mtime, p))
+                except FileNotFoundError:
+                    continue
+            files.sort(reverse=True)
+            cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days is not None else None
+            for i, (mtime, p) in enumerate(files):
+                too_many = self.max_files is not None and i >= self.max_files
+                too_old = cutoff is not None and mtime < cutoff
+                if too_many or too_old:
+                    p.unlink(missing_ok=True)
+                    removed.append(p)
+        return removed
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for all queued writes to finish."""
+        self._executor.submit(lambda: None).result(timeout)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def load_output(path) -> dict:
+    """Read an output file written by OutputStore (any compression)."""
+    path = pathlib.Path(path)
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    elif path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("reading .zst output requires the 'zstandard' package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return orjson.loads(data)
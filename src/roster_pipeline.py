@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Roster Pipeline - simple requirements to a solved roster in one call.
+
+Chains the configuration optimizer and the solver in memory:
+
+1. optimize_all_requirements + format_output_config (as /configure)
+2. employees from the recommendations (configure_roster.generate_employee_list)
+   and one demandItem per requirement (generate_scenario.build_demand_item)
+3. solve() with the recommended rotation offsets, either fixed or as hints
+   for the solver's offset variables (hint mode also solves the fixed
+   offsets and returns the better roster, so it is never worse than fixed)
+
+No intermediate file is written and the input is parsed once. Non-requirement
+sections of the solver input (constraintList, schemeMap, solverScoreConfig,
+...) come from a template input (default: input/input_v0.7.json), with the
+requirement file's constraints patched into constraintList.
+
+Usage:
+    python src/roster_pipeline.py --in input/requirements_simple.json --out output/pipeline.json
+"""
+
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+import copy
+import json
+import argparse
+from datetime import date, timedelta
+
+from context.engine.config_optimizer import CONFIG_MODES, optimize_all_requirements, format_output_config
+from context.engine.data_loader import load_input
+from context.engine.solver_engine import solve
+from src.configure_roster import generate_employee_list
+from src.generate_scenario import DEFAULT_TEMPLATE, SHIFT_DETAILS, WEEKDAYS, build_demand_item
+
+OFFSET_MODES = ("fixed", "hint")
+
+# constraintList entry id -> {param: (requirements-file constraint, scheme key or None)}
+CONSTRAINT_PARAMS = {
+    "momDailyHoursCap": {
+        "maxDailyHoursA": ("dailyHoursCap", "A"),
+        "maxDailyHoursB": ("dailyHoursCap", "B"),
+        "maxDailyHoursP": ("dailyHoursCap", "P"),
+    },
+    "momWeeklyHoursCap44h": {"maxWeeklyHours": ("maxWeeklyNormalHours", None)},
+    "apgdMinRestBetweenShifts": {"minRestMinutes": ("minRestBetweenShifts", None)},
+    "maxConsecutiveWorkingDays": {"maxConsecutiveDays": ("maxConsecutiveWorkDays", None)},
+    "minimumOffDaysPerWeek": {"minOffDaysPerWeek": ("minOffDaysPerWeek", None)},
+    "monthlyOtCap72h": {"maxMonthlyOtHours": ("maxMonthlyOTHours", None)},
+}
+
+
+def constraint_list(template_list: list, constraints: dict) -> list:
+    """Template constraintList with parameters overridden from a requirements file."""
+    patched = copy.deepcopy(template_list)
+    for entry in patched:
+        for param, (key, scheme) in CONSTRAINT_PARAMS.get(entry.get("id"), {}).items():
+            value = constraints.get(key)
+            if scheme is not None:
+                value = (value or {}).get(scheme)
+            if value is not None:
+                entry.setdefault("params", {})[param] = value
+    return patched
+
+
+def shift_details(config_input: dict) -> dict:
+    """Shift code -> (start, end, nextDay) from the requirements file, else the built-in catalogue."""
+    details = dict(SHIFT_DETAILS)
+    for shift in config_input.get("shifts", []):
+        start, end = shift["startTime"], shift["endTime"]
+        details[shift["code"]] = (start, end, end <= start)
+    return details
+
+
+def build_solver_input(config_input: dict, output_config: dict, template: dict = None) -> tuple:
+    """
+    v0.70 solver input for an optimised configuration.
+
+    Each requirement becomes a demand whose shift group whitelists one team;
+    the recommended employees form that team. Requirements in a shared pool
+    all whitelist the lead requirement's team. Requirements without a
+    feasible configuration are left out.
+
+    Returns:
+        (solver input dict, warnings list)
+    """
+    warnings = []
+    horizon = config_input["planningHorizon"]
+    start = date.fromisoformat(horizon["startDate"])
+    end = date.fromisoformat(horizon["endDate"])
+    details = shift_details(config_input)
+    requirements = {req["id"]: req for req in config_input["requirements"]}
+    recommendations = {rec["requirementId"]: rec for rec in output_config["recommendations"]}
+
+    def team_of(req_id):
+        pool = recommendations[req_id]["configuration"].get("sharedPool")
+        return f"TEAM-{pool['lead'] if pool else req_id}"
+
+    demand_items = []
+    for req_id, req in requirements.items():
+        rec = recommendations.get(req_id)
+        if rec is None:
+            warnings.append(f"{req_id}: no feasible configuration, left out of the roster")
+            continue
+        pattern = rec["configuration"]["workPattern"]
+        codes = list(dict.fromkeys(code for code in pattern if code != "O"))
+        if len(codes) > 1:
+            warnings.append(f"{req_id}: pattern {''.join(pattern)} mixes shift codes; "
+                            f"slots are created for each code on every covered day")
+        demand_items.append(build_demand_item(
+            f"DMD_{req_id}", req.get("locationId", "LOC-001"), req.get("ouId", "OU-01"), start,
+            {code: details[code] for code in codes},
+            [{
+                "requirementId": req_id,
+                "productTypeId": req.get("productType", ""),
+                "rankId": req.get("rank", ""),
+                "headcount": req["headcountPerDay"],
+                "workPattern": list(pattern),
+                "requiredQualifications": list(req.get("requiredQualifications", [])),
+                "gender": req.get("gender", "Any"),
+                "Scheme": req.get("scheme", "A"),
+            }],
+            coverage_days=req.get("coverageDays", WEEKDAYS),
+            include_ph=req.get("includePH", False),
+            team_ids=[team_of(req_id)],
+        ))
+
+    employees = generate_employee_list(output_config)
+    qualification_expiry = (end + timedelta(days=365)).isoformat()
+    for i, emp in enumerate(employees):
+        req_id = emp.pop("assignedRequirement")
+        req = requirements.get(req_id, {})
+        emp["rankId"] = emp.pop("rank")
+        emp["ouId"] = req.get("ouId", "OU-01")
+        emp["teamId"] = team_of(req_id)
+        emp["gender"] = req["gender"] if req.get("gender") in ("M", "F") else ("M", "F")[i % 2]
+        emp["qualifications"] = [
+            {"code": code, "validFrom": start.isoformat(), "expiryDate": qualification_expiry}
+            for code in req.get("requiredQualifications", [])
+        ]
+        emp["preferences"] = {}
+        emp["unavailability"] = []
+
+    if template is None and DEFAULT_TEMPLATE.exists():
+        with open(DEFAULT_TEMPLATE, "r", encoding="utf-8") as f:
+            template = json.load(f)
+    solver_input = {k: v for k, v in (template or {}).items() if k not in ("employees", "demandItems")}
+    solver_input.update({
+        "schemaVersion": "0.70",
+        "planningReference": config_input.get("planningReference", f"PIPELINE_{start.isoformat()}"),
+        "fixedRotationOffset": True,
+        "planningHorizon": {"startDate": start.isoformat(), "endDate": end.isoformat()},
+        "publicHolidays": list(config_input.get("publicHolidays", [])),
+        "constraintList": constraint_list(solver_input.get("constraintList", []),
+                                          config_input.get("constraints", {})),
+        "demandItems": demand_items,
+        "employees": employees,
+    })
+    return solver_input, warnings
+
+
+def prepare_pipeline(
+    config_input: dict,
+    mode: str = "heuristic",
+    joint: bool = False,
+    offsets: str = "fixed",
+    time_limit: int = 15,
+    workers: int = None,
+    template: dict = None,
+) -> dict:
+    """
+    Optimise the configuration and build the solver context (no solve yet).
+
+    Args:
+        config_input: Requirements file dict (requirements, constraints, planningHorizon, shifts)
+        mode / joint / workers: As optimize_all_requirements
+        offsets: "fixed" - recommended offsets are fixed rotationOffsets;
+            "hint" - the solver optimises offsets, starting from the recommendation
+            (solve_pipeline keeps the fixed-offset roster as a floor)
+        time_limit: Solver time limit in seconds
+        template: Template solver input (default: input/input_v0.7.json)
+
+    Returns:
+        Dict with configuration (as /configure), input (v0.70 solver input),
+        ctx (ready for solve()) and warnings
+    """
+    if offsets not in OFFSET_MODES:
+        raise ValueError(f"Unknown offsets mode '{offsets}'; expected one of: {', '.join(OFFSET_MODES)}")
+    optimized = optimize_all_requirements(
+        config_input["requirements"],
+        config_input.get("constraints", {}),
+        config_input["planningHorizon"],
+        mode=mode,
+        workers=workers,
+        joint=joint,
+    )
+    configuration = format_output_config(optimized, config_input["requirements"])
+    solver_input, warnings = build_solver_input(config_input, configuration, template)
+
+    ctx = load_input(copy.deepcopy(solver_input))
+    ctx["timeLimit"] = time_limit
+    if offsets == "hint":
+        ctx["fixedRotationOffset"] = False
+        ctx["offsetHints"] = {emp["employeeId"]: emp["rotationOffset"] for emp in ctx["employees"]}
+    return {"configuration": configuration, "input": solver_input, "ctx": ctx, "warnings": warnings}
+
+
+def solve_pipeline(pipeline: dict) -> tuple:
+    """
+    solve() a prepared pipeline, keeping the fixed-offset roster as a floor.
+
+    In hint mode the recommended offsets are solved as fixed offsets first,
+    then with the solver optimising offsets from them; the hint roster is
+    kept unless the fixed one has fewer hard violations (or the same and a
+    lower soft score). pipeline["ctx"] is set to the context of the roster
+    returned and pipeline["offsetsUsed"] to its mode.
+
+    Returns:
+        Tuple of (status_code, solver_result_dict, assignments_list, violations)
+    """
+    hint_ctx = pipeline["ctx"]
+    pipeline["offsetsUsed"] = "fixed"
+    if hint_ctx.get("fixedRotationOffset", True):
+        return solve(hint_ctx)
+
+    fixed_ctx = {key: value for key, value in hint_ctx.items() if key != "offsetHints"}
+    fixed_ctx["fixedRotationOffset"] = True
+    fixed = solve(fixed_ctx)
+    hinted = solve(hint_ctx)
+    fixed_scores, hint_scores = fixed[1]["scores"], hinted[1]["scores"]
+    if (fixed_scores["hard"], fixed_scores["soft"]) < (hint_scores["hard"], hint_scores["soft"]):
+        print(f"[pipeline] Fixed offsets beat the offset hints "
+              f"(hard {fixed_scores['hard']} < {hint_scores['hard']} or lower soft); returning that roster")
+        pipeline["ctx"] = fixed_ctx
+        return fixed
+    pipeline["offsetsUsed"] = "hint"
+    return hinted
+
+
+def run_pipeline(config_input: dict, **kwargs) -> dict:
+    """
+    Requirements in, solved roster out (see prepare_pipeline for the arguments).
+
+    Returns:
+        prepare_pipeline()'s dict plus offsetsUsed, status_code, solver_result,
+        assignments and violations from solve_pipeline()
+    """
+    pipeline = prepare_pipeline(config_input, **kwargs)
+    status_code, solver_result, assignments, violations = solve_pipeline(pipeline)
+    pipeline.update({
+        "status_code": status_code,
+        "solver_result": solver_result,
+        "assignments": assignments,
+        "violations": violations,
+    })
+    return pipeline
+
+
+def main():
+    from src.output_builder import build_output
+
+    parser = argparse.ArgumentParser(description="Configure and solve a roster from simple requirements")
+    parser.add_argument('--in', dest='input_file', required=True, help='Requirements file (JSON)')
+    parser.add_argument('--out', dest='output_file', required=True, help='Solver output file (JSON)')
+    parser.add_argument('--mode', choices=CONFIG_MODES, default='heuristic',
+                        help='Configuration mode: heuristic or exact')
+    parser.add_argument('--joint', action='store_true', help='Allow shared employee pools')
+    parser.add_argument('--offsets', choices=OFFSET_MODES, default='fixed',
+                        help='Use recommended offsets as fixed offsets or as solver hints')
+    parser.add_argument('--time', type=int, default=15, help='Solver time limit in seconds (default 15)')
+    args = parser.parse_args()
+
+    with open(args.input_file, 'r', encoding='utf-8') as f:
+        config_input = json.load(f)
+    result = run_pipeline(config_input, mode=args.mode, joint=args.joint,
+                          offsets=args.offsets, time_limit=args.time)
+    output = build_output(result["input"], result["ctx"], result["status_code"],
+                          result["solver_result"], result["assignments"], result["violations"])
+    output["configuration"] = result["configuration"]
+    output["meta"]["warnings"] = result["warnings"]
+    with open(args.output_file, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"✓ Roster: {output['score']} → {args.output_file}")
+
+
+if __name__ == '__main__':
+    main()
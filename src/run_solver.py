@@ -6,14 +6,16 @@ from datetime import datetime
 from collections import defaultdict
 from context.engine.data_loader import load_input
 from context.engine.solver_engine import solve
-from context.engine.time_utils import split_shift_hours
+from context.engine.time_utils import shape_of
+from context.engine.profiling import PhaseProfiler, phase_context, profiling_enabled_by_env
+from src.output_store import OutputStore
 
 def compute_input_hash(input_data):
     """Compute SHA256 hash of input JSON (excluding non-serializable runtime data)."""
     # Remove runtime-added keys that aren't part of original input
     clean_data = {k: v for k, v in input_data.items() 
                   if k not in ['slots', 'x', 'model', 'timeLimit', 'unassigned', 'total_unassigned', 
-                               'offset_vars', 'optimized_offsets']}
+                               'offset_vars', 'optimized_offsets', 'x_by_slot', 'slot_table', 'phase_timings', 'model_stats', 'profiler', 'capacity', 'numWorkers', 'randomSeed', 'deterministicTimeLimit']}
     json_str = json.dumps(clean_data, sort_keys=True)
     return "sha256:" + hashlib.sha256(json_str.encode()).hexdigest()
 
@@ -27,7 +29,8 @@ def build_output_schema(input_path, ctx, status, solver_result, assignments, vio
     {
       "schemaVersion": "0.4",
       "planningReference": (from input),
-      "solverRun": { runId, solverVersion, startedAt, ended, durationSeconds, status },
+      "solverRun": { runId, solverVersion, startedAt, ended, durationSeconds, status,
+                     timeLimitSec, numVars, numConstraints, modelBreakdown, capacity, coverage },
       "score": { overall, hard, soft },
       "scoreBreakdown": { hard: {violations}, soft: {constraint_scores} },
       "assignments": [],  # Now includes hour breakdowns
@@ -55,14 +58,21 @@ def build_output_schema(input_path, ctx, status, solver_result, assignments, vio
     employee_weekly_normal = defaultdict(float)  # emp_id -> total normal hours for week
     employee_monthly_ot = defaultdict(float)     # emp_id -> total OT hours for month
     
+    # Hour breakdowns come from the slot's interned ShiftShape (a table lookup)
+    slots_by_id = {s.slot_id: s for s in ctx.get('slots', [])}
+    
     for assignment in assignments:
         # Parse start and end datetimes
         try:
-            start_dt = datetime.fromisoformat(assignment.get('startDateTime'))
-            end_dt = datetime.fromisoformat(assignment.get('endDateTime'))
+            slot = slots_by_id.get(assignment.get('slotId'))
+            if slot is not None:
+                shape = slot.shape
+            else:
+                shape = shape_of(datetime.fromisoformat(assignment.get('startDateTime')),
+                                 datetime.fromisoformat(assignment.get('endDateTime')))
             
             # Calculate hour breakdown
-            hours_dict = split_shift_hours(start_dt, end_dt)
+            hours_dict = shape.as_dict()
             
             # Add hour breakdown to assignment
             assignment['hours'] = {
@@ -132,7 +142,13 @@ def build_output_schema(input_path, ctx, status, solver_result, assignments, vio
             "startedAt": solver_result["start_timestamp"],
             "ended": solver_result["end_timestamp"],
             "durationSeconds": solver_result["duration_seconds"],
-            "status": solver_result["status"]
+            "status": solver_result["status"],
+            "timeLimitSec": solver_result.get("time_limit_sec"),
+            "numVars": solver_result.get("num_vars"),
+            "numConstraints": solver_result.get("num_constraints"),
+            "modelBreakdown": solver_result.get("model_breakdown", []),
+            "capacity": solver_result.get("capacity"),
+            "coverage": solver_result.get("coverage")
         },
         "score": {
             "overall": scores.get('overall', 0),
@@ -160,6 +176,8 @@ def main():
     ap.add_argument("--in", dest="infile", required=True)
     ap.add_argument("--out", dest="outfile", required=False, default=None)
     ap.add_argument("--time", dest="time_limit", type=int, default=15)
+    ap.add_argument("--profile", action="store_true",
+                    help="Profile each solve phase (cProfile + tracemalloc); writes .pstats to output/profiles")
     args = ap.parse_args()
 
     # Resolve input file path (support both direct and input/ folder)
@@ -167,25 +185,23 @@ def main():
     if not infile_path.exists():
         infile_path = pathlib.Path("input") / args.infile
     
-    # Generate or resolve output file path
-    if args.outfile is None:
-        # Auto-generate timestamp-based filename: output_DDMM_HHmm.json
-        now = datetime.now()
-        timestamp = now.strftime("%d%m_%H%M")
-        outfile_name = f"output_{timestamp}.json"
-        outfile_path = pathlib.Path("output") / outfile_name
-    else:
-        # Resolve output file path (support both direct and output/ folder)
+    # Output goes through the store: orjson, atomic rename, OUTPUT_* env settings
+    store = OutputStore.from_env(indent=True)
+
+    # Resolve explicit output file path (support both direct and output/ folder);
+    # without --out the store picks a collision-free name
+    outfile_path = None
+    if args.outfile is not None:
         outfile_path = pathlib.Path(args.outfile)
         if str(outfile_path.parent) == ".":
-            outfile_path = pathlib.Path("output") / args.outfile
-    
-    # Ensure output directory exists
-    outfile_path.parent.mkdir(parents=True, exist_ok=True)
+            outfile_path = store.root / args.outfile
 
     # Load input
     ctx = load_input(str(infile_path))
     ctx["timeLimit"] = args.time_limit
+    profiler = None
+    if args.profile or profiling_enabled_by_env():
+        profiler = ctx["profiler"] = PhaseProfiler(dump_dir=store.root / "profiles")
 
     # TODO: optionally validate against context/schemas/input.schema.json
 
@@ -193,15 +209,27 @@ def main():
     status, solver_result, assignments, violations = solve(ctx)
 
     # Build output in expected schema format
-    output = build_output_schema(str(infile_path), ctx, status, solver_result, assignments, violations)
+    with phase_context(ctx)("output_build"):
+        output = build_output_schema(str(infile_path), ctx, status, solver_result, assignments, violations)
+    if profiler is not None:
+        profiler.close()
+        output['meta']['profile'] = profiler.report()
 
-    # Write output
-    outfile_path.write_text(json.dumps(output, indent=2), encoding="utf-8")
+    # Write output (CLI waits for the write before exiting)
+    outfile_path = store.save_sync(
+        output, input_hash=output['meta']['inputHash'], path=outfile_path
+    )
+    store.close()
     print(f"✓ Solve status: {solver_result['status']} → wrote {outfile_path}")
     print(f"  Assignments: {len(assignments)}")
     print(f"  Hard score: {output['score']['hard']}")
     print(f"  Soft score: {output['score']['soft']}")
     print(f"  Overall score: {output['score']['overall']}")
+    if profiler is not None:
+        print(f"  Profile (pstats in {store.root / 'profiles'}):")
+        for phase in profiler.phases:
+            hottest = phase['topFunctions'][0]['function'] if phase['topFunctions'] else '-'
+            print(f"    {phase['phase']:<13} {phase['wallMs']:>9.1f} ms  peak {phase['peakMemoryMB']:>7.2f} MB  {hottest}")
 
 if __name__ == "__main__":
     main()
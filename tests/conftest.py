@@ -0,0 +1,58 @@
+"""Shared fixtures and helpers for the engine tests."""
+
+import contextlib
+import io
+
+import pytest
+
+
+def quiet(fn, *args, **kwargs):
+    """Call ``fn`` with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def unassigned(assignments):
+    """Roster entries without an employee."""
+    return [a for a in assignments if not a.get("employeeId")]
+
+
+@pytest.fixture
+def small_input():
+    """Two days, one requirement with headcount 2, three employees."""
+    return {
+        "planningHorizon": {"startDate": "2025-12-01", "endDate": "2025-12-02"},
+        "demandItems": [{
+            "demandId": "DMD1",
+            "locationId": "LOC1",
+            "ouId": "OU1",
+            "shiftStartDate": "2025-12-01",
+            "shifts": [{
+                "shiftDetails": [{"shiftCode": "D", "start": "08:00", "end": "20:00"}],
+                "coverageDays": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+            }],
+            "requirements": [{
+                "requirementId": "R1",
+                "rankId": "APO",
+                "headcount": 2,
+                "workPattern": ["D", "D", "O"],
+            }],
+        }],
+        "employees": [{"employeeId": f"E{i}"} for i in range(3)],
+    }
+
+
+@pytest.fixture
+def week_input(request, small_input):
+    """Six days, headcount 2 on a DDO rotation, three APO employees.
+
+    Offsets default to 0 for everyone (all off on days 3 and 6); parametrize
+    indirectly with a tuple of three offsets to spread them.
+    """
+    offsets = getattr(request, "param", (0, 0, 0))
+    small_input["planningHorizon"]["endDate"] = "2025-12-06"
+    small_input["timeLimit"] = 5
+    small_input["employees"] = [
+        {"employeeId": f"E{i}", "rankId": "APO", "rotationOffset": offset} for i, offset in enumerate(offsets)
+    ]
+    return small_input
@@ -0,0 +1,74 @@
+"""Tests for request decompression, body size caps and chunked upload reading."""
+
+import asyncio
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.api_server import RequestDecompressionMiddleware, load_json_from_upload
+
+
+async def _echo(request: Request):
+    body = await request.body()
+    return JSONResponse({
+        "size": len(body),
+        "encoding": request.headers.get("content-encoding"),
+        "payload": json.loads(body) if body else None,
+    })
+
+
+def _client(max_body_size=10_000):
+    app = Starlette(routes=[Route("/echo", _echo, methods=["POST"])])
+    app.add_middleware(RequestDecompressionMiddleware, max_body_size=max_body_size)
+    app.add_middleware(GZipMiddleware, minimum_size=100)
+    return TestClient(app)
+
+
+PAYLOAD = {"demandItems": [{"shiftCode": "D"}] * 200}
+RAW = json.dumps(PAYLOAD).encode()
+
+
+@pytest.mark.parametrize("encoding, body", [
+    ("gzip", gzip.compress(RAW)),
+    ("deflate", zlib.compress(RAW)),
+    ("deflate", zlib.compress(RAW)[2:-4]),  # raw deflate, no zlib header
+])
+def test_compressed_bodies_are_decoded(encoding, body):
+    response = _client().post("/echo", content=body, headers={"content-encoding": encoding})
+    assert response.status_code == 200
+    assert response.json()["payload"] == PAYLOAD
+    assert response.json()["encoding"] is None
+    # Response is gzip-negotiated (httpx decodes it transparently)
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_compression_bomb_is_rejected():
+    bomb = gzip.compress(b" " * 1_000_000)
+    response = _client().post("/echo", content=bomb, headers={"content-encoding": "gzip"})
+    assert response.status_code == 413
+
+
+def test_oversized_plain_body_and_unknown_encoding():
+    client = _client(max_body_size=100)
+    assert client.post("/echo", content=RAW).status_code == 413
+    assert client.post("/echo", content=RAW, headers={"content-encoding": "br"}).status_code == 415
+
+
+def test_upload_is_read_in_chunks_under_cap():
+    upload = UploadFile(io.BytesIO(gzip.compress(RAW)), filename="input.json.gz")
+    assert asyncio.run(load_json_from_upload(upload, max_size=len(RAW))) == PAYLOAD
+
+    too_big = UploadFile(io.BytesIO(RAW), filename="input.json")
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(load_json_from_upload(too_big, max_size=100))
+    assert exc.value.status_code == 413
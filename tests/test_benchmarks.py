@@ -0,0 +1,87 @@
+"""Tests for the baseline comparison in benchmarks/run_benchmarks.py."""
+
+import copy
+import json
+import pathlib
+
+from benchmarks.run_benchmarks import CASES, PHASES, RssSampler, compare
+
+
+def _result(wall_ms=100.0, rss_mb=100.0, vars_=1000, hard=0, unassigned=0):
+    return {
+        "phases": {phase: {"wallMs": wall_ms, "peakRssMB": rss_mb} for phase in PHASES},
+        "model": {"slots": 10, "employees": 5, "vars": vars_, "constraints": 2000},
+        "quality": {"status": "OPTIMAL", "hard": hard, "soft": 0, "assigned": 10,
+                    "unassigned": unassigned, "objectiveGap": 0.0},
+    }
+
+
+def test_within_tolerance_is_clean():
+    baseline = {"cases": {"c": _result()}}
+    assert compare(baseline, {"c": _result(wall_ms=140.0, rss_mb=110.0)}) == []
+
+
+def test_slow_phase_is_reported():
+    baseline = {"cases": {"c": _result(wall_ms=1000.0)}}
+    current = _result(wall_ms=1000.0)
+    current["phases"]["apply_constraints"]["wallMs"] = 2000.0
+
+    regressions = compare(baseline, {"c": current})
+    assert len(regressions) == 1
+    assert "apply_constraints wall time" in regressions[0]
+
+
+def test_absolute_floor_ignores_tiny_phases():
+    baseline = {"cases": {"c": _result(wall_ms=2.0)}}
+    # 10x slower, but only 18 ms more: below the 50 ms floor
+    assert compare(baseline, {"c": _result(wall_ms=20.0)}) == []
+
+
+def test_model_growth_and_quality_loss_are_reported():
+    baseline = {"cases": {"c": _result()}}
+    regressions = compare(baseline, {"c": _result(vars_=5000, hard=2, unassigned=2)})
+    assert any("model vars" in r for r in regressions)
+    assert any("hard" in r for r in regressions)
+    assert any("unassigned" in r for r in regressions)
+
+
+def test_quality_at_the_proven_minimum_is_clean():
+    baseline = {"cases": {"c": _result()}}
+    current = _result(hard=2, unassigned=2)
+    current["quality"]["minUnassigned"] = 2
+    assert compare(baseline, {"c": current}) == []
+    current["quality"]["minUnassigned"] = 1
+    assert len(compare(baseline, {"c": current})) == 2
+
+
+def test_cases_pin_the_solver():
+    from benchmarks.run_benchmarks import SOLVER_PINS
+    assert SOLVER_PINS["numWorkers"] == 1 and SOLVER_PINS["randomSeed"] is not None
+    assert any(case.get("generate", {}).get("num_employees", 0) >= 500
+               for case in CASES.values() if case["tier"] == "full")
+
+
+def test_only_shared_cases_and_phases_are_compared():
+    base = _result()
+    del base["phases"]["extract"]
+    current = _result()
+    current["phases"]["extract"]["wallMs"] = 10_000.0
+    assert compare({"cases": {"c": base}}, {"c": current, "new_case": _result(hard=9)}) == []
+
+
+def test_peak_rss_window():
+    sampler = RssSampler()
+    sampler.samples = [(0.0, 100e6), (1.0, 300e6), (2.0, 150e6)]
+    assert sampler.peak_mb(0.5, 2.5) == 300.0
+    # No sample inside the window: fall back to the last one before it
+    assert sampler.peak_mb(2.1, 2.2) == 150.0
+
+
+def test_committed_baseline_covers_quick_tier():
+    path = pathlib.Path(__file__).resolve().parents[1] / "benchmarks" / "baseline.json"
+    baseline = json.loads(path.read_text())
+    quick = {name for name, case in CASES.items() if case["tier"] == "quick"}
+    assert quick <= set(baseline["cases"])
+    for case in baseline["cases"].values():
+        assert set(case["phases"]) <= set(PHASES)
+        assert compare(baseline, copy.deepcopy(baseline["cases"])) == []
@@ -0,0 +1,76 @@
+"""Tests for context/engine/capacity_analysis (pre-solve capacity bounds)."""
+
+import pytest
+
+from conftest import quiet, unassigned
+from context.engine.capacity_analysis import analyze_capacity, max_flow
+from context.engine.solver_engine import solve
+
+
+def test_max_flow_reroutes_greedy_choices():
+    # Group 0 can serve either requirement; greedy sends it to requirement 0,
+    # which strands group 1 unless the flow is rerouted
+    assert max_flow([1, 1], [1, 1], [[0, 1], [0]]) == 2
+    assert max_flow([3], [1, 1], [[0, 1]]) == 2
+    assert max_flow([2, 2], [3], [[0], []]) == 2
+
+
+def test_rotation_off_days_are_unfillable(week_input):
+    report = quiet(analyze_capacity, week_input)
+    # Everyone is off on days 3 and 6: both positions of those days are lost
+    assert report["totalSlots"] == 12
+    assert report["upperBound"] == 8
+    assert report["unfillable"] == report["shortfall"] == 4
+    assert sorted(day["date"] for day in report["days"]) == ["2025-12-03", "2025-12-06"]
+    assert len(report["fixedSlotIds"]) == 4
+    assert report["employeeGroups"] == 1
+
+    # With offsets left to CP-SAT every employee may work any day
+    assert quiet(analyze_capacity, week_input, rotation=False)["upperBound"] == 12
+
+
+@pytest.mark.parametrize("week_input", [(0, 1, 2)], indirect=True)
+def test_qualification_shortage_fixes_the_highest_positions(week_input):
+    week_input["demandItems"][0]["requirements"][0]["requiredQualifications"] = ["FRISKING"]
+    week_input["employees"][0]["qualifications"] = [{"code": "FRISKING", "expiryDate": "2026-12-31"}]
+    report = quiet(analyze_capacity, week_input)
+    # E0 works days 1, 2, 4, 5: one of two positions there, none on days 3 and 6
+    assert report["upperBound"] == 4
+    assert report["unfillable"] == 8
+    # Both positions on E0's off days, only the second one on E0's work days
+    fixed = report["fixedSlotIds"]
+    assert len(fixed) == 8
+    assert sum("-P0-" in slot_id for slot_id in fixed) == 2
+    group = report["groups"][0]
+    assert (group["required"], group["eligible"], group["qualifications"]) == (2, 0, ["FRISKING"])
+
+
+def test_unfillable_slots_get_no_variables(week_input):
+    _, result, assignments, _ = quiet(solve, week_input)
+    plain = dict(week_input, capacityAnalysis=False)
+    _, plain_result, plain_assignments, _ = quiet(solve, plain)
+
+    assert len(unassigned(assignments)) == len(unassigned(plain_assignments)) == 4
+    assert result["num_vars"] < plain_result["num_vars"]
+    assert result["capacity"]["unfillable"] == 4
+    assert "fixedSlotIds" not in result["capacity"]
+    assert all(a["reason"].startswith("Fewer eligible") for a in unassigned(assignments))
+    assert {v["id"] for v in result["scoreBreakdown"]["hard"]["violations"]} == {"hard-capacity"}
+
+
+def test_fast_fail_skips_the_solver(week_input):
+    week_input["capacityFastFail"] = True
+    status, result, assignments, _ = quiet(solve, week_input)
+    assert result["fastFail"] is True
+    assert result["status"] == "INFEASIBLE"
+    assert result["scores"]["hard"] == 4
+    assert result["num_vars"] == 0
+    assert assignments == []
+
+    # Fully coverable inputs are solved as usual
+    for emp, offset in zip(week_input["employees"], (0, 1, 2)):
+        emp["rotationOffset"] = offset
+    _, result, assignments, _ = quiet(solve, week_input)
+    assert "fastFail" not in result
+    assert result["scores"]["hard"] == 0
+    assert assignments and not unassigned(assignments)
@@ -0,0 +1,55 @@
+"""Tests for context/engine/compiled_model (build once, re-solve under bounds)."""
+
+import copy
+
+from conftest import quiet, unassigned
+from context.engine.compiled_model import CompiledModel
+from context.engine.solver_engine import solve
+
+
+def test_resolve_matches_fresh_solve(week_input):
+    compiled = quiet(CompiledModel, week_input)
+    spread = {"E0": 0, "E1": 1, "E2": 2}
+    for offsets in (None, spread):
+        fresh = dict(week_input)
+        if offsets:
+            fresh["employees"] = [dict(e, rotationOffset=offsets[e["employeeId"]]) for e in week_input["employees"]]
+        _, expected, expected_assignments, _ = quiet(solve, fresh)
+        _, result, assignments, _ = quiet(compiled.solve, offsets=offsets)
+        assert len(unassigned(assignments)) == len(unassigned(expected_assignments))
+        assert result["scores"]["hard"] == expected["scores"]["hard"]
+    assert len(unassigned(assignments)) == 0
+    assert compiled.solves == 2
+
+
+def test_only_changed_bounds_are_rewritten(week_input):
+    compiled = quiet(CompiledModel, week_input)
+    first = quiet(compiled.solve)[1]["bounds_changed"]
+    assert first > 0
+    assert quiet(compiled.solve)[1]["bounds_changed"] == 0
+    # E2 moves from offset 0 to 1: its off days move from days 3/6 to days 1/4,
+    # two positions each
+    assert quiet(compiled.solve, offsets={"E2": 1})[1]["bounds_changed"] == 8
+
+
+def test_disabled_demands_and_unavailability(week_input):
+    second = copy.deepcopy(week_input["demandItems"][0])
+    second["demandId"] = "DMD2"
+    week_input["demandItems"].append(second)
+    spread = {"E0": 0, "E1": 1, "E2": 2}
+    compiled = quiet(CompiledModel, week_input)
+
+    # Two on duty each day cannot cover both demands...
+    _, _, assignments, _ = quiet(compiled.solve, offsets=spread)
+    assert len(unassigned(assignments)) == 12
+    # ...but cover DMD1 alone; DMD2 is left out of the result
+    _, result, assignments, _ = quiet(compiled.solve, offsets=spread, enabled_demands=["DMD1"])
+    assert {a["demandId"] for a in assignments} == {"DMD1"}
+    assert len(unassigned(assignments)) == 0
+    assert result["scores"]["hard"] == 0
+
+    _, _, assignments, _ = quiet(compiled.solve, offsets=spread, enabled_demands=["DMD1"],
+                                  unavailable={"E0": ["2025-12-01"]})
+    assert not any(a["employeeId"] == "E0" and a["date"] == "2025-12-01" for a in assignments)
+    # E0 was one of the two on duty on day 1, so that slot now goes unfilled
+    assert len(unassigned(assignments)) == 1
@@ -0,0 +1,139 @@
+"""Tests for the exact (CP-SAT) mode of context/engine/config_optimizer."""
+
+import threading
+from datetime import datetime
+
+import pytest
+from ortools.sat.python import cp_model
+
+from conftest import quiet
+from context.engine import config_optimizer
+from context.engine.config_optimizer import (
+    exact_pattern_issues,
+    format_output_config,
+    max_consecutive_work_days,
+    optimize_all_requirements,
+    optimize_requirement_config,
+    optimize_requirement_exact,
+)
+
+ANCHOR = datetime(2025, 12, 1)
+HORIZON = {"startDate": "2025-12-01", "endDate": "2025-12-31"}
+
+
+def test_pattern_checks_wrap_around_the_cycle():
+    assert max_consecutive_work_days(list("DDOODD")) == 4
+    assert max_consecutive_work_days(list("DDDDDD")) > 6
+    # 6 work days in the busiest week: 66h against 44h normal + 16.6h OT
+    assert exact_pattern_issues(list("DDDDDO"), {}, 11.0) == ["66h in the busiest week (max: 60.6h)"]
+    assert any("off days" in issue for issue in exact_pattern_issues(list("DDDDOO"), {"minOffDaysPerWeek": 3}, 11.0))
+    assert exact_pattern_issues(list("DDDOOO"), {}, 11.0) == []
+
+
+@pytest.mark.parametrize("headcount", [1, 2, 4, 5])
+def test_exact_covers_every_day_with_no_more_staff_than_heuristic(headcount):
+    requirement = {"id": "R", "shiftTypes": ["D"], "headcountPerDay": headcount}
+    exact = quiet(optimize_requirement_exact, requirement, {}, 31, ANCHOR)
+    heuristic = quiet(optimize_requirement_config, requirement, {}, 31, ANCHOR)
+
+    assert exact['status'] == "OPTIMAL"
+    assert exact['coverage']['daysUndercovered'] == 0
+    assert len(exact['offsets']) == exact['employeeCount']
+    assert exact['employeeCount'] <= heuristic['employeeCount']
+    assert exact_pattern_issues(exact['pattern'], {}, 11.0) == []
+
+
+def test_exact_minimum_is_tight():
+    # 2 on duty every day with at most 4 work days per 6 needs 3 employees
+    requirement = {"id": "R", "shiftTypes": ["D"], "headcountPerDay": 2}
+    config = quiet(optimize_requirement_exact, requirement, {}, 31, ANCHOR)
+    assert config['employeeCount'] == 3
+
+
+def test_exact_returns_none_when_no_pattern_is_feasible():
+    requirement = {"id": "R", "shiftTypes": ["D"], "headcountPerDay": 2}
+    constraints = {"maxConsecutiveWorkDays": 0, "cycleLengths": [6]}
+    assert quiet(optimize_requirement_exact, requirement, constraints, 31, ANCHOR) is None
+
+
+def test_exact_is_unproven_when_a_pattern_times_out(monkeypatch):
+    solve_pattern = config_optimizer._solve_pattern_exact
+    calls = []
+
+    def first_times_out(*args):
+        calls.append(args[0])
+        return (cp_model.UNKNOWN, None) if len(calls) == 1 else solve_pattern(*args)
+
+    monkeypatch.setattr(config_optimizer, "_solve_pattern_exact", first_times_out)
+    requirement = {"id": "R", "shiftTypes": ["D"], "headcountPerDay": 2}
+    config = quiet(optimize_requirement_exact, requirement, {}, 31, ANCHOR)
+    assert len(calls) > 1
+    assert config['pattern'] != calls[0]
+    assert config['status'] == "FEASIBLE"
+
+
+def test_optimize_all_requirements_modes():
+    requirements = [{"id": "R1", "name": "Day", "shiftTypes": ["D"], "headcountPerDay": 4}]
+    result = quiet(optimize_all_requirements, requirements, {}, HORIZON, mode="exact")
+    assert result['summary']['mode'] == "exact"
+    assert result['requirements']['R1']['mode'] == "exact"
+
+    with pytest.raises(ValueError):
+        quiet(optimize_all_requirements, requirements, {}, HORIZON, mode="fastest")
+
+
+def _site_requirements():
+    return [
+        {"id": f"R{i}", "name": f"Req {i}", "productType": "APO", "rank": "APO",
+         "scheme": "A" if i % 3 else "B", "shiftTypes": ["D"] if i % 2 else ["N"],
+         "headcountPerDay": 1 + i % 3}
+        for i in range(8)
+    ]
+
+
+def test_parallel_results_match_serial():
+    requirements = _site_requirements()
+    serial = quiet(optimize_all_requirements, requirements, {}, HORIZON, workers=1)
+    parallel = quiet(optimize_all_requirements, requirements, {}, HORIZON, workers=2)
+    assert parallel == serial
+    assert list(parallel['requirements']) == [r['id'] for r in requirements]
+
+
+def test_joint_mode_shares_employees_within_a_pool():
+    requirements = [
+        {"id": "N1", "name": "Night 1", "productType": "APO", "rank": "APO", "scheme": "A",
+         "shiftTypes": ["N"], "headcountPerDay": 1},
+        {"id": "N2", "name": "Night 2", "productType": "APO", "rank": "APO", "scheme": "A",
+         "shiftTypes": ["N"], "headcountPerDay": 1},
+        {"id": "S1", "name": "Other scheme", "productType": "APO", "rank": "APO", "scheme": "B",
+         "shiftTypes": ["N"], "headcountPerDay": 1},
+    ]
+    separate = quiet(optimize_all_requirements, requirements, {}, HORIZON, mode="exact")
+    joint = quiet(optimize_all_requirements, requirements, {}, HORIZON, mode="exact", joint=True)
+
+    assert joint['summary']['totalEmployees'] < separate['summary']['totalEmployees']
+    (pool,) = joint['summary']['sharedPools']
+    assert pool['requirementIds'] == ["N1", "N2"]
+    lead, member = joint['requirements']['N1'], joint['requirements']['N2']
+    assert lead['employeeCount'] == pool['employeeCount'] < pool['separateEmployeeCount']
+    assert lead['coverage']['requiredPerDay'] == 2
+    assert lead['coverage']['daysUndercovered'] == 0
+    assert member['employeeCount'] == 0 and member['sharedPool']['lead'] == "N1"
+    assert joint['requirements']['S1'] == separate['requirements']['S1']
+
+    formatted = format_output_config(joint, requirements)
+    assert formatted['recommendations'][0]['configuration']['sharedPool']['poolId'] == "POOL:N1+N2"
+
+
+def test_concurrent_callers_share_one_pool():
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(config_optimizer._executor(3))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(pool) for pool in pools}) == 1
+    config_optimizer.shutdown_executors()
+    assert config_optimizer._executors == {}
+    assert config_optimizer._executor(3) is not pools[0]
+    config_optimizer.shutdown_executors()
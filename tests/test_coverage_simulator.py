@@ -0,0 +1,93 @@
+"""Tests for the vectorised coverage simulator and its use in config_optimizer."""
+
+import contextlib
+import io
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from context.engine.config_optimizer import optimize_all_requirements, optimize_requirement_config
+from context.engine.coverage_simulator import (
+    evaluate_candidates,
+    offset_counts,
+    pattern_bitmask,
+    simulate_coverage,
+    work_matrix,
+)
+
+ANCHOR = datetime(2025, 12, 1)
+
+
+def _reference_coverage(pattern, employee_count, offsets, days):
+    """The original per-day x per-employee loop."""
+    cycle = len(pattern)
+    result = []
+    for day in range(days):
+        on_duty = 0
+        for emp in range(employee_count):
+            offset = offsets[emp] if emp < len(offsets) else emp % cycle
+            on_duty += pattern[(day - offset) % cycle] != 'O'
+        result.append(on_duty)
+    return result
+
+
+def test_pattern_bitmask_round_trip():
+    pattern = ["D", "D", "O", "N", "N", "O"]
+    mask = pattern_bitmask(pattern)
+    assert mask == 0b011011
+    assert work_matrix([mask], 6).tolist() == [[1, 1, 0, 1, 1, 0]]
+
+
+def test_simulate_coverage_matches_reference_loop():
+    cases = [
+        (["D", "D", "D", "D", "O", "O"], 7, [0, 1, 2, 3, 4, 5, 0], 31),
+        (["N", "N", "O", "N", "N", "O", "O"], 5, [3, 3], 30),   # short offset list -> default i % L
+        (["D", "O", "D", "O", "D", "O"], 4, [-1, 8, 2, 2], 10),  # offsets outside [0, L)
+    ]
+    for pattern, count, offsets, days in cases:
+        coverage = simulate_coverage(pattern, count, offsets, 2, days, ANCHOR)
+        expected = _reference_coverage(pattern, count, offsets, days)
+        assert list(coverage['coverageMap'].values()) == expected
+        assert coverage['daysFullyCovered'] == sum(1 for c in expected if c >= 2)
+        assert coverage['totalDays'] == days
+
+
+def test_evaluate_candidates_scores_patterns_by_offset_vectors():
+    patterns = [list("DDDOOO"), list("DDODDO")]
+    counts = np.stack([offset_counts([0, 1], 6), offset_counts([0, 3], 6)])  # (V=2, L=6)
+    stats = evaluate_candidates(patterns, counts, headcount_per_day=1, days_in_horizon=12)
+
+    assert stats['coverageRate'].shape == (2, 2)
+    # DDDOOO needs the two employees half a cycle apart to cover every day
+    assert stats['coverageRate'][0].tolist() == [pytest.approx(200 / 3), 100.0]
+    assert stats['variance'][0, 1] == 0.0
+
+
+def test_optimizer_spreads_offsets_and_searches_cycle_lengths():
+    requirement = {"id": "R1", "shiftTypes": ["N"], "headcountPerDay": 1}
+    with contextlib.redirect_stdout(io.StringIO()):
+        config = optimize_requirement_config(requirement, {}, 30, ANCHOR)
+        wider = optimize_requirement_config(dict(requirement, cycleLengths=[6, 7, 8]), {}, 30, ANCHOR)
+
+    assert config['coverage']['coverageRate'] == 100.0
+    assert config['employeeCount'] == 2
+    assert sorted(config['offsets']) == [0, 3]
+    assert len(wider['pattern']) in (6, 7, 8)
+    assert wider['score'] <= config['score']
+
+
+def test_optimize_all_requirements_summary():
+    requirements = [
+        {"id": "R1", "name": "Day", "shiftTypes": ["D"], "headcountPerDay": 3},
+        {"id": "R2", "name": "Night", "shiftTypes": ["N"], "headcountPerDay": 1},
+    ]
+    horizon = {"startDate": "2025-12-01", "endDate": "2025-12-31"}
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimize_all_requirements(requirements, {"cycleLengths": [6, 7]}, horizon)
+
+    configs = result['requirements']
+    assert set(configs) == {"R1", "R2"}
+    assert result['summary']['totalEmployees'] == sum(c['employeeCount'] for c in configs.values())
+    for config in configs.values():
+        assert len(config['offsets']) == config['employeeCount']
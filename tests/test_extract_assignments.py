@@ -0,0 +1,48 @@
+"""Tests for bulk solution extraction in solver_engine.extract_assignments."""
+
+from ortools.sat.python import cp_model
+
+from context.engine.slot_builder import build_slots
+from context.engine.solver_engine import extract_assignments
+
+
+def test_extract_reads_only_true_values(small_input):
+    ctx = small_input
+    slots = build_slots(ctx)
+    ctx['slots'] = slots
+    model = cp_model.CpModel()
+    x, x_by_slot, unassigned = {}, {}, {}
+    for slot in slots:
+        x_by_slot[slot.slot_id] = []
+        for emp in ctx['employees']:
+            var = model.NewBoolVar(f"x[{slot.slot_id}][{emp['employeeId']}]")
+            x[(slot.slot_id, emp['employeeId'])] = var
+            x_by_slot[slot.slot_id].append((emp['employeeId'], var))
+        unassigned[slot.slot_id] = model.NewBoolVar(f"u[{slot.slot_id}]")
+        model.Add(sum(v for _, v in x_by_slot[slot.slot_id]) + unassigned[slot.slot_id] == 1)
+
+    # Day 1: both positions filled by E0/E1; day 2: only E2 available
+    day1 = [s for s in slots if s.date.day == 1]
+    day2 = [s for s in slots if s.date.day == 2]
+    model.Add(x[(day1[0].slot_id, 'E0')] == 1)
+    model.Add(x[(day1[1].slot_id, 'E1')] == 1)
+    model.Add(x[(day2[0].slot_id, 'E2')] == 1)
+    model.Add(unassigned[day2[1].slot_id] == 1)
+
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+    ctx.update(x=x, x_by_slot=x_by_slot, unassigned=unassigned)
+    assignments = extract_assignments(ctx, solver)
+
+    assert [a['slotId'] for a in assignments] == [s.slot_id for s in slots]
+    by_slot = {a['slotId']: a for a in assignments}
+    assert by_slot[day1[0].slot_id]['employeeId'] == 'E0'
+    assert by_slot[day1[1].slot_id]['employeeId'] == 'E1'
+    assert by_slot[day2[0].slot_id]['employeeId'] == 'E2'
+    assert by_slot[day2[1].slot_id]['employeeId'] is None
+    assert by_slot[day2[1].slot_id]['status'] == 'UNASSIGNED'
+
+    # Falls back to deriving the index from x when x_by_slot is absent
+    del ctx['x_by_slot']
+    assert extract_assignments(ctx, solver) == assignments
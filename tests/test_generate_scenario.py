@@ -0,0 +1,41 @@
+"""Tests for the synthetic scenario generator."""
+
+from context.engine.slot_builder import build_slot_table
+from src.generate_scenario import employees_for_headcount, generate_scenario, staggered_offsets
+
+
+def test_seeded_generation_is_deterministic_and_sized():
+    a = generate_scenario(num_employees=300, num_demands=8, horizon_days=14, seed=11)
+    b = generate_scenario(num_employees=300, num_demands=8, horizon_days=14, seed=11)
+    c = generate_scenario(num_employees=300, num_demands=8, horizon_days=14, seed=12)
+
+    assert a == b and a != c
+    assert len(a["employees"]) == 300
+    assert len({e["employeeId"] for e in a["employees"]}) == 300
+    assert a["planningHorizon"] == {"startDate": "2025-12-01", "endDate": "2025-12-14"}
+
+
+def test_every_requirement_is_staffable():
+    scenario = generate_scenario(num_employees=200, num_demands=6, horizon_days=14, seed=3,
+                                 qualification_rate=1.0, whitelist_rate=1.0)
+    for item in scenario["demandItems"]:
+        codes = {s["shiftCode"] for s in item["shifts"][0]["shiftDetails"]}
+        team = item["shifts"][0]["whitelist"]["teamIds"][0]
+        for req in item["requirements"]:
+            assert set(req["workPattern"]) - {"O"} <= codes
+            pool = [
+                e for e in scenario["employees"]
+                if e["teamId"] == team and e["scheme"] == req["Scheme"] and e["rankId"] == req["rankId"]
+                and (req["gender"] not in ("M", "F") or e["gender"] == req["gender"])
+                and set(req["requiredQualifications"]) <= {q["code"] for q in e["qualifications"]}
+            ]
+            assert len(pool) >= employees_for_headcount(req["headcount"], req["workPattern"])
+
+    assert len(build_slot_table(scenario)) > 0
+
+
+def test_staggered_offsets_cover_headcount_every_day():
+    pattern = list("NNNNOO")
+    offsets = staggered_offsets(employees_for_headcount(3, pattern), pattern)
+    coverage = [sum(pattern[(c - o) % 6] != "O" for o in offsets) for c in range(6)]
+    assert min(coverage) >= 3
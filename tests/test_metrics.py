@@ -0,0 +1,47 @@
+"""Tests for the in-process metrics registry and solve() instrumentation."""
+
+from context.engine import metrics
+from context.engine.data_loader import load_input
+from context.engine.solver_engine import solve
+
+
+def test_histogram_and_counter_exposition():
+    registry = metrics.Registry()
+    hist = registry.register(metrics.Histogram("t_seconds", "Test.", ["phase"], buckets=(0.1, 1)))
+    counter = registry.register(metrics.Counter("t_total", "Test.", ["status"]))
+    hist.observe(0.05, phase="a")
+    hist.observe(0.5, phase="a")
+    counter.inc(status='ok"x')
+
+    text = registry.render()
+    assert '# TYPE t_seconds histogram' in text
+    assert 't_seconds_bucket{phase="a",le="0.1"} 1' in text
+    assert 't_seconds_bucket{phase="a",le="1"} 2' in text
+    assert 't_seconds_bucket{phase="a",le="+Inf"} 2' in text
+    assert 't_seconds_count{phase="a"} 2' in text
+    assert 't_total{status="ok\\"x"} 1' in text
+
+
+def test_solve_records_phases_and_model_size(small_input):
+    before = {p: metrics.PHASE_SECONDS.count(phase=p)
+              for p in ("slot_build", "variables", "base_model", "constraints", "cpsat_solve", "extract", "score")}
+    solves_before = metrics.MODEL_VARIABLES.count()
+
+    ctx = load_input(small_input)
+    ctx["timeLimit"] = 5
+    _, solver_result, _, _ = solve(ctx)
+
+    for phase, count in before.items():
+        assert metrics.PHASE_SECONDS.count(phase=phase) == count + 1, phase
+    assert set(ctx["phase_timings"]) >= set(before)
+    assert metrics.CONSTRAINT_MODULE_SECONDS.count(module="C16_no_overlap") >= 1
+    assert metrics.MODEL_VARIABLES.count() == solves_before + 1
+    assert "ngrs_solves_in_flight 0" in metrics.render()
+
+    # solverRun model-size accounting: per-module deltas add up to the totals
+    breakdown = solver_result["model_breakdown"]
+    assert breakdown[0]["module"] == "build_model"
+    assert {"C2_mom_weekly_hours", "S16_whitelist_blacklist"} <= {m["module"] for m in breakdown}
+    assert sum(m["vars"] for m in breakdown) == solver_result["num_vars"] > 0
+    assert sum(m["constraints"] for m in breakdown) == solver_result["num_constraints"] > 0
+    assert solver_result["time_limit_sec"] == 5
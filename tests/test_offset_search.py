@@ -0,0 +1,51 @@
+"""Tests for context/engine/offset_search (surrogate offset search)."""
+
+from conftest import quiet
+from context.engine import offset_search
+from context.engine.offset_search import OffsetProblem, search_offsets
+
+
+def test_surrogate_counts_rotation_off_days(week_input):
+    problem = quiet(OffsetProblem, week_input)
+    assert problem.total_slots == 12
+    assert problem.classes == [["E0", "E1", "E2"]]
+    assert problem.cycles == [3]
+    # Everyone off on days 3 and 6
+    assert problem.coverage(problem.counts_from_offsets(problem.current)) == 8
+    assert problem.coverage(((1, 1, 1),)) == 12
+
+
+def test_ineligible_employees_form_their_own_class(week_input):
+    week_input["employees"].append({"employeeId": "X", "rankId": "CVSO"})
+    week_input["demandItems"][0]["shifts"][0]["blacklist"] = {"employeeIds": [
+        {"employeeId": "E2", "blacklistStartDate": "2025-12-02", "blacklistEndDate": "2025-12-03"},
+    ]}
+    problem = quiet(OffsetProblem, week_input)
+    assert sorted(problem.classes) == [["E0", "E1"], ["E2"], ["X"]]
+    assert problem.cycles[problem.classes.index(["X"])] == 1
+
+
+def test_search_spreads_offsets_without_solving(week_input):
+    result = quiet(search_offsets, week_input, verify_top=0)
+    assert result["baselineCoverage"] == 8
+    assert result["coverage"] == result["totalSlots"] == 12
+    assert sorted(result["offsets"].values()) == [0, 1, 2]
+    # One employee keeps the input offset
+    assert len(result["changed"]) == 2
+    assert result["unassigned"] is None
+
+
+def test_verification_keeps_the_best_solved_candidate(week_input):
+    result = quiet(search_offsets, week_input, verify_top=1, time_limit=5)
+    assert result["unassigned"] == 0
+    # The input offsets were verified as well and lost
+    assert [c["unassigned"] for c in result["candidates"]] == [0, 4]
+
+
+def test_verification_ties_keep_the_input_offsets(week_input, monkeypatch):
+    # The surrogate ranks the spread offsets first, but both verify equally
+    monkeypatch.setattr(offset_search, "count_unassigned", lambda compiled, offsets, time_limit=None: 4)
+    result = quiet(search_offsets, week_input, verify_top=1, time_limit=5)
+    assert [c["coverage"] for c in result["candidates"]] == [12, 8]
+    assert result["changed"] == []
+    assert result["offsets"] == {"E0": 0, "E1": 0, "E2": 0}
@@ -0,0 +1,52 @@
+"""Tests for the matrix output format and fields= projection."""
+
+from src.output_builder import build_matrix_output, parse_fields, project_assignments
+
+
+def _output():
+    return {
+        "score": {"hard": 0, "soft": 0, "overall": 0},
+        "assignments": [
+            {"slotId": "S1", "employeeId": "E1", "date": "2025-12-01", "shiftCode": "D",
+             "demandId": "DMD1", "requirementId": "R1", "status": "ASSIGNED"},
+            {"slotId": "S2", "employeeId": "E2", "date": "2025-12-02", "shiftCode": "N",
+             "demandId": "DMD1", "requirementId": "R1", "status": "ASSIGNED"},
+            {"slotId": "S3", "employeeId": None, "date": "2025-12-02", "shiftCode": "D",
+             "demandId": "DMD1", "requirementId": "R1", "status": "UNASSIGNED"},
+        ],
+        "meta": {"inputHash": "sha256:x"},
+    }
+
+
+def test_matrix_uses_input_employee_and_horizon_order():
+    ctx = {
+        "planningHorizon": {"startDate": "2025-12-01", "endDate": "2025-12-03"},
+        "employees": [{"employeeId": "E2"}, {"employeeId": "E1"}, {"employeeId": "E3"}],
+    }
+    matrix = build_matrix_output(_output(), ctx)
+
+    assert matrix["format"] == "matrix" and "assignments" not in matrix
+    assert matrix["roster"] == {
+        "employees": ["E2", "E1", "E3"],
+        "dates": ["2025-12-01", "2025-12-02", "2025-12-03"],
+        "shifts": [[None, "N", None], ["D", None, None], [None, None, None]],
+    }
+    assert matrix["unassigned"] == [
+        {"slotId": "S3", "demandId": "DMD1", "requirementId": "R1", "date": "2025-12-02", "shiftCode": "D"}
+    ]
+    assert matrix["meta"] == {"inputHash": "sha256:x"}
+
+
+def test_matrix_without_ctx_indexes_assignments():
+    matrix = build_matrix_output(_output())
+    assert matrix["roster"]["employees"] == ["E1", "E2"]
+    assert matrix["roster"]["dates"] == ["2025-12-01", "2025-12-02"]
+
+
+def test_fields_projection_leaves_original_untouched():
+    output = _output()
+    projected = project_assignments(output, parse_fields(" employeeId, date ,shiftCode,"))
+
+    assert projected["assignments"][0] == {"employeeId": "E1", "date": "2025-12-01", "shiftCode": "D"}
+    assert "slotId" in output["assignments"][0]
+    assert project_assignments(output, parse_fields("")) is output
@@ -0,0 +1,48 @@
+"""Tests for the NDJSON streaming output in output_builder."""
+
+import copy
+
+import orjson
+
+from context.engine.slot_builder import build_slots
+from src.output_builder import build_output, iter_output_ndjson
+
+
+def _result(small_input):
+    ctx = small_input
+    ctx['slots'] = build_slots(ctx)
+    assignments = [{
+        'slotId': s.slot_id,
+        'employeeId': f"E{i % 2}",
+        'date': s.date.isoformat(),
+        'startDateTime': s.start.isoformat(),
+        'endDateTime': s.end.isoformat(),
+        'status': 'ASSIGNED',
+    } for i, s in enumerate(ctx['slots'])]
+    solver_result = {'status': 'OPTIMAL', 'scores': {'hard': 0, 'soft': 3, 'overall': 3},
+                     'scoreBreakdown': {'hard': {'violations': []}, 'soft': {'S1': 3}}}
+    return ctx, solver_result, assignments
+
+
+def test_ndjson_stream_matches_build_output(small_input):
+    ctx, solver_result, assignments = _result(small_input)
+    expected = build_output(ctx, ctx, 'OPTIMAL', solver_result, copy.deepcopy(assignments), [])
+
+    completed = []
+    chunks = list(iter_output_ndjson(ctx, ctx, 'OPTIMAL', solver_result, assignments, [],
+                                     meta_extra={'requestId': 'r1'}, chunk_size=3,
+                                     on_complete=completed.append))
+    lines = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+
+    header, records, trailer = lines[0], lines[1:-1], lines[-1]
+    assert header.pop('type') == 'header' and trailer.pop('type') == 'trailer'
+    assert header['score'] == expected['score'] and header['solverRun'] == expected['solverRun']
+    assert records == expected['assignments']
+    assert trailer['scoreBreakdown'] == expected['scoreBreakdown']
+    assert trailer['meta']['employeeHours'] == expected['meta']['employeeHours']
+    assert trailer['meta']['requestId'] == 'r1'
+    # header + ceil(4 / 3) assignment chunks + trailer
+    assert len(chunks) == 4
+
+    assert completed[0]['assignments'] == expected['assignments']
+    assert completed[0]['meta'] == trailer['meta']
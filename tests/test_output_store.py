@@ -0,0 +1,46 @@
+"""Tests for src/output_store.OutputStore."""
+
+import os
+import time
+
+from src.output_store import OutputStore, load_output
+
+
+def test_names_are_collision_free_and_written_atomically(tmp_path):
+    store = OutputStore(root=tmp_path)
+    output = {"meta": {"inputHash": "sha256:abcdef0123456789"}, "assignments": [{"slotId": "S1"}]}
+
+    first = store.save(output, request_id="req-1", input_hash="sha256:abcdef0123456789").result()
+    second = store.save(output, request_id="req-2", input_hash="sha256:abcdef0123456789").result()
+    store.close()
+
+    assert first != second
+    assert "abcdef01" in first.name and "req1" in first.name
+    assert load_output(first) == output
+    # No temp files left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([first.name, second.name])
+
+
+def test_gzip_round_trip(tmp_path):
+    store = OutputStore(root=tmp_path, compression="gzip")
+    path = store.save_sync({"score": {"hard": 0}}, request_id="r")
+    store.close()
+
+    assert path.name.endswith(".json.gz")
+    assert load_output(path) == {"score": {"hard": 0}}
+
+
+def test_retention_keeps_newest_files(tmp_path):
+    old = tmp_path / "output_0101_0000_old_x.json"
+    old.write_text("{}")
+    stale = time.time() - 3 * 86400
+    os.utime(old, (stale, stale))
+
+    store = OutputStore(root=tmp_path, max_age_days=1)
+    kept = store.save_sync({}, request_id="a")
+    assert not old.exists() and kept.exists()
+
+    store.max_files = 1
+    newest = store.save_sync({}, request_id="b")
+    store.close()
+    assert [p.name for p in tmp_path.iterdir()] == [newest.name]
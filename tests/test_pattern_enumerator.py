@@ -0,0 +1,75 @@
+"""Tests for context/engine/pattern_enumerator."""
+
+import itertools
+
+import pytest
+
+from context.engine.pattern_enumerator import (
+    cache_info,
+    canonical_rotation,
+    enumerate_patterns,
+    max_consecutive_work_days,
+    peak_weekly_work_days,
+)
+
+
+def _brute_force(shift_types, cycle_length, max_consecutive=12, max_work_per_week=5):
+    """Every pattern, filtered by the same rules, reduced to canonical rotations."""
+    found = set()
+    for pattern in itertools.product(list(shift_types) + ['O'], repeat=cycle_length):
+        work = sum(1 for d in pattern if d != 'O')
+        if not max(1, cycle_length // 2) <= work <= cycle_length - 1:
+            continue
+        mixed_block = any(
+            pattern[i] != 'O' and pattern[(i + 1) % cycle_length] not in ('O', pattern[i])
+            for i in range(cycle_length)
+        )
+        if mixed_block:
+            continue
+        if max_consecutive_work_days(pattern) > max_consecutive:
+            continue
+        if peak_weekly_work_days(pattern) > max_work_per_week:
+            continue
+        found.add(canonical_rotation(pattern, tuple(shift_types)))
+    return found
+
+
+@pytest.mark.parametrize("shift_types", [["D"], ["D", "N"], ["D", "E", "N"]])
+@pytest.mark.parametrize("cycle_length", [5, 6, 7, 8])
+def test_matches_brute_force(shift_types, cycle_length):
+    patterns = enumerate_patterns(shift_types, [cycle_length])
+    assert len(patterns) == len({tuple(p) for p in patterns})  # no duplicates
+    assert {tuple(p) for p in patterns} == _brute_force(shift_types, cycle_length)
+
+
+def test_rotations_are_deduplicated_to_work_first_form():
+    patterns = enumerate_patterns(["D"], [6])
+    assert ["D", "D", "D", "D", "O", "O"] in patterns
+    assert ["O", "O", "D", "D", "D", "D"] not in patterns
+    assert all(tuple(p) == canonical_rotation(p) for p in patterns)
+
+
+def test_constraints_prune_the_search():
+    constraints = {"maxConsecutiveWorkDays": 3, "minOffDaysPerWeek": 2}
+    patterns = enumerate_patterns(["D"], [7, 14], constraints)
+    assert patterns
+    for p in patterns:
+        assert max_consecutive_work_days(p) <= 3
+        assert 7 - peak_weekly_work_days(p) >= 2
+    # 44h normal + no OT allows 4 x 11h shifts in any week
+    tight = enumerate_patterns(["D"], [6], {"maxMonthlyOTHours": 0})
+    assert max(peak_weekly_work_days(p) for p in tight) == 4
+
+
+def test_results_are_memoised():
+    enumerate_patterns(["X", "Y"], [9])
+    hits = cache_info().hits
+    first = enumerate_patterns(["X", "Y"], [9])
+    assert cache_info().hits == hits + 1
+    first.clear()  # callers get fresh lists, the cache is not mutated
+    assert enumerate_patterns(["X", "Y"], [9])
+
+
+def test_shift_order_sets_canonical_preference():
+    assert enumerate_patterns(["N", "D"], [6])[0][0] == "N"
+    assert enumerate_patterns(["D", "N"], [6])[0][0] == "D"
@@ -0,0 +1,86 @@
+"""Tests for the opt-in per-phase profiler."""
+
+import threading
+import tracemalloc
+
+from context.engine.profiling import PhaseProfiler, phase_context
+
+
+def _busy():
+    return sum(i * i for i in range(20000))
+
+
+def test_disabled_profiling_is_a_shared_null_context():
+    phase = phase_context({})
+    assert phase("a") is phase("b")
+
+
+def test_profiler_reports_phases_and_dumps_pstats(tmp_path):
+    profiler = PhaseProfiler(top_n=3, dump_dir=tmp_path, run_id="t1")
+    phase = phase_context({"profiler": profiler})
+    with phase("build_model"):
+        _busy()
+    with phase("score"):
+        data = [bytearray(1000) for _ in range(100)]
+    profiler.close()
+
+    report = profiler.report()
+    assert [p["phase"] for p in report["phases"]] == ["build_model", "score"]
+    build = report["phases"][0]
+    assert len(build["topFunctions"]) == 3
+    assert any("_busy" in f["function"] for f in build["topFunctions"])
+    assert report["phases"][1]["peakMemoryMB"] >= 0.1
+    assert report["artifacts"] == ["profile_t1_build_model.pstats", "profile_t1_score.pstats"]
+    assert (tmp_path / "profile_t1_score.pstats").exists()
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_concurrent_profilers_share_one_trace():
+    first, second = PhaseProfiler(), PhaseProfiler()
+    with phase_context({"profiler": first})("cpsat_solve"):
+        data = [bytearray(1000) for _ in range(1000)]
+        with phase_context({"profiler": second})("build_model"):
+            _busy()
+        second.close()
+        # The second solve finished first; the first one's trace keeps running
+        assert tracemalloc.is_tracing()
+    first.close()
+    assert not tracemalloc.is_tracing()
+
+    solve_phase, build_phase = first.phases[0], second.phases[0]
+    assert solve_phase["memoryShared"] and build_phase["memoryShared"]
+    assert solve_phase["peakMemoryMB"] >= 1.0
+    assert solve_phase["netAllocatedMB"] >= 1.0
+    del data
+
+
+def test_concurrent_phases_share_one_cprofile():
+    first, second = PhaseProfiler(), PhaseProfiler()
+    done = threading.Event()
+
+    def other_solve():
+        with phase_context({"profiler": second})("build_model"):
+            _busy()
+        done.set()
+
+    with phase_context({"profiler": first})("cpsat_solve"):
+        _busy()
+        thread = threading.Thread(target=other_solve)
+        thread.start()
+        assert done.wait(10)
+        thread.join()
+    first.close()
+    second.close()
+
+    solve_phase, build_phase = first.phases[0], second.phases[0]
+    assert "cpuProfileSkipped" not in solve_phase
+    assert any("_busy" in f["function"] for f in solve_phase["topFunctions"])
+    assert build_phase["cpuProfileSkipped"] and build_phase["topFunctions"] == []
+    assert build_phase["wallMs"] >= 0
+
+    # The profile is free again once the first phase ends
+    with phase_context({"profiler": second})("score"):
+        _busy()
+    second.close()
+    assert "cpuProfileSkipped" not in second.phases[1]
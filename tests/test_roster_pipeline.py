@@ -0,0 +1,77 @@
+"""Tests for src/roster_pipeline (requirements -> configuration -> roster in memory)."""
+
+import json
+import pathlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import quiet
+from src.api_server import app
+from src.roster_pipeline import build_solver_input, prepare_pipeline, run_pipeline
+
+
+@pytest.fixture
+def config_input():
+    """Two weeks, two day-shift requirements (one needing a qualification), tightened constraints."""
+    return {
+        "planningHorizon": {"startDate": "2025-12-01", "endDate": "2025-12-14"},
+        "publicHolidays": [],
+        "shifts": [{"code": "D", "startTime": "08:00", "endTime": "20:00", "grossHours": 12.0, "lunchBreak": 1.0}],
+        "requirements": [
+            {"id": "REQ_A", "name": "APO Day", "productType": "APO", "rank": "APO", "scheme": "A", "shiftTypes": ["D"],
+             "headcountPerDay": 2, "coverageDays": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]},
+            {"id": "REQ_B", "name": "CVSO Day", "productType": "CVSO", "rank": "CVSO2", "scheme": "A", "shiftTypes": ["D"],
+             "headcountPerDay": 1, "coverageDays": ["Mon", "Tue", "Wed", "Thu", "Fri"],
+             "requiredQualifications": ["FRISKING-LIC"], "gender": "F"},
+        ],
+        "constraints": {"maxConsecutiveWorkDays": 6, "minRestBetweenShifts": 600},
+    }
+
+
+def test_solver_input_is_built_from_the_recommendations(config_input):
+    configuration = quiet(prepare_pipeline, config_input)["configuration"]
+    solver_input, warnings = build_solver_input(config_input, configuration)
+
+    assert warnings == []
+    assert solver_input["fixedRotationOffset"] is True
+    assert len(solver_input["employees"]) == configuration["summary"]["totalEmployees"]
+    demand = {d["demandId"]: d for d in solver_input["demandItems"]}["DMD_REQ_B"]
+    assert demand["shifts"][0]["shiftDetails"][0]["start"] == "08:00"
+    assert demand["shifts"][0]["whitelist"]["teamIds"] == ["TEAM-REQ_B"]
+    team = [e for e in solver_input["employees"] if e["teamId"] == "TEAM-REQ_B"]
+    assert team and all(e["gender"] == "F" and e["rankId"] == "CVSO2" for e in team)
+    assert all(e["qualifications"][0]["code"] == "FRISKING-LIC" for e in team)
+
+    params = {c["id"]: c.get("params", {}) for c in solver_input["constraintList"]}
+    assert params["maxConsecutiveWorkingDays"]["maxConsecutiveDays"] == 6
+    assert params["apgdMinRestBetweenShifts"]["minRestMinutes"] == 600
+
+
+@pytest.mark.parametrize("offsets", ["fixed", "hint"])
+def test_pipeline_rosters_every_slot(config_input, offsets):
+    result = quiet(run_pipeline, config_input, offsets=offsets, time_limit=10)
+    ctx = result["ctx"]
+    assert ctx["fixedRotationOffset"] is (offsets == "fixed")
+    assert ("offsetHints" in ctx) is (offsets == "hint")
+    assert result["solver_result"]["scores"]["hard"] == 0
+    assert result["assignments"]
+    assert all(a.get("employeeId") for a in result["assignments"])
+
+
+def test_hint_mode_never_assigns_fewer_slots_than_fixed():
+    path = pathlib.Path(__file__).resolve().parents[1] / "input" / "requirements_simple.json"
+    with open(path, encoding="utf-8") as f:
+        config_input = json.load(f)
+    filled = {}
+    for offsets in ("fixed", "hint"):
+        result = quiet(run_pipeline, config_input, offsets=offsets, time_limit=10)
+        filled[offsets] = sum(1 for a in result["assignments"] if a.get("employeeId"))
+    assert filled["hint"] >= filled["fixed"] > 0
+    assert result["offsetsUsed"] in ("fixed", "hint")
+
+
+def test_pipeline_endpoint_rejects_unknown_offsets(config_input):
+    response = TestClient(app).post("/pipeline?offsets=random", json=config_input)
+    assert response.status_code == 400
+    assert "offsets" in response.json()["detail"]
@@ -0,0 +1,45 @@
+"""Tests for the interned integer-minute ShiftShape model in time_utils."""
+
+from datetime import datetime
+
+import numpy as np
+
+from context.engine.time_utils import (
+    shift_shape,
+    shape_of,
+    split_shift_hours,
+    split_shift_hours_array,
+)
+
+
+def test_shift_shape_is_interned_and_in_tenths():
+    shape = shift_shape(8 * 60, 12 * 60)
+
+    assert shape is shift_shape(8 * 60, 12 * 60)
+    assert (shape.gross, shape.lunch, shape.normal, shape.ot, shape.paid) == (120, 10, 80, 30, 120)
+    assert shape.as_dict() == {'gross': 12.0, 'lunch': 1.0, 'normal': 8.0, 'ot': 3.0, 'paid': 12.0}
+
+
+def test_split_shift_hours_matches_shape_lookup():
+    cases = [
+        (datetime(2025, 1, 1, 9, 0), datetime(2025, 1, 1, 18, 0)),
+        (datetime(2025, 1, 1, 22, 0), datetime(2025, 1, 2, 6, 0)),
+        (datetime(2025, 1, 1, 19, 0), datetime(2025, 1, 1, 23, 30)),
+        (datetime(2025, 1, 1, 7, 10), datetime(2025, 1, 1, 14, 30)),
+    ]
+    for start, end in cases:
+        assert split_shift_hours(start, end) == shape_of(start, end).as_dict()
+
+    # Sub-minute spans still use the exact float path
+    assert split_shift_hours(datetime(2025, 1, 1, 9, 0, 0), datetime(2025, 1, 1, 9, 0, 30))['gross'] == 0.01
+
+
+def test_split_shift_hours_array_is_vectorised_lookup():
+    starts = np.array([480, 1200, 480, 540])
+    durations = np.array([720, 720, 540, 240])
+    result = split_shift_hours_array(starts, durations)
+
+    assert result['gross'].tolist() == [120, 120, 90, 40]
+    assert result['normal'].tolist() == [80, 80, 80, 40]
+    assert result['ot'].tolist() == [30, 30, 0, 0]
+    assert result['lunch'].tolist() == [10, 10, 10, 0]
@@ -0,0 +1,37 @@
+"""Tests for the compact, deterministic slot representation."""
+
+import copy
+from datetime import date, datetime
+
+from context.engine.slot_builder import build_slots, slot_index_map
+
+
+def test_slot_ids_are_deterministic(small_input):
+    first = build_slots(copy.deepcopy(small_input))
+    second = build_slots(copy.deepcopy(small_input))
+
+    assert [s.slot_id for s in first] == [s.slot_id for s in second]
+    assert first[0].slot_id == "DMD1-R1-D-P0-2025-12-01"
+    assert [s.index for s in first] == list(range(len(first)))
+    assert slot_index_map(first) == {s.slot_id: s.index for s in second}
+    assert len({s.key for s in first}) == len(first)
+
+
+def test_slot_shares_requirement_spec(small_input):
+    slots = build_slots(small_input)
+
+    assert len({id(s.spec) for s in slots}) == 1
+    assert slots[0].date == date(2025, 12, 1)
+    assert slots[0].start == datetime(2025, 12, 1, 8, 0)
+    assert slots[0].end == datetime(2025, 12, 1, 20, 0)
+    assert slots[0].duration_min == 12 * 60
+    assert slots[0].rotationSequence == ("D", "D", "O")
+
+
+def test_duplicate_shift_groups_get_distinct_ids(small_input):
+    demand = small_input["demandItems"][0]
+    demand["shifts"].append(copy.deepcopy(demand["shifts"][0]))
+    slots = build_slots(small_input)
+
+    assert len({s.slot_id for s in slots}) == len(slots) == 8
+    assert slots[-1].slot_id.endswith("-S1")
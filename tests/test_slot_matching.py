@@ -0,0 +1,103 @@
+"""Tests for context/engine/slot_matching (per-day matchings, bound and fallback roster)."""
+
+import pytest
+from ortools.sat.python import cp_model
+
+from conftest import quiet
+from context.engine.capacity_analysis import analyze_capacity
+from context.engine.slot_matching import hopcroft_karp, match_slots
+from context.engine import solver_engine
+from context.engine.solver_engine import build_model, solve
+
+
+def test_hopcroft_karp_finds_maximum_matchings():
+    # Greedy takes right vertex 0 for left 0 and strands left 1 without augmenting
+    assert sorted(hopcroft_karp([[0, 1], [0]], 2)) == [0, 1]
+    assert sum(v >= 0 for v in hopcroft_karp([[0], [0, 1], [1, 2], [2]], 3)) == 3
+    assert hopcroft_karp([[], [0], [0]], 1).count(-1) == 2
+
+
+def test_bound_matches_the_capacity_analysis(week_input):
+    for offsets in ((0, 1, 2), (0, 0, 0)):
+        for emp, offset in zip(week_input["employees"], offsets):
+            emp["rotationOffset"] = offset
+        ctx = dict(week_input, capacityAnalysis=False)
+        quiet(build_model, ctx)
+        matching = quiet(match_slots, ctx)
+        assert matching["upperBound"] == quiet(analyze_capacity, week_input)["upperBound"]
+        assert len(matching["assignments"]) == matching["upperBound"]
+    assert matching["dayBounds"]["2025-12-03"] == 0
+
+
+def test_roster_keeps_the_minimum_rest(week_input):
+    week_input["employees"] = [{"employeeId": "E0", "rankId": "APO"}]
+    week_input["demandItems"][0]["requirements"][0]["workPattern"] = ["D"]
+    # 12h shifts leave 12h of rest; 13h are required
+    week_input["constraintList"] = [{"id": "apgdMinRestBetweenShifts", "params": {"minRestMinutes": 780}}]
+    ctx = dict(week_input)
+    quiet(build_model, ctx)
+    matching = quiet(match_slots, ctx)
+    assert matching["upperBound"] == 6
+    assert sorted(slot_id[-10:] for slot_id in matching["assignments"]) == \
+        ["2025-12-01", "2025-12-03", "2025-12-05"]
+
+
+@pytest.mark.parametrize("week_input", [(0, 1, 2)], indirect=True)
+def test_timeout_falls_back_to_the_matching_roster(week_input):
+    week_input["timeLimit"] = 0  # CP-SAT stops before its first solution
+    _, result, assignments, _ = quiet(solve, week_input)
+    assert result["coverage"] == {"assigned": 12, "totalSlots": 12, "upperBound": 12, "gap": 0, "source": "matching"}
+    assert result["status"] == "FEASIBLE"
+    assert result["scores"]["hard"] == 0
+    assert len({a["employeeId"] for a in assignments if a["date"] == "2025-12-01"}) == 2
+
+
+@pytest.mark.parametrize("week_input", [(0, 1, 2)], indirect=True)
+def test_feasible_cpsat_roster_is_kept(week_input, monkeypatch):
+    extract = solver_engine.extract_assignments
+
+    def leave_one_open(ctx, solver):
+        # A CP-SAT roster that left a fillable slot open
+        assignments = extract(ctx, solver)
+        dropped = next(a for a in assignments if a["employeeId"])
+        return [dict(a, employeeId=None, status="UNASSIGNED") if a is dropped else a for a in assignments]
+
+    monkeypatch.setattr(solver_engine, "extract_assignments", leave_one_open)
+    _, result, assignments, _ = quiet(solve, week_input)
+    assert result["status_code"] in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert result["coverage"] == {"assigned": 11, "totalSlots": 12, "upperBound": 12, "gap": 1, "source": "cpsat"}
+    assert len([a for a in assignments if not a["employeeId"]]) == 1
+
+
+def test_roster_keeps_preferred_teams(week_input):
+    week_input["planningHorizon"]["endDate"] = "2025-12-01"
+    week_input["demandItems"][0]["shifts"][0]["preferredTeams"] = ["T1"]
+    week_input["demandItems"][0]["requirements"][0].update(headcount=1, workPattern=["D"])
+    week_input["employees"] = [{"employeeId": "E0", "rankId": "APO", "teamId": "T2"}]
+    ctx = dict(week_input, capacityAnalysis=False)
+    quiet(build_model, ctx)
+    matching = quiet(match_slots, ctx)
+    assert matching["upperBound"] == 0 and matching["assignments"] == {}
+    _, result, assignments, _ = quiet(solve, dict(week_input, capacityAnalysis=False))
+    assert result["status_code"] == cp_model.OPTIMAL
+    assert result["coverage"]["source"] == "cpsat"
+    assert [a["employeeId"] for a in assignments] == [None]
+
+
+def test_roster_keeps_the_gender_mix(week_input):
+    week_input["planningHorizon"]["endDate"] = "2025-12-01"
+    week_input["demandItems"][0]["requirements"][0].update(gender="Mix", workPattern=["D"])
+    for emp, gender in zip(week_input["employees"], "MMF"):
+        emp["gender"] = gender
+    ctx = dict(week_input, capacityAnalysis=False)
+    quiet(build_model, ctx)
+    matching = quiet(match_slots, ctx)
+    assert matching["upperBound"] == 2
+    assert sorted(matching["assignments"].values()) in (["E0", "E2"], ["E1", "E2"])
+
+
+def test_solved_roster_reports_the_gap(week_input):
+    _, result, _, _ = quiet(solve, week_input)
+    assert result["coverage"]["source"] == "cpsat"
+    assert result["coverage"]["upperBound"] == result["coverage"]["assigned"] == 8
+    assert "coverage" not in quiet(solve, dict(week_input, slotMatching=False))[1]
@@ -0,0 +1,43 @@
+"""Tests for the columnar SlotTable."""
+
+from datetime import date
+
+from context.engine.slot_builder import build_slot_table, build_slots
+
+
+def test_table_matches_materialised_slots(small_input):
+    table = build_slot_table(small_input)
+    slots = build_slots(small_input)
+
+    assert len(table) == len(slots) == 4
+    assert [s.slot_id for s in table.iter_slots()] == [s.slot_id for s in slots]
+    assert table.slot(3).slot_id == slots[3].slot_id
+    assert table.locations == ["LOC1"] and table.ranks == ["APO"]
+    assert table.start_min.tolist() == [480] * 4
+    assert table.end_min.tolist() == [1200] * 4
+
+
+def test_vectorised_filters(small_input):
+    small_input["planningHorizon"]["endDate"] = "2025-12-07"
+    small_input["demandItems"][0]["shifts"][0]["shiftDetails"].append(
+        {"shiftCode": "N", "start": "20:00", "end": "08:00"})
+    small_input["demandItems"][0]["requirements"][0]["workPattern"] = ["D", "N", "O"]
+    table = build_slot_table(small_input)
+
+    weekend = table.weekday_mask([5, 6])
+    nights = table.shift_mask(["N"])
+    first_days = table.date_mask(end=date(2025, 12, 2))
+
+    assert all(s.date.weekday() >= 5 for s in table.iter_slots(weekend))
+    assert all(s.shiftCode == "N" for s in table.iter_slots(nights))
+    assert all(s.end_min == 8 * 60 + 1440 for s in table.iter_slots(nights))
+    assert int((weekend & nights).sum()) == 2 * 2
+    assert int(first_days.sum()) == 2 * 2 * 2
+
+
+def test_public_holiday_exclusion(small_input):
+    small_input["publicHolidays"] = ["2025-12-02"]
+    small_input["demandItems"][0]["shifts"][0]["includePublicHolidays"] = False
+    table = build_slot_table(small_input)
+
+    assert {s.date for s in table.iter_slots()} == {date(2025, 12, 1)}
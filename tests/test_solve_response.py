@@ -0,0 +1,30 @@
+"""Tests for the /solve fast response path in api_server."""
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from src.api_server import build_solve_response
+
+
+def _output():
+    return {
+        "score": {"hard": 0, "soft": 0, "overall": 0},
+        "assignments": [{"slotId": "S1", "employeeId": "E1", "hours": {"gross": 12.0}}],
+        "meta": {"requestId": "r1", "generatedAt": "2025-12-01T00:00:00", "warnings": []},
+    }
+
+
+def test_fast_path_serialises_dict_unchanged():
+    output = _output()
+    response = build_solve_response(output)
+    assert orjson.loads(response.body) == output
+
+
+def test_validation_only_when_requested():
+    broken = _output()
+    del broken["meta"]["requestId"]
+
+    assert build_solve_response(broken).status_code == 200
+    with pytest.raises(ValidationError):
+        build_solve_response(broken, validate=True)
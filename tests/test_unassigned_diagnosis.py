@@ -0,0 +1,82 @@
+"""Tests for context/engine/unassigned_diagnosis (ranked blocking constraints)."""
+
+import pytest
+
+from conftest import quiet
+from context.engine.solver_engine import assignment_records, build_model, solve
+from context.engine.unassigned_diagnosis import explain_unassigned
+
+
+def _open_slots(result):
+    return result["scoreBreakdown"]["unassignedSlots"]["slots"]
+
+
+@pytest.fixture
+def mixed_ranks(week_input):
+    """week_input with E2 an AVSO on offset 1 (on duty on days 3 and 6, wrong rank)."""
+    week_input["employees"][2].update(rankId="AVSO", rotationOffset=1)
+    return week_input
+
+
+def test_rules_are_ranked_by_the_employees_they_alone_block(mixed_ranks):
+    _, result, _, _ = quiet(solve, dict(mixed_ranks, capacityAnalysis=False))
+    slots = _open_slots(result)
+    # E0 and E1 are off on days 3 and 6; E2 works those days but has the wrong rank
+    assert sorted({s["date"] for s in slots}) == ["2025-12-03", "2025-12-06"]
+    assert slots[0]["blockingConstraints"] == [
+        {"constraint": "rotation-offday", "blocked": 2, "sole": 2},
+        {"constraint": "C11-rankId", "blocked": 1, "sole": 1},
+    ]
+    assert {v["id"] for v in result["scoreBreakdown"]["hard"]["violations"]} == {"hard-rotation-offday"}
+
+    # Slots the capacity analysis fixed keep 'capacity' as the scored reason
+    _, result, _, _ = quiet(solve, mixed_ranks)
+    assert {v["id"] for v in result["scoreBreakdown"]["hard"]["violations"]} == {"hard-capacity"}
+    assert _open_slots(result)[0]["blockingConstraints"][0]["constraint"] == "rotation-offday"
+
+
+def test_roster_rules_use_the_other_assignments(week_input):
+    # One employee on a daily pattern over two weeks: 12h shifts exceed 44 normal hours after 5 days
+    week_input["planningHorizon"]["endDate"] = "2025-12-14"
+    week_input["employees"] = [{"employeeId": "E0", "rankId": "APO"}]
+    requirement = week_input["demandItems"][0]["requirements"][0]
+    requirement.update(workPattern=["D"], headcount=1)
+    _, result, _, _ = quiet(solve, week_input)
+    slots = _open_slots(result)
+    assert result["scores"]["hard"] == len(slots) > 0
+    assert all(s["blockingConstraints"] == [{"constraint": "C2-weekly-hours", "blocked": 1, "sole": 1}]
+               for s in slots)
+
+
+def test_preferred_teams_block_other_teams(week_input):
+    week_input["planningHorizon"]["endDate"] = "2025-12-01"
+    week_input["demandItems"][0]["shifts"][0]["preferredTeams"] = ["T1"]
+    for emp, team in zip(week_input["employees"], ("T1", "T2", "T2")):
+        emp["teamId"] = team
+    _, result, _, _ = quiet(solve, dict(week_input, capacityAnalysis=False))
+    slots = _open_slots(result)
+    assert len(slots) == 1
+    # E0 (T1) took the other slot; E1 and E2 are only kept out by their team
+    assert slots[0]["blockingConstraints"] == [
+        {"constraint": "C12-preferredTeams", "blocked": 2, "sole": 2},
+        {"constraint": "one-slot-per-day", "blocked": 1, "sole": 1},
+    ]
+    assert slots[0]["residualEmployees"] == []
+    assert {v["id"] for v in result["scoreBreakdown"]["hard"]["violations"]} == {"hard-C12-preferredTeams"}
+
+
+def test_unblocked_employees_are_residual(mixed_ranks):
+    ctx = dict(mixed_ranks, capacityAnalysis=False)
+    quiet(build_model, ctx)
+    # An empty roster: only the eligibility rules can block anyone
+    assignments = quiet(assignment_records, ctx, {}, set(range(len(ctx["slots"]))))
+    report = quiet(explain_unassigned, ctx, assignments)
+    assert len(report) == 12
+    day1 = report["DMD1-R1-D-P0-2025-12-01"]
+    assert day1["primary"] == "residual"
+    assert day1["residual"] == ["E0", "E1"]
+    assert day1["blocking"] == [
+        {"constraint": "C11-rankId", "blocked": 1, "sole": 0},
+        {"constraint": "rotation-offday", "blocked": 1, "sole": 0},
+    ]
+    assert report["DMD1-R1-D-P1-2025-12-03"]["primary"] == "rotation-offday"